@@ -0,0 +1,212 @@
+# =======================================================
+# AGENDAMENTO DA PRODUÇÃO
+# =======================================================
+#
+# Transforma os pedidos em aberto (ainda sem produção) em produções
+# com as cinco etapas do fluxo, Corte -> Costura -> Bordado ->
+# Acabamento -> Inspeção, e distribui cada etapa entre os funcionários
+# habilitados para ela (pelo cargo). É um agendador de lista com filas
+# de prioridade (heapq): as operações entram na fila quando a etapa
+# anterior termina, empates são resolvidos pelo maior trabalho restante
+# (LPT) e cada operação vai para o funcionário da etapa que fica livre
+# primeiro. O plano inteiro é gravado de uma vez (executemany).
+#
+#   python agendamento_producao.py                # agenda e grava
+#   python agendamento_producao.py --simular      # só mostra o plano
+
+import argparse
+import heapq
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from main import ProducaoDAO, TipoEtapa
+
+ETAPAS = list(TipoEtapa)
+
+# Horas por peça e horas de preparação de cada etapa
+TEMPOS_ETAPA = {
+    TipoEtapa.CORTE: (0.05, 0.5),
+    TipoEtapa.COSTURA: (0.25, 0.25),
+    TipoEtapa.BORDADO: (0.10, 0.5),
+    TipoEtapa.ACABAMENTO: (0.08, 0.25),
+    TipoEtapa.INSPECAO: (0.03, 0.1),
+}
+
+# Trecho do cargo (minúsculo) que habilita o funcionário em cada etapa
+CARGOS = {
+    TipoEtapa.CORTE: "cort",
+    TipoEtapa.COSTURA: "costur",
+    TipoEtapa.BORDADO: "bord",
+    TipoEtapa.ACABAMENTO: "acab",
+    TipoEtapa.INSPECAO: "insp",
+}
+
+Tarefa = namedtuple("Tarefa", "pedido_id numero unidades")
+# inicio/fim em horas de expediente desde o começo do plano
+Operacao = namedtuple("Operacao", "pedido_id etapa funcionario_id inicio fim")
+
+
+def equipes_por_cargo(funcionarios):
+    equipes = {etapa: [] for etapa in ETAPAS}
+    for funcionario_id, cargo in funcionarios:
+        cargo = (cargo or "").lower()
+        for etapa, trecho in CARGOS.items():
+            if trecho in cargo:
+                equipes[etapa].append(funcionario_id)
+    return equipes
+
+
+def duracao(etapa, unidades, tempos=TEMPOS_ETAPA):
+    por_peca, preparo = tempos[etapa]
+    return preparo + por_peca * unidades
+
+
+# =======================================================
+# AGENDADOR
+# =======================================================
+
+def agendar(tarefas, equipes, tempos=TEMPOS_ETAPA):
+    faltando = [etapa.value for etapa in ETAPAS if not equipes.get(etapa)]
+    if faltando:
+        raise ValueError(f"Nenhum funcionário habilitado para: {', '.join(faltando)}")
+    duracoes = [[duracao(etapa, tarefa.unidades, tempos) for etapa in ETAPAS] for tarefa in tarefas]
+
+    # Um único "livre a partir de" por funcionário, valendo para todas as
+    # etapas em que ele é habilitado; as filas de cada etapa guardam
+    # (livre a partir de, id) e podem ficar defasadas quando o funcionário
+    # é ocupado por outra etapa
+    livre = {funcionario_id: 0.0 for equipe in equipes.values() for funcionario_id in equipe}
+    livres = {etapa: [(0.0, funcionario_id) for funcionario_id in equipes[etapa]] for etapa in ETAPAS}
+    for fila in livres.values():
+        heapq.heapify(fila)
+    # Operações prontas: (pronta em, -trabalho restante, tarefa, índice da etapa)
+    prontas = [(0.0, -sum(d), indice, 0) for indice, d in enumerate(duracoes)]
+    heapq.heapify(prontas)
+
+    operacoes = []
+    while prontas:
+        pronta_em, restante, indice, k = heapq.heappop(prontas)
+        etapa = ETAPAS[k]
+        # Entrada defasada volta à fila com o horário atual; como os
+        # horários só crescem, a primeira entrada em dia é a de quem fica
+        # livre primeiro
+        livre_em, funcionario_id = heapq.heappop(livres[etapa])
+        while livre_em != livre[funcionario_id]:
+            livre_em, funcionario_id = heapq.heappushpop(livres[etapa], (livre[funcionario_id], funcionario_id))
+        inicio = max(pronta_em, livre_em)
+        fim = inicio + duracoes[indice][k]
+        livre[funcionario_id] = fim
+        heapq.heappush(livres[etapa], (fim, funcionario_id))
+        operacoes.append(Operacao(tarefas[indice].pedido_id, etapa, funcionario_id, inicio, fim))
+        if k + 1 < len(ETAPAS):
+            heapq.heappush(prontas, (fim, restante + duracoes[indice][k], indice, k + 1))
+    return operacoes
+
+
+def limite_inferior(tarefas, equipes, tempos=TEMPOS_ETAPA):
+    # Nenhum plano termina antes da etapa mais carregada (trabalho / equipe),
+    # do trabalho total dividido entre todos os funcionários nem da tarefa
+    # mais longa feita sem espera
+    carga = max(sum(duracao(etapa, t.unidades, tempos) for t in tarefas) / len(equipes[etapa])
+                for etapa in ETAPAS)
+    pessoas = {funcionario_id for equipe in equipes.values() for funcionario_id in equipe}
+    total = sum(duracao(etapa, t.unidades, tempos) for etapa in ETAPAS for t in tarefas)
+    carga = max(carga, total / len(pessoas)) if pessoas else carga
+    caminho = max((sum(duracao(etapa, t.unidades, tempos) for etapa in ETAPAS) for t in tarefas), default=0)
+    return max(carga, caminho)
+
+
+def para_calendario(horas, inicio, horas_por_dia=8, fim=False):
+    # Horas de expediente -> data/hora; um fim exato no fechamento do dia
+    # fica nesse dia, e não na abertura do seguinte
+    dias, resto = divmod(horas, horas_por_dia)
+    if fim and resto == 0 and dias > 0:
+        dias, resto = dias - 1, horas_por_dia
+    return (inicio + timedelta(days=dias, hours=resto)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def producoes_do_plano(operacoes, etapas, inicio, horas_por_dia=8):
+    por_pedido = {}
+    for op in operacoes:
+        por_pedido.setdefault(op.pedido_id, []).append(op)
+    producoes = []
+    for pedido_id, ops in por_pedido.items():
+        execucoes = [(etapas[op.etapa], op.etapa.value, op.funcionario_id,
+                      para_calendario(op.inicio, inicio, horas_por_dia),
+                      para_calendario(op.fim, inicio, horas_por_dia, fim=True)) for op in ops]
+        producoes.append((pedido_id, execucoes[0][3], execucoes[-1][4], execucoes))
+    return producoes
+
+
+# =======================================================
+# PLANEJAMENTO SOBRE O BANCO
+# =======================================================
+
+def planejar(db_name="confeccao.db", inicio=None, horas_por_dia=8, tempos=TEMPOS_ETAPA, gravar=True):
+    # Leitura da demanda, agendamento e gravação na mesma transação
+    # IMMEDIATE: dois planejamentos simultâneos não agendam o mesmo pedido
+    dao = ProducaoDAO(db_name)
+    inicio = inicio or (datetime.now() + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)
+    medidas = {}
+
+    def operar(conn):
+        tarefas = [Tarefa(*linha) for linha in dao.demanda(conn)]
+        equipes = equipes_por_cargo(dao.funcionarios(conn))
+        if not tarefas:
+            return tarefas, equipes, []
+        t0 = time.perf_counter()
+        operacoes = agendar(tarefas, equipes, tempos)
+        medidas["agendamento"] = time.perf_counter() - t0
+        if gravar:
+            t0 = time.perf_counter()
+            dao._gravar_plano(conn, producoes_do_plano(operacoes, dao.etapas(conn), inicio, horas_por_dia))
+            medidas["gravacao"] = time.perf_counter() - t0
+        return tarefas, equipes, operacoes
+
+    if gravar:
+        tarefas, equipes, operacoes = dao._gravar(operar)
+    else:
+        tarefas, equipes, operacoes = operar(dao.conectar())
+    return tarefas, equipes, operacoes, medidas
+
+
+def exibir_plano(tarefas, equipes, operacoes, medidas, horas_por_dia=8):
+    if not operacoes:
+        print("✅ Nenhum pedido aguardando produção.")
+        return
+    duracao_total = max(op.fim for op in operacoes)
+    minimo = limite_inferior(tarefas, equipes)
+    print(f"\n🏭 PLANO DE PRODUÇÃO: {len(tarefas)} pedidos | {len(operacoes)} operações")
+    print(f"Duração: {duracao_total:.1f} h ({duracao_total / horas_por_dia:.1f} dias de expediente) | "
+          f"Limite inferior: {minimo:.1f} h | Folga: {(duracao_total / minimo - 1) * 100:.1f}%")
+    for etapa in ETAPAS:
+        trabalho = sum(op.fim - op.inicio for op in operacoes if op.etapa is etapa)
+        ocupacao = trabalho / (duracao_total * len(equipes[etapa]))
+        print(f"{etapa.value:<11} | Funcionários: {len(equipes[etapa])} | Horas: {trabalho:.1f} | "
+              f"Ocupação: {ocupacao * 100:.1f}%")
+    print(f"⏱️ Agendamento: {medidas['agendamento'] * 1000:.1f} ms"
+          + (f" | Gravação: {medidas['gravacao'] * 1000:.1f} ms" if "gravacao" in medidas else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agenda a produção dos pedidos em aberto")
+    parser.add_argument("--db", default="confeccao.db")
+    parser.add_argument("--inicio", type=datetime.fromisoformat,
+                        help="início do plano (padrão: amanhã às 08:00)")
+    parser.add_argument("--horas-por-dia", type=float, default=8)
+    parser.add_argument("--simular", action="store_true", help="não grava o plano")
+    args = parser.parse_args(argv)
+    try:
+        tarefas, equipes, operacoes, medidas = planejar(
+            args.db, args.inicio, args.horas_por_dia, gravar=not args.simular)
+    except ValueError as erro:
+        print(f"⚠️ {erro}")
+        return
+    exibir_plano(tarefas, equipes, operacoes, medidas, args.horas_por_dia)
+    if operacoes and not args.simular:
+        print("✅ Plano gravado!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+# =======================================================
+# ARQUIVAMENTO DE PEDIDOS ANTIGOS
+# =======================================================
+#
+# Move pedidos "Finalizado"/"Cancelado" anteriores a uma data de corte,
+# com itens, pagamento, produção e execuções, para um arquivo SQLite por
+# período (arquivo/confeccao-2025-01.db ao lado do banco), anexado com
+# ATTACH. O banco principal fica só com os pedidos vivos e recentes, e
+# as listagens dos DAOs deixam de percorrer o histórico.
+#
+# Cada lote de pedidos passa por duas transações curtas:
+#   1. cópia para o arquivo (INSERT OR REPLACE) e atualização do catálogo
+#      arquivo_pedido (migração 7 de ddl_confeccao.py); o principal só
+#      ganha a linha do catálogo;
+#   2. BEGIN IMMEDIATE no principal: confere de novo o status e só apaga
+#      (o ON DELETE CASCADE leva os filhos) os pedidos cuja cópia já está
+#      no arquivo com o mesmo status, total e quantidade de itens.
+# Em WAL o commit de uma transação que escreve em dois arquivos não é
+# atômico entre eles (o principal grava primeiro). Por isso a remoção
+# nunca vai junto com a cópia: uma queda em qualquer ponto deixa no
+# máximo o pedido nos dois bancos (as consultas ignoram no arquivo o
+# que ainda está no principal) e a próxima execução termina o serviço.
+#
+# As consultas por intervalo de datas só anexam os arquivos cujo
+# catálogo cruza o intervalo; sem isso leem só o banco principal.
+#
+#   python arquivamento.py arquivar --antes-de 2025-01-01 --periodo mes
+#   python arquivamento.py arquivos
+#   python arquivamento.py pedidos --inicio 2024-03-01 --fim 2024-04-01
+#   python arquivamento.py receita --inicio 2024-01-01 --fim 2025-01-01 --por mes
+
+import argparse
+import heapq
+import os
+import sqlite3
+import time
+
+from ddl_confeccao import em_memoria
+from main import DAO
+
+PERIODOS = {
+    "mes": "%Y-%m",
+    "ano": "%Y",
+}
+FORMATOS_RECEITA = {
+    "dia": "%Y-%m-%d",
+    "semana": "%Y-W%W",
+    "mes": "%Y-%m",
+    "ano": "%Y",
+}
+STATUS_ARQUIVAVEIS = ("Finalizado", "Cancelado")
+
+# Tabela -> filtro pelos ids do lote, na ordem em que são copiadas
+TABELAS_ARQUIVO = [
+    ("pedido", "id IN ({})"),
+    ("item_pedido", "pedido_id IN ({})"),
+    ("pagamento", "pedido_id IN ({})"),
+    ("producao", "pedido_id IN ({})"),
+    ("execucao_etapa", "producao_id IN (SELECT id FROM main.producao WHERE pedido_id IN ({}))"),
+]
+INDICES_ARQUIVO = [
+    "CREATE INDEX IF NOT EXISTS {0}.idx_pedido_data ON pedido (data_pedido, status, total, qtd_itens)",
+    "CREATE INDEX IF NOT EXISTS {0}.idx_item_pedido_pedido ON item_pedido (pedido_id)",
+    "CREATE INDEX IF NOT EXISTS {0}.idx_pagamento_pedido ON pagamento (pedido_id)",
+    "CREATE INDEX IF NOT EXISTS {0}.idx_pagamento_data ON pagamento (data_pagamento)",
+    "CREATE INDEX IF NOT EXISTS {0}.idx_producao_pedido ON producao (pedido_id)",
+    "CREATE INDEX IF NOT EXISTS {0}.idx_execucao_etapa_producao ON execucao_etapa (producao_id)",
+]
+
+
+def marcadores(valores):
+    return ", ".join("?" * len(valores))
+
+
+class Arquivamento(DAO):
+    # "+" tira os índices do filtro: o SQLite percorre pedido pela chave
+    # a partir do último id, em vez de ordenar idx_pedido_data a cada lote
+    SQL_CANDIDATOS = f"""
+        SELECT id, strftime(?, data_pedido) FROM pedido
+        WHERE id > ? AND +data_pedido < ? AND +status IN ({marcadores(STATUS_ARQUIVAVEIS)})
+        ORDER BY id LIMIT ?
+    """
+    SQL_CATALOGO = """
+        SELECT periodo, caminho, pedidos, menor_id, maior_id, primeira_data, ultima_data,
+               primeiro_pagamento, ultimo_pagamento, atualizado_em
+        FROM arquivo_pedido ORDER BY periodo
+    """
+    SQL_CAMINHO = "SELECT caminho FROM arquivo_pedido WHERE periodo = ?"
+    SQL_ARQUIVOS_PEDIDOS = """
+        SELECT periodo, caminho FROM arquivo_pedido
+        WHERE primeira_data < ? AND ultima_data >= ? ORDER BY periodo
+    """
+    SQL_ARQUIVOS_PAGAMENTOS = """
+        SELECT periodo, caminho FROM arquivo_pedido
+        WHERE primeiro_pagamento < ? AND ultimo_pagamento >= ? ORDER BY periodo
+    """
+    SQL_ARQUIVOS_ID = """
+        SELECT periodo, caminho FROM arquivo_pedido
+        WHERE menor_id <= ? AND maior_id >= ? ORDER BY periodo DESC
+    """
+    SQL_REGISTRAR = """
+        INSERT INTO arquivo_pedido (periodo, caminho, pedidos, menor_id, maior_id, primeira_data,
+                                    ultima_data, primeiro_pagamento, ultimo_pagamento)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (periodo) DO UPDATE SET
+            pedidos = excluded.pedidos,
+            menor_id = MIN(menor_id, excluded.menor_id),
+            maior_id = MAX(maior_id, excluded.maior_id),
+            primeira_data = MIN(primeira_data, excluded.primeira_data),
+            ultima_data = MAX(ultima_data, excluded.ultima_data),
+            primeiro_pagamento = COALESCE(MIN(primeiro_pagamento, excluded.primeiro_pagamento),
+                                          primeiro_pagamento, excluded.primeiro_pagamento),
+            ultimo_pagamento = COALESCE(MAX(ultimo_pagamento, excluded.ultimo_pagamento),
+                                        ultimo_pagamento, excluded.ultimo_pagamento),
+            atualizado_em = datetime('now')
+    """
+    # Partes das consultas unidas: {0} é o banco (main ou o apelido do
+    # arquivo) e {1} descarta do arquivo o que ainda está no principal
+    SQL_PEDIDOS = """
+        SELECT ped.id, ped.numero, pe.nome, ped.data_pedido, ped.status, ped.total, ped.qtd_itens,
+               ? AS origem
+        FROM {0}.pedido ped
+        LEFT JOIN main.pessoa pe ON pe.id = ped.cliente_id
+        WHERE ped.data_pedido >= ? AND ped.data_pedido < ? {1}
+    """
+    SQL_PAGAMENTOS = """
+        SELECT pag.id, ped.numero, pag.valor, pag.forma, pag.status, pag.data_pagamento,
+               ? AS origem
+        FROM {0}.pagamento pag
+        JOIN {0}.pedido ped ON ped.id = pag.pedido_id
+        WHERE pag.data_pagamento >= ? AND pag.data_pagamento < ? {1}
+    """
+    SQL_RECEITA = """
+        SELECT ped.data_pedido, ped.qtd_itens, ped.total, ? AS origem
+        FROM {0}.pedido ped
+        WHERE ped.data_pedido >= ? AND ped.data_pedido < ? AND ped.status = 'Finalizado' {1}
+    """
+    SQL_ITENS = """
+        SELECT ip.id, r.descricao, ip.quantidade, ip.valor_unitario,
+               (ip.quantidade * ip.valor_unitario) AS subtotal, ? AS origem
+        FROM {0}.item_pedido ip
+        LEFT JOIN main.roupa r ON r.id = ip.roupa_id
+        WHERE ip.pedido_id = ? {1}
+    """
+    SEM_DUPLICADOS = "AND NOT EXISTS (SELECT 1 FROM main.pedido h WHERE h.id = {})"
+
+    def __init__(self, db_name="confeccao.db", diretorio=None):
+        super().__init__(db_name)
+        self.pasta_banco = None if em_memoria(db_name) else os.path.dirname(os.path.abspath(db_name))
+        if diretorio is None and self.pasta_banco is None:
+            raise ValueError("Banco em memória: informe o diretório dos arquivos")
+        self.diretorio = diretorio or os.path.join(self.pasta_banco, "arquivo")
+        self._colunas = {}
+
+    # =======================================================
+    # ARQUIVOS POR PERÍODO
+    # =======================================================
+
+    def _caminho_absoluto(self, caminho):
+        return os.path.join(self.pasta_banco or "", caminho)
+
+    def _caminho_novo(self, periodo):
+        # Guardado relativo à pasta do banco, para o conjunto poder mudar de lugar
+        base = os.path.splitext(os.path.basename(self.db_name))[0] if self.pasta_banco else "confeccao"
+        caminho = os.path.abspath(os.path.join(self.diretorio, f"{base}-{periodo}.db"))
+        if self.pasta_banco:
+            relativo = os.path.relpath(caminho, self.pasta_banco)
+            if not relativo.startswith(".."):
+                return relativo
+        return caminho
+
+    def _colunas_de(self, conn, tabela):
+        if tabela not in self._colunas:
+            self._colunas[tabela] = [linha[1:] for linha in conn.execute(f"PRAGMA main.table_info({tabela})")]
+        return self._colunas[tabela]
+
+    def _preparar_arquivo(self, conn, apelido):
+        # Mesmas colunas do banco principal, sem chaves estrangeiras nem
+        # gatilhos: o arquivo só recebe cópias
+        conn.execute(f"PRAGMA {apelido}.journal_mode = WAL").fetchall()
+        conn.execute(f"PRAGMA {apelido}.synchronous = FULL")
+        for tabela, _ in TABELAS_ARQUIVO:
+            colunas = self._colunas_de(conn, tabela)
+            definicoes = ", ".join(f"{nome} INTEGER PRIMARY KEY" if pk else f"{nome} {tipo}"
+                                   for nome, tipo, _, _, pk in colunas)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {apelido}.{tabela} ({definicoes})")
+            # Colunas acrescentadas ao principal depois que o arquivo nasceu
+            existentes = {linha[1] for linha in conn.execute(f"PRAGMA {apelido}.table_info({tabela})")}
+            for nome, tipo, _, _, _ in colunas:
+                if nome not in existentes:
+                    conn.execute(f"ALTER TABLE {apelido}.{tabela} ADD COLUMN {nome} {tipo}")
+        for comando in INDICES_ARQUIVO:
+            conn.execute(comando.format(apelido))
+        conn.commit()
+
+    def _anexar(self, conn, anexos, periodo):
+        if periodo in anexos:
+            return anexos[periodo][0]
+        # Respeita o limite de bancos anexados da conexão (10 por padrão)
+        if len(anexos) >= conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED):
+            antigo, _ = anexos.pop(next(iter(anexos)))
+            conn.execute(f"DETACH DATABASE {antigo}")
+        linha = conn.execute(self.SQL_CAMINHO, (periodo,)).fetchone()
+        caminho = linha[0] if linha else self._caminho_novo(periodo)
+        absoluto = self._caminho_absoluto(caminho)
+        os.makedirs(os.path.dirname(absoluto), exist_ok=True)
+        apelido = "arq_" + periodo.replace("-", "_")
+        conn.execute(f"ATTACH DATABASE ? AS {apelido}", (absoluto,))
+        anexos[periodo] = (apelido, caminho)
+        self._preparar_arquivo(conn, apelido)
+        return apelido
+
+    # =======================================================
+    # ARQUIVAMENTO EM LOTES
+    # =======================================================
+
+    def arquivar(self, corte, periodo="mes", tamanho_lote=None, pausa=0.0):
+        # Pedidos com data_pedido < corte; a pausa entre os lotes dá folga
+        # aos outros escritores
+        formato = PERIODOS[periodo]
+        tamanho_lote = tamanho_lote or self.tamanho_lote
+        conn = self.conectar()
+        anexos = {}
+        resumo = {"pedidos": 0, "alterados": 0, "lotes": 0, "maior_trava_ms": 0.0, "periodos": {}}
+        apos_id = 0
+        try:
+            while True:
+                linhas = conn.execute(self.SQL_CANDIDATOS,
+                                      (formato, apos_id, str(corte), *STATUS_ARQUIVAVEIS, tamanho_lote)).fetchall()
+                if not linhas:
+                    break
+                apos_id = linhas[-1][0]
+                por_periodo = {}
+                for pedido_id, chave in linhas:
+                    por_periodo.setdefault(chave, []).append(pedido_id)
+                for chave, ids in por_periodo.items():
+                    apelido = self._anexar(conn, anexos, chave)
+                    # Direto em _transacao_imediata, não em _gravar: o ATTACH vale
+                    # só para esta conexão, não para a do escritor agrupado
+                    self._transacao_imediata(lambda c: self._copiar(c, apelido, chave, anexos[chave][1], ids))
+                    t0 = time.perf_counter()
+                    movidos = self._transacao_imediata(lambda c: self._remover(c, apelido, ids))
+                    trava = (time.perf_counter() - t0) * 1000
+                    resumo["maior_trava_ms"] = max(resumo["maior_trava_ms"], trava)
+                    resumo["pedidos"] += movidos
+                    resumo["alterados"] += len(ids) - movidos
+                    resumo["periodos"][chave] = resumo["periodos"].get(chave, 0) + movidos
+                    resumo["lotes"] += 1
+                if len(linhas) < tamanho_lote:
+                    break
+                if pausa:
+                    time.sleep(pausa)
+        finally:
+            for apelido, _ in anexos.values():
+                conn.execute(f"DETACH DATABASE {apelido}")
+        return resumo
+
+    def _copiar(self, conn, apelido, periodo, caminho, ids):
+        # Só escreve no arquivo e no catálogo; o principal não perde nada aqui
+        for tabela, filtro in TABELAS_ARQUIVO:
+            colunas = ", ".join(nome for nome, *_ in self._colunas_de(conn, tabela))
+            conn.execute(f"INSERT OR REPLACE INTO {apelido}.{tabela} ({colunas}) "
+                         f"SELECT {colunas} FROM main.{tabela} WHERE {filtro.format(marcadores(ids))}", ids)
+        # Contagem do arquivo inteiro: repetir um lote não conta duas vezes
+        resumo = conn.execute(f"""
+            SELECT COUNT(*), MIN(id), MAX(id), MIN(data_pedido), MAX(data_pedido),
+                   (SELECT MIN(data_pagamento) FROM {apelido}.pagamento),
+                   (SELECT MAX(data_pagamento) FROM {apelido}.pagamento)
+            FROM {apelido}.pedido
+        """).fetchone()
+        conn.execute(self.SQL_REGISTRAR, (periodo, caminho, *resumo))
+
+    def _remover(self, conn, apelido, ids):
+        # Só sai do principal o pedido ainda arquivável que o arquivo já
+        # tem igual; um pedido estornado entre a cópia e aqui fica para a
+        # próxima execução
+        confirmados = [linha[0] for linha in conn.execute(f"""
+            SELECT h.id FROM main.pedido h
+            JOIN {apelido}.pedido a ON a.id = h.id
+            WHERE h.id IN ({marcadores(ids)}) AND h.status IN ({marcadores(STATUS_ARQUIVAVEIS)})
+              AND a.status = h.status AND a.total IS h.total AND a.qtd_itens IS h.qtd_itens
+        """, (*ids, *STATUS_ARQUIVAVEIS))]
+        if confirmados:
+            # ON DELETE CASCADE: itens, pagamento, produção e execuções
+            conn.execute(f"DELETE FROM main.pedido WHERE id IN ({marcadores(confirmados)})", confirmados)
+        return len(confirmados)
+
+    # =======================================================
+    # CONSULTAS (PRINCIPAL + ARQUIVOS)
+    # =======================================================
+
+    def arquivos(self):
+        return self.conectar().execute(self.SQL_CATALOGO).fetchall()
+
+    def _em_grupos(self, parte, parametros, arquivos, montar, coluna_pedido="ped.id"):
+        # Uma consulta UNION ALL por grupo de arquivos anexados; o primeiro
+        # grupo inclui o banco principal. Devolve as linhas de cada grupo.
+        conn = self.conectar()
+        limite = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        grupos = [arquivos[i:i + limite] for i in range(0, len(arquivos), limite)] or [[]]
+        resultados = []
+        for numero, grupo in enumerate(grupos):
+            partes, valores = ([parte.format("main", "")], ["principal", *parametros]) if numero == 0 else ([], [])
+            apelidos = []
+            try:
+                for indice, (periodo, caminho) in enumerate(grupo):
+                    apelido = f"arq{indice}"
+                    conn.execute(f"ATTACH DATABASE ? AS {apelido}", (self._caminho_absoluto(caminho),))
+                    apelidos.append(apelido)
+                    partes.append(parte.format(apelido, self.SEM_DUPLICADOS.format(coluna_pedido)))
+                    valores.extend((periodo, *parametros))
+                resultados.append(conn.execute(montar(" UNION ALL ".join(partes)), valores).fetchall())
+            finally:
+                for apelido in apelidos:
+                    conn.execute(f"DETACH DATABASE {apelido}")
+        return resultados
+
+    def _arquivos_no_intervalo(self, sql, inicio, fim):
+        return self.conectar().execute(sql, (fim, inicio)).fetchall()
+
+    def pedidos(self, inicio, fim):
+        # (id, numero, cliente, data_pedido, status, total, qtd_itens, origem)
+        # com data_pedido em [inicio, fim), por data
+        arquivos = self._arquivos_no_intervalo(self.SQL_ARQUIVOS_PEDIDOS, inicio, fim)
+        grupos = self._em_grupos(self.SQL_PEDIDOS, (inicio, fim), arquivos,
+                                 lambda uniao: f"SELECT * FROM ({uniao}) ORDER BY data_pedido, id")
+        return list(heapq.merge(*grupos, key=lambda linha: (linha[3], linha[0])))
+
+    def pagamentos(self, inicio, fim):
+        # (id, numero, valor, forma, status, data_pagamento, origem), por data
+        arquivos = self._arquivos_no_intervalo(self.SQL_ARQUIVOS_PAGAMENTOS, inicio, fim)
+        grupos = self._em_grupos(self.SQL_PAGAMENTOS, (inicio, fim), arquivos,
+                                 lambda uniao: f"SELECT * FROM ({uniao}) ORDER BY data_pagamento, id")
+        return list(heapq.merge(*grupos, key=lambda linha: (linha[5], linha[0])))
+
+    def receita_por_periodo(self, inicio, fim, por="dia"):
+        # Mesmas colunas de relatorios.receita_por_periodo, com o histórico
+        formato = FORMATOS_RECEITA[por]
+        arquivos = self._arquivos_no_intervalo(self.SQL_ARQUIVOS_PEDIDOS, inicio, fim)
+        grupos = self._em_grupos(self.SQL_RECEITA, (inicio, fim), arquivos, lambda uniao: f"""
+            SELECT strftime('{formato}', data_pedido) AS periodo, COUNT(*), SUM(qtd_itens), SUM(total)
+            FROM ({uniao}) GROUP BY periodo
+        """)
+        somas = {}
+        for linhas in grupos:
+            for periodo, pedidos, itens, receita in linhas:
+                atual = somas.get(periodo, (0, 0, 0.0))
+                somas[periodo] = (atual[0] + pedidos, atual[1] + (itens or 0), atual[2] + (receita or 0.0))
+        return [(periodo, pedidos, itens, round(receita, 2))
+                for periodo, (pedidos, itens, receita) in sorted(somas.items())]
+
+    def itens_do_pedido(self, pedido_id):
+        # Procura no principal e, se o pedido não estiver lá, só nos
+        # arquivos cuja faixa de ids o contém
+        conn = self.conectar()
+        if conn.execute("SELECT 1 FROM pedido WHERE id = ?", (pedido_id,)).fetchone():
+            arquivos = []
+        else:
+            arquivos = conn.execute(self.SQL_ARQUIVOS_ID, (pedido_id, pedido_id)).fetchall()
+        grupos = self._em_grupos(self.SQL_ITENS, (pedido_id,), arquivos,
+                                 lambda uniao: f"SELECT * FROM ({uniao}) ORDER BY id", "ip.pedido_id")
+        return [linha for linhas in grupos for linha in linhas]
+
+
+def exibir_resumo(resumo, duracao):
+    for periodo, pedidos in sorted(resumo["periodos"].items()):
+        print(f"🗄️ {periodo}: {pedidos} pedidos arquivados")
+    if resumo["alterados"]:
+        print(f"⚠️ {resumo['alterados']} pedidos mudaram durante a cópia e ficaram no banco principal")
+    ritmo = resumo["pedidos"] / duracao if duracao else 0
+    print(f"✅ {resumo['pedidos']} pedidos arquivados em {resumo['lotes']} lotes | "
+          f"{duracao:.1f} s ({ritmo:,.0f}/s) | maior trava de escrita: {resumo['maior_trava_ms']:.1f} ms")
+
+
+# =======================================================
+# EXECUÇÃO COMO SCRIPT
+# =======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arquivamento de pedidos antigos por período")
+    parser.add_argument("acao", choices=["arquivar", "arquivos", "pedidos", "pagamentos", "receita", "itens"])
+    parser.add_argument("pedido_id", nargs="?", type=int)
+    parser.add_argument("--antes-de", help="data de corte do arquivamento (AAAA-MM-DD)")
+    parser.add_argument("--periodo", choices=list(PERIODOS), default="mes")
+    parser.add_argument("--lote", type=int, default=None)
+    parser.add_argument("--pausa", type=float, default=0.0, help="segundos entre os lotes")
+    parser.add_argument("--inicio")
+    parser.add_argument("--fim")
+    parser.add_argument("--por", choices=list(FORMATOS_RECEITA), default="mes")
+    parser.add_argument("--diretorio", default=None, help="pasta dos arquivos (padrão: arquivo/ ao lado do banco)")
+    parser.add_argument("--db", default="confeccao.db")
+    args = parser.parse_args(argv)
+
+    arquivamento = Arquivamento(args.db, args.diretorio)
+    if args.acao == "arquivar":
+        if not args.antes_de:
+            parser.error("informe --antes-de")
+        t0 = time.perf_counter()
+        resumo = arquivamento.arquivar(args.antes_de, args.periodo, args.lote, args.pausa)
+        exibir_resumo(resumo, time.perf_counter() - t0)
+    elif args.acao == "arquivos":
+        arquivos = arquivamento.arquivos()
+        if not arquivos:
+            print("📦 Nenhum pedido arquivado.")
+        for periodo, caminho, pedidos, menor_id, maior_id, primeira, ultima, *_ in arquivos:
+            print(f"🗄️ {periodo} | {caminho} | {pedidos} pedidos | ids {menor_id}-{maior_id} | {primeira} a {ultima}")
+    elif args.acao == "itens":
+        if args.pedido_id is None:
+            parser.error("informe o id do pedido")
+        for item_id, descricao, quantidade, valor, subtotal, origem in arquivamento.itens_do_pedido(args.pedido_id):
+            print(f"Item {item_id} | {descricao} | {quantidade} x R$ {valor:.2f} = R$ {subtotal:.2f} | {origem}")
+    else:
+        if not args.inicio or not args.fim:
+            parser.error("informe --inicio e --fim")
+        if args.acao == "pedidos":
+            for pedido_id, numero, cliente, data, status, total, qtd, origem in arquivamento.pedidos(args.inicio, args.fim):
+                print(f"Pedido {pedido_id} | {numero} | {cliente} | {data} | {status} | "
+                      f"R$ {total or 0:.2f} ({qtd} itens) | {origem}")
+        elif args.acao == "pagamentos":
+            for pagamento_id, numero, valor, forma, status, data, origem in arquivamento.pagamentos(args.inicio, args.fim):
+                print(f"Pagamento {pagamento_id} | Pedido {numero} | R$ {valor:.2f} | {forma} | {status} | {data} | {origem}")
+        else:
+            print(f"\n📊 RECEITA POR {args.por.upper()}:")
+            for periodo, pedidos, itens, receita in arquivamento.receita_por_periodo(args.inicio, args.fim, args.por):
+                print(f"{periodo} | {pedidos} pedidos | {itens} itens | R$ {receita:.2f}")
+
+
+if __name__ == "__main__":
+    main()
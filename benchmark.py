@@ -0,0 +1,391 @@
+# =======================================================
+# BENCHMARK DOS DAOs E DO DOMÍNIO
+# =======================================================
+#
+# Cria um banco temporário com o schema de ddl_confeccao.py, popula
+# com dados sintéticos na escala pedida e mede cada operação dos DAOs
+# de main.py e os caminhos em memória de Pedido.
+#
+#   python benchmark.py --escala 10k
+#   python benchmark.py --escala 100k --saida base.json
+#   python benchmark.py --escala 100k --comparar base.json
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from ddl_confeccao import aplicar_migracoes, criar_tabelas
+from instrucoes_sql import FORMAS_LINHA
+from main import (
+    DAO, INSTRUCOES, Cliente, ClienteDAO, ItemPedido, ItemPedidoDAO, PagamentoDAO, Pedido,
+    PedidoDAO, Pessoa, Preguicoso, Roupa, RoupaDAO, StatusPedido,
+)
+
+ESCALAS = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+FORMAS = ["Dinheiro", "Cartão", "Pix", "Boleto"]
+# Meta de partida a frio: importar main + primeira consulta num banco existente
+META_PARTIDA_MS = 100
+
+
+# =======================================================
+# BANCO TEMPORÁRIO E DADOS SINTÉTICOS
+# =======================================================
+
+def criar_banco(diretorio):
+    caminho = os.path.join(diretorio, "benchmark.db")
+    conn = sqlite3.connect(caminho)
+    conn.execute("PRAGMA foreign_keys = ON")
+    criar_tabelas(conn.cursor())
+    conn.commit()
+    aplicar_migracoes(conn)
+    conn.close()
+    return caminho
+
+
+def popular(db_name, quantidade, rnd):
+    ClienteDAO(db_name).inserir_lote(
+        Cliente(f"Cliente {i}", f"{i:011d}", f"Rua {i}, {rnd.randint(1, 999)}")
+        for i in range(quantidade))
+    RoupaDAO(db_name).inserir_lote(
+        Roupa(f"SKU{i:07d}", f"Peça {i}", rnd.choice("PMGX"), rnd.choice(["azul", "preto", "branco"]),
+              round(rnd.uniform(20, 400), 2), 10_000_000)
+        for i in range(quantidade))
+    with DAO(db_name).conectar() as conn:
+        conn.executemany("INSERT INTO pedido (numero, cliente_id) VALUES (?, ?)",
+                         ((f"PED{i:08d}", rnd.randint(1, quantidade)) for i in range(quantidade)))
+        conn.executemany("""
+            INSERT INTO item_pedido (pedido_id, roupa_id, quantidade, valor_unitario)
+            VALUES (?, ?, ?, ?)
+        """, ((rnd.randint(1, quantidade), rnd.randint(1, quantidade), rnd.randint(1, 5),
+               round(rnd.uniform(20, 400), 2)) for _ in range(quantidade)))
+
+
+# =======================================================
+# MEDIÇÃO
+# =======================================================
+
+@contextlib.contextmanager
+def silenciado():
+    # Os DAOs imprimem a cada chamada; o texto vai para /dev/null para não
+    # pesar na latência nem no pico de memória medido
+    with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+        yield
+
+
+def percentil(ordenados, p):
+    return ordenados[min(len(ordenados) - 1, int(round(p * (len(ordenados) - 1))))]
+
+
+def medir(operacao, repeticoes, amostras_memoria):
+    # Primeiro mede tempo sem tracemalloc (que distorce a latência),
+    # depois roda algumas chamadas extras só para medir o pico de memória.
+    latencias = []
+    with silenciado():
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            operacao()
+            latencias.append(time.perf_counter() - inicio)
+        tracemalloc.start()
+        for _ in range(amostras_memoria):
+            operacao()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    latencias.sort()
+    total = sum(latencias)
+    return {
+        "ops": repeticoes,
+        "ops_por_s": round(repeticoes / total, 1) if total else None,
+        "p50_ms": round(percentil(latencias, 0.50) * 1000, 4),
+        "p99_ms": round(percentil(latencias, 0.99) * 1000, 4),
+        "pico_memoria_kb": round(pico / 1024, 1),
+    }
+
+
+def operacoes(db_name, quantidade, rnd, itens_por_pedido):
+    clientes = ClienteDAO(db_name)
+    roupas = RoupaDAO(db_name)
+    pedidos = PedidoDAO(db_name)
+    itens = ItemPedidoDAO(db_name)
+    pagamentos = PagamentoDAO(db_name)
+    seq = itertools.count()
+    # Pedidos criados durante o benchmark: ainda sem pagamento
+    novos_pedidos = []
+    pagos = []
+
+    def criar_pedido():
+        n = next(seq)
+        pedidos.criar(f"BENCH{n:08d}", rnd.randint(1, quantidade))
+        novos_pedidos.append(quantidade + len(novos_pedidos) + 1)
+
+    def inserir_pagamento():
+        pedido_id = novos_pedidos.pop()
+        pagamentos.inserir(pedido_id, 100.0, rnd.choice(FORMAS))
+        pagos.append(pedido_id)
+
+    def confirmar_pagamento():
+        pagamentos.confirmar(pagos.pop())
+
+    roupa_memoria = Roupa("MEM", "Peça em memória", "M", "azul", 50.0, 10 ** 9)
+    pedido_memoria = Pedido("MEM", cliente=None)
+    with silenciado():
+        for _ in range(itens_por_pedido):
+            pedido_memoria.adicionar_item(ItemPedido(roupa_memoria, 1))
+
+    def adicionar_item_memoria():
+        Pedido("MEM").adicionar_item(ItemPedido(roupa_memoria, 1))
+
+    return [
+        ("ClienteDAO.inserir", lambda: clientes.inserir(
+            Cliente("Bench", f"B{next(seq):010d}", "Rua Bench")), 1.0),
+        ("RoupaDAO.inserir", lambda: roupas.inserir(
+            Roupa(f"BSKU{next(seq):07d}", "Bench", "M", "azul", 99.9, 100)), 1.0),
+        ("PedidoDAO.criar", criar_pedido, 2.0),
+        ("ItemPedidoDAO.adicionar", lambda: itens.adicionar(
+            rnd.randint(1, quantidade), rnd.randint(1, quantidade), 1), 1.0),
+        ("PagamentoDAO.inserir", inserir_pagamento, 1.0),
+        ("PagamentoDAO.confirmar", confirmar_pagamento, 0.5),
+        ("ItemPedidoDAO.listar_por_pedido", lambda: itens.listar_por_pedido(
+            rnd.randint(1, quantidade)), 1.0),
+        ("ClienteDAO.listar", clientes.listar, None),
+        ("RoupaDAO.listar", roupas.listar, None),
+        ("PedidoDAO.listar", pedidos.listar, None),
+        ("PagamentoDAO.listar", pagamentos.listar, None),
+        ("Pedido.adicionar_item", adicionar_item_memoria, 1.0),
+        ("Pedido.calcular_total", pedido_memoria.calcular_total, 1.0),
+    ]
+
+
+def executar(quantidade, repeticoes, repeticoes_listagem, perfil, semente, itens_por_pedido):
+    rnd = random.Random(semente)
+    diretorio = tempfile.mkdtemp(prefix="confeccao-bench-")
+    try:
+        db_name = criar_banco(diretorio)
+        DAO.configurar_pool(db_name, perfil=perfil)
+        inicio = time.perf_counter()
+        popular(db_name, quantidade, rnd)
+        carga = time.perf_counter() - inicio
+        resultados = {"carga_inicial": {"linhas": quantidade * 5, "segundos": round(carga, 3),
+                                        "linhas_por_s": round(quantidade * 5 / carga, 1)}}
+        print(f"{'carga inicial (inserir_lote)':<36} {resultados['carga_inicial']['linhas_por_s']:>12} linhas/s\n")
+        for nome, operacao, fracao in operacoes(db_name, quantidade, rnd, itens_por_pedido):
+            n = repeticoes_listagem if fracao is None else max(1, int(repeticoes * fracao))
+            amostras = 1 if fracao is None else min(n, 50)
+            resultados[nome] = medir(operacao, n, amostras)
+            print(f"{nome:<36} {resultados[nome]['ops_por_s']:>12} ops/s | "
+                  f"p50 {resultados[nome]['p50_ms']:.3f} ms | p99 {resultados[nome]['p99_ms']:.3f} ms | "
+                  f"pico {resultados[nome]['pico_memoria_kb']} KB")
+        return resultados
+    finally:
+        DAO.fechar_pools()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+# =======================================================
+# MEMÓRIA DO MODELO DE DOMÍNIO (__slots__ x __dict__)
+# =======================================================
+
+def sem_slots(cls):
+    # Réplica da classe com os mesmos métodos, mas com __dict__ por instância
+    atributos = {nome: valor for nome, valor in vars(cls).items()
+                 if nome not in ("__slots__", "__dict__", "__weakref__", *cls.__slots__)}
+    return type(cls.__name__ + "ComDict", (), atributos)
+
+
+def memoria_por_objetos(fabrica, quantidade):
+    tracemalloc.start()
+    objetos = [fabrica(i) for i in range(quantidade)]
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objetos
+    return atual
+
+
+def medir_memoria_dominio(quantidade):
+    roupa = Roupa("SKU", "Peça", "M", "azul", 99.9, 10)
+    fabricas = {
+        "Pessoa": lambda cls: (lambda i: cls("Nome", "9999-9999", "a@b.c", i)),
+        "Roupa": lambda cls: (lambda i: cls("SKU", "Peça", "M", "azul", 99.9, 10, i)),
+        "ItemPedido": lambda cls: (lambda i: cls(roupa, 1, 99.9, i)),
+        "Pedido (preguiçoso)": lambda cls: (lambda i: cls(
+            "PED", i, Preguicoso(print, i), StatusPedido.ABERTO, Preguicoso(print, i))),
+    }
+    classes = {"Pessoa": Pessoa, "Roupa": Roupa, "ItemPedido": ItemPedido, "Pedido (preguiçoso)": Pedido}
+    resultados = {}
+    print(f"\n🧠 MEMÓRIA POR {quantidade} OBJETOS:")
+    for nome, fabrica in fabricas.items():
+        com_slots = memoria_por_objetos(fabrica(classes[nome]), quantidade)
+        com_dict = memoria_por_objetos(fabrica(sem_slots(classes[nome])), quantidade)
+        resultados[nome] = {
+            "slots_kb": round(com_slots / 1024, 1),
+            "dict_kb": round(com_dict / 1024, 1),
+            "reducao_pct": round(100 * (1 - com_slots / com_dict), 1),
+        }
+        print(f"{nome:<22} __slots__ {com_slots / 1048576:7.2f} MB | __dict__ {com_dict / 1048576:7.2f} MB | "
+              f"-{resultados[nome]['reducao_pct']}%")
+    return resultados
+
+
+# =======================================================
+# CACHE DE INSTRUÇÕES E FORMAS DE LINHA
+# =======================================================
+
+def medir_instrucoes(quantidade, repeticoes, perfil, semente):
+    # As mesmas chamadas com o pool aberto sem cache de instruções
+    # (cached_statements=0: todo execute recompila o SQL) e com o cache
+    # dimensionado pelo registro; as listagens também em cada forma de linha
+    rnd = random.Random(semente)
+    diretorio = tempfile.mkdtemp(prefix="confeccao-instrucoes-")
+    try:
+        db_name = criar_banco(diretorio)
+        popular(db_name, quantidade, rnd)
+        clientes = ClienteDAO(db_name)
+        roupas = RoupaDAO(db_name)
+        itens = ItemPedidoDAO(db_name)
+        casos = [
+            ("ItemPedidoDAO.adicionar",
+             lambda: itens.adicionar(rnd.randint(1, quantidade), rnd.randint(1, quantidade), 1), repeticoes),
+            ("ClienteDAO.buscar", lambda: clientes.buscar(rnd.randint(1, quantidade)), repeticoes),
+        ]
+        listagens = max(1, repeticoes // 20)
+        for forma in FORMAS_LINHA:
+            casos.append((f"ClienteDAO.iterar ({forma})",
+                          lambda forma=forma: sum(1 for _ in clientes.iterar(forma=forma)), listagens))
+            casos.append((f"RoupaDAO.iterar ({forma})",
+                          lambda forma=forma: sum(1 for _ in roupas.iterar(forma=forma)), listagens))
+
+        resultados = {}
+        tamanho = INSTRUCOES.tamanho_cache()
+        print(f"\n🧾 CACHE DE INSTRUÇÕES ({len(INSTRUCOES)} registradas, {quantidade} linhas):")
+        for cache in (0, tamanho):
+            DAO.configurar_pool(db_name, perfil=perfil, cached_statements=cache)
+            for nome, operacao, n in casos:
+                resultados.setdefault(nome, {})[f"cache_{cache}"] = medir(operacao, n, 1)
+            DAO.fechar_pools()
+        for nome, medidas in resultados.items():
+            sem, com = medidas["cache_0"]["p50_ms"], medidas[f"cache_{tamanho}"]["p50_ms"]
+            medidas["reducao_us"] = round((sem - com) * 1000, 1)
+            print(f"{nome:<30} p50 sem cache {sem:9.3f} ms | com cache {com:9.3f} ms | "
+                  f"{-medidas['reducao_us']:+.1f} µs/chamada")
+        return resultados
+    finally:
+        DAO.fechar_pools()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+# =======================================================
+# PARTIDA A FRIO (processo novo)
+# =======================================================
+
+CODIGO_PARTIDA = """
+import sys, time
+inicio = time.perf_counter()
+import main
+importado = time.perf_counter()
+list(main.ClienteDAO(sys.argv[1]).iterar(tamanho_lote=1))
+print(importado - inicio, time.perf_counter() - importado)
+"""
+
+
+def medir_partida(repeticoes):
+    # Cada medida é um interpretador novo: tempo de importar main e de
+    # fazer a primeira consulta (abrir o pool, conferir o schema, SELECT),
+    # num banco já criado e num arquivo novo (criação sob demanda)
+    diretorio = tempfile.mkdtemp(prefix="confeccao-partida-")
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    try:
+        existente = criar_banco(diretorio)
+        resultados = {}
+        print(f"\n🚀 PARTIDA A FRIO ({repeticoes} processos):")
+        for nome, caminho in (("banco existente", lambda i: existente),
+                              ("banco novo", lambda i: os.path.join(diretorio, f"novo{i}.db"))):
+            importacoes, consultas = [], []
+            for i in range(repeticoes):
+                saida = subprocess.run([sys.executable, "-c", CODIGO_PARTIDA, caminho(i)], cwd=raiz,
+                                       capture_output=True, text=True, check=True).stdout
+                importacao, consulta = map(float, saida.split())
+                importacoes.append(importacao * 1000)
+                consultas.append(consulta * 1000)
+            resultados[nome] = {
+                "importacao_ms": round(sorted(importacoes)[len(importacoes) // 2], 2),
+                "primeira_consulta_ms": round(sorted(consultas)[len(consultas) // 2], 2),
+            }
+            total = resultados[nome]["importacao_ms"] + resultados[nome]["primeira_consulta_ms"]
+            meta = f" {'✅' if total <= META_PARTIDA_MS else '⚠️'} meta {META_PARTIDA_MS} ms" \
+                if nome == "banco existente" else ""
+            print(f"{nome:<16} importar main {resultados[nome]['importacao_ms']:7.2f} ms | "
+                  f"primeira consulta {resultados[nome]['primeira_consulta_ms']:7.2f} ms | "
+                  f"total {total:7.2f} ms{meta}")
+        return resultados
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def comparar(atual, anterior):
+    print("\n📈 COMPARAÇÃO (ops/s atual ÷ anterior):")
+    for nome, medida in atual["resultados"].items():
+        antes = anterior.get("resultados", {}).get(nome, {})
+        if medida.get("ops_por_s") and antes.get("ops_por_s"):
+            print(f"{nome:<36} {medida['ops_por_s'] / antes['ops_por_s']:.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos DAOs do sistema de confecção")
+    parser.add_argument("--escala", default="10k",
+                        help="linhas por tabela: 1k, 10k, 100k, 1m ou um número")
+    parser.add_argument("--repeticoes", type=int, default=1000)
+    parser.add_argument("--repeticoes-listagem", type=int, default=3)
+    parser.add_argument("--itens-por-pedido", type=int, default=50)
+    parser.add_argument("--perfil", default="seguro")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--objetos-memoria", type=int, default=100_000,
+                        help="objetos por classe na medição de memória do domínio (0 desliga)")
+    parser.add_argument("--partida", type=int, default=5,
+                        help="processos novos na medição de partida a frio (0 desliga)")
+    parser.add_argument("--instrucoes", type=int, default=2000,
+                        help="chamadas na medição do cache de instruções (0 desliga)")
+    parser.add_argument("--saida", help="grava o resultado em JSON")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    args = parser.parse_args(argv)
+
+    quantidade = ESCALAS.get(args.escala.lower()) or int(args.escala)
+    print(f"⏱️ Benchmark com {quantidade} linhas por tabela (perfil {args.perfil})\n")
+    relatorio = {
+        "escala": quantidade,
+        "perfil": args.perfil,
+        "repeticoes": args.repeticoes,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "resultados": executar(quantidade, args.repeticoes, args.repeticoes_listagem,
+                               args.perfil, args.semente, args.itens_por_pedido),
+    }
+    if args.objetos_memoria:
+        relatorio["memoria_dominio"] = medir_memoria_dominio(args.objetos_memoria)
+    if args.instrucoes:
+        relatorio["instrucoes"] = medir_instrucoes(min(quantidade, 10_000), args.instrucoes,
+                                                   args.perfil, args.semente)
+    if args.partida:
+        relatorio["partida"] = medir_partida(args.partida)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultado gravado em {args.saida}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            comparar(relatorio, json.load(arquivo))
+    return relatorio
+
+
+if __name__ == "__main__":
+    main()
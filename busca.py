@@ -0,0 +1,108 @@
+# =======================================================
+# BUSCA TEXTUAL DE CLIENTES E ROUPAS
+# =======================================================
+#
+# Consultas sobre os índices FTS5 criados pela migração 5 de
+# ddl_confeccao.py (busca_cliente e busca_roupa), mantidos pelos
+# gatilhos das tabelas. Cada palavra digitada vira um prefixo e todas
+# precisam aparecer ("cami azu" encontra "Camiseta Azul"); acentos e
+# maiúsculas são ignorados. Os resultados vêm ordenados por relevância
+# (bm25) e paginados.
+#
+#   python busca.py roupa "cami azu"
+#   python busca.py cliente "maria 123" --pagina 2
+
+import argparse
+import re
+
+from main import DAO
+
+PALAVRA = re.compile(r"\w+")
+# Separadores entre dígitos (CPF formatado) somem, como no índice
+SEPARADOR_NUMERICO = re.compile(r"(?<=\d)[.\-/](?=\d)")
+
+
+def expressao_busca(texto):
+    # Cada palavra vira um prefixo entre aspas, o que também neutraliza
+    # os operadores da sintaxe do FTS5 (AND, OR, NEAR, *, ^, :)
+    termos = PALAVRA.findall(SEPARADOR_NUMERICO.sub("", texto))
+    return " ".join(f'"{termo}"*' for termo in termos)
+
+
+class Busca(DAO):
+    por_pagina = 20
+
+    # Pesos do bm25: um acerto no código vale mais que na descrição ou cor
+    SQL_ROUPAS = """
+        SELECT r.id, r.codigo, r.descricao, r.tamanho, r.cor, r.preco, r.estoque
+        FROM busca_roupa b JOIN roupa r ON r.id = b.rowid
+        WHERE busca_roupa MATCH ?
+        ORDER BY bm25(busca_roupa, 10.0, 2.0, 1.0)
+        LIMIT ? OFFSET ?
+    """
+    SQL_CLIENTES = """
+        SELECT p.id, p.nome, c.cpf, c.endereco
+        FROM busca_cliente b
+        JOIN cliente c ON c.id = b.rowid
+        JOIN pessoa p ON p.id = c.id
+        WHERE busca_cliente MATCH ?
+        ORDER BY bm25(busca_cliente, 1.0, 5.0)
+        LIMIT ? OFFSET ?
+    """
+
+    def _buscar(self, sql, texto, pagina, por_pagina):
+        expressao = expressao_busca(texto)
+        if not expressao:
+            return []
+        por_pagina = por_pagina or self.por_pagina
+        return self.conectar().execute(sql, (expressao, por_pagina, (pagina - 1) * por_pagina)).fetchall()
+
+    def _contar(self, tabela, texto):
+        expressao = expressao_busca(texto)
+        if not expressao:
+            return 0
+        return self.conectar().execute(
+            f"SELECT COUNT(*) FROM {tabela} WHERE {tabela} MATCH ?", (expressao,)).fetchone()[0]
+
+    def roupas(self, texto, pagina=1, por_pagina=None):
+        return self._buscar(self.SQL_ROUPAS, texto, pagina, por_pagina)
+
+    def clientes(self, texto, pagina=1, por_pagina=None):
+        return self._buscar(self.SQL_CLIENTES, texto, pagina, por_pagina)
+
+    def contar_roupas(self, texto):
+        return self._contar("busca_roupa", texto)
+
+    def contar_clientes(self, texto):
+        return self._contar("busca_cliente", texto)
+
+
+# =======================================================
+# EXECUÇÃO COMO SCRIPT
+# =======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Busca de clientes e roupas")
+    parser.add_argument("tipo", choices=["roupa", "cliente"])
+    parser.add_argument("texto")
+    parser.add_argument("--db", default="confeccao.db")
+    parser.add_argument("--pagina", type=int, default=1)
+    parser.add_argument("--por-pagina", type=int, default=Busca.por_pagina)
+    args = parser.parse_args(argv)
+    busca = Busca(args.db)
+
+    if args.tipo == "roupa":
+        total = busca.contar_roupas(args.texto)
+        print(f"\n🔎 ROUPAS para '{args.texto}' ({total} encontradas, página {args.pagina}):")
+        for r in busca.roupas(args.texto, args.pagina, args.por_pagina):
+            print(f"ID: {r[0]} | {r[1]} | {r[2]} | Tam: {r[3]} | Cor: {r[4]} | "
+                  f"R$ {r[5]:.2f} | Estoque: {r[6]}")
+    else:
+        total = busca.contar_clientes(args.texto)
+        print(f"\n🔎 CLIENTES para '{args.texto}' ({total} encontrados, página {args.pagina}):")
+        for c in busca.clientes(args.texto, args.pagina, args.por_pagina):
+            print(f"ID: {c[0]} | Nome: {c[1]} | CPF: {c[2]} | Endereço: {c[3]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# =======================================================
+# CACHE DO CATÁLOGO DE ROUPAS
+# =======================================================
+#
+# Cache em processo das linhas de "roupa", por id e por código, com
+# despejo LRU (capacidade máxima de linhas) e validade (TTL). É
+# preenchido por leitura (read-through) em RoupaDAO.buscar e
+# invalidado/atualizado pelas escritas dos DAOs. O estoque guardado
+# aqui é só informativo: a baixa de estoque continua sendo decidida
+# pelo UPDATE condicional no banco.
+
+import threading
+import time
+from collections import OrderedDict
+
+# Colunas guardadas, na ordem de RoupaDAO.SQL_BUSCAR
+COLUNAS = ("id", "codigo", "descricao", "tamanho", "cor", "preco", "estoque")
+ESTOQUE = COLUNAS.index("estoque")
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def cache_para(db_name, **opcoes):
+    cache = _caches.get(db_name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(db_name, CacheRoupa(**opcoes))
+    return cache
+
+
+class CacheRoupa:
+    def __init__(self, capacidade=10_000, ttl=60.0):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._linhas = OrderedDict()
+        self._ids_por_codigo = {}
+        self.acertos = 0
+        self.falhas = 0
+        self.expirados = 0
+        self.despejos = 0
+
+    def obter(self, roupa_id):
+        with self._lock:
+            entrada = self._linhas.get(roupa_id)
+            if entrada is None:
+                self.falhas += 1
+                return None
+            validade, linha = entrada
+            if validade < time.monotonic():
+                self._remover(roupa_id)
+                self.expirados += 1
+                self.falhas += 1
+                return None
+            self._linhas.move_to_end(roupa_id)
+            self.acertos += 1
+            return linha
+
+    def obter_por_codigo(self, codigo):
+        roupa_id = self._ids_por_codigo.get(codigo)
+        if roupa_id is None:
+            with self._lock:
+                self.falhas += 1
+            return None
+        return self.obter(roupa_id)
+
+    def guardar(self, linha):
+        roupa_id = linha[0]
+        with self._lock:
+            if roupa_id in self._linhas:
+                self._remover(roupa_id)
+            self._linhas[roupa_id] = (time.monotonic() + self.ttl, tuple(linha))
+            self._ids_por_codigo[linha[1]] = roupa_id
+            while len(self._linhas) > self.capacidade:
+                self._remover(next(iter(self._linhas)))
+                self.despejos += 1
+
+    def ajustar_estoque(self, roupa_id, delta):
+        with self._lock:
+            entrada = self._linhas.get(roupa_id)
+            if entrada is not None:
+                validade, linha = entrada
+                novo = linha[:ESTOQUE] + (linha[ESTOQUE] + delta,) + linha[ESTOQUE + 1:]
+                self._linhas[roupa_id] = (validade, novo)
+
+    def invalidar(self, roupa_id=None, codigo=None):
+        with self._lock:
+            if roupa_id is None and codigo is not None:
+                roupa_id = self._ids_por_codigo.get(codigo)
+            if roupa_id in self._linhas:
+                self._remover(roupa_id)
+
+    def limpar(self):
+        with self._lock:
+            self._linhas.clear()
+            self._ids_por_codigo.clear()
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "linhas": len(self._linhas),
+                "capacidade": self.capacidade,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "expirados": self.expirados,
+                "despejos": self.despejos,
+                "taxa_acerto": round(self.acertos / consultas, 4) if consultas else None,
+            }
+
+    def _remover(self, roupa_id):
+        _, linha = self._linhas.pop(roupa_id)
+        if self._ids_por_codigo.get(linha[1]) == roupa_id:
+            del self._ids_por_codigo[linha[1]]
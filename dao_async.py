@@ -0,0 +1,267 @@
+# =======================================================
+# DAOs ASSÍNCRONOS (asyncio)
+# =======================================================
+#
+# Versões "await" dos DAOs de main.py para uso dentro de um serviço
+# asyncio. O sqlite3 continua bloqueante, então nenhuma consulta roda
+# no event loop: as escritas vão para uma única thread escritora (uma
+# fila, sem disputa de lock entre escritores do mesmo processo) e as
+# leituras para um pool de threads leitoras (WAL permite ler enquanto
+# se escreve). Um semáforo limita quantas operações podem estar na
+# fila ao mesmo tempo; acima disso as corrotinas esperam (backpressure)
+# em vez de acumular trabalho sem limite.
+#
+#   async with ExecutorDAO("confeccao.db") as executor:
+#       clientes = AsyncClienteDAO("confeccao.db", executor)
+#       pedidos = AsyncPedidoDAO("confeccao.db", executor)
+#       cliente = await clientes.buscar(1)
+#       pedido_id = await pedidos.criar("PED-1", cliente.id)
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+from main import (
+    DAO, ClienteDAO, FuncionarioDAO, ItemPedidoDAO, PagamentoDAO, PedidoDAO, RoupaDAO,
+    roupa_de_linha,
+)
+
+_executores = {}
+_executores_lock = threading.Lock()
+
+
+def executor_para(db_name="confeccao.db", **opcoes):
+    executor = _executores.get(db_name)
+    if executor is None or executor.fechado:
+        with _executores_lock:
+            executor = _executores.get(db_name)
+            if executor is None or executor.fechado:
+                executor = _executores[db_name] = ExecutorDAO(db_name, **opcoes)
+    return executor
+
+
+class ExecutorDAO:
+    def __init__(self, db_name="confeccao.db", leitores=3, max_pendentes=256):
+        # Cada thread do executor prende uma conexão do pool enquanto viver,
+        # e sobra pelo menos uma para o código síncrono do processo
+        pool = DAO.obter_pool(db_name)
+        if pool.tamanho < leitores + 2:
+            raise ValueError(
+                f"Pool de '{db_name}' tem {pool.tamanho} conexões; são necessárias "
+                f"{leitores + 2} (use DAO.configurar_pool(..., tamanho=...))")
+        self.db_name = db_name
+        self.leitores = leitores
+        self.max_pendentes = max_pendentes
+        self.fechado = False
+        self._escritor = ThreadPoolExecutor(1, thread_name_prefix="confeccao-escrita")
+        self._leitura = ThreadPoolExecutor(leitores, thread_name_prefix="confeccao-leitura")
+        # asyncio.Semaphore fica preso ao loop em que foi usado pela primeira vez
+        self._semaforos = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.pendentes = 0
+        self.concluidas = 0
+        self.esperas = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *erro):
+        await asyncio.get_running_loop().run_in_executor(None, self.fechar)
+        return False
+
+    def ler(self, funcao, *args, **kwargs):
+        return self._executar(self._leitura, partial(funcao, *args, **kwargs))
+
+    def escrever(self, funcao, *args, **kwargs):
+        return self._executar(self._escritor, partial(funcao, *args, **kwargs))
+
+    async def _executar(self, executor, tarefa):
+        if self.fechado:
+            raise RuntimeError(f"Executor de '{self.db_name}' já foi fechado")
+        loop = asyncio.get_running_loop()
+        semaforo = self._semaforos.get(loop)
+        if semaforo is None:
+            semaforo = self._semaforos[loop] = asyncio.Semaphore(self.max_pendentes)
+        if semaforo.locked():
+            self.esperas += 1
+        async with semaforo:
+            with self._lock:
+                self.pendentes += 1
+            try:
+                return await loop.run_in_executor(executor, tarefa)
+            finally:
+                with self._lock:
+                    self.pendentes -= 1
+                    self.concluidas += 1
+
+    def fechar(self):
+        self.fechado = True
+        self._escritor.shutdown(wait=True)
+        self._leitura.shutdown(wait=True)
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "leitores": self.leitores,
+                "max_pendentes": self.max_pendentes,
+                "pendentes": self.pendentes,
+                "concluidas": self.concluidas,
+                "esperas": self.esperas,
+            }
+
+
+# =======================================================
+# DAOs
+# =======================================================
+
+class AsyncDAO:
+    classe_dao = DAO
+
+    def __init__(self, db_name="confeccao.db", executor=None):
+        self.db_name = db_name
+        self.dao = self.classe_dao(db_name)
+        self.executor = executor or executor_para(db_name)
+
+    def _ler(self, funcao, *args, **kwargs):
+        return self.executor.ler(funcao, *args, **kwargs)
+
+    def _escrever(self, funcao, *args, **kwargs):
+        return self.executor.escrever(funcao, *args, **kwargs)
+
+    def _pagina(self, iterar, apos_id, limite, *args):
+        # Uma página por ida ao executor (no máximo DAO.tamanho_lote linhas
+        # sem limite explícito); o "listar" síncrono imprime, aqui as linhas
+        # voltam para quem chamou, que pede a próxima com apos_id = último id
+        limite = limite or self.dao.tamanho_lote
+        return list(islice(iterar(*args, apos_id=apos_id, tamanho_lote=min(limite, DAO.tamanho_lote)), limite))
+
+    async def _paginas(self, listar, *args, limite=None):
+        # Percorre tudo, uma página de cada vez
+        apos_id = 0
+        limite = limite or self.dao.tamanho_lote
+        while True:
+            pagina = await listar(*args, apos_id=apos_id, limite=limite)
+            if pagina:
+                yield pagina
+            if len(pagina) < limite:
+                return
+            apos_id = pagina[-1][0]
+
+    def listar(self, apos_id=0, limite=None):
+        return self._ler(self._pagina, self.dao.iterar, apos_id, limite)
+
+    def paginas(self, limite=None):
+        return self._paginas(self.listar, limite=limite)
+
+
+class AsyncClienteDAO(AsyncDAO):
+    classe_dao = ClienteDAO
+
+    def inserir(self, cliente):
+        return self._escrever(self.dao.inserir, cliente)
+
+    def inserir_lote(self, clientes, tamanho_lote=1000):
+        return self._escrever(self.dao.inserir_lote, list(clientes), tamanho_lote)
+
+    def buscar(self, id_cliente):
+        return self._ler(self.dao.buscar, id_cliente)
+
+    def deletar(self, id_cliente):
+        return self._escrever(self.dao.deletar, id_cliente)
+
+
+class AsyncRoupaDAO(AsyncDAO):
+    classe_dao = RoupaDAO
+
+    async def obter(self, roupa_id):
+        # Acerto no cache do catálogo não precisa sair do event loop
+        linha = self.dao.cache.obter(roupa_id)
+        if linha is not None:
+            return roupa_de_linha(linha)
+        return await self._ler(self.dao.obter, roupa_id)
+
+    def buscar_por_codigo(self, codigo):
+        return self._ler(self.dao.buscar_por_codigo, codigo)
+
+    def inserir(self, roupa):
+        return self._escrever(self.dao.inserir, roupa)
+
+    def inserir_lote(self, roupas, tamanho_lote=1000):
+        return self._escrever(self.dao.inserir_lote, list(roupas), tamanho_lote)
+
+    def deletar(self, id_roupa):
+        return self._escrever(self.dao.deletar, id_roupa)
+
+
+class AsyncFuncionarioDAO(AsyncDAO):
+    classe_dao = FuncionarioDAO
+
+    def inserir(self, funcionario):
+        return self._escrever(self.dao.inserir, funcionario)
+
+    def inserir_lote(self, funcionarios, tamanho_lote=1000):
+        return self._escrever(self.dao.inserir_lote, list(funcionarios), tamanho_lote)
+
+    def deletar(self, id_funcionario):
+        return self._escrever(self.dao.deletar, id_funcionario)
+
+
+class AsyncPedidoDAO(AsyncDAO):
+    classe_dao = PedidoDAO
+
+    def criar(self, numero, cliente_id):
+        return self._escrever(self.dao.criar, numero, cliente_id)
+
+    def total(self, pedido_id):
+        return self._ler(self.dao.total, pedido_id)
+
+    def carregar(self, pedido_id):
+        return self._ler(self._carregar, pedido_id)
+
+    def _carregar(self, pedido_id):
+        # As relações preguiçosas são resolvidas ainda na thread leitora,
+        # para que nenhum acesso a pedido.cliente/itens bloqueie o loop
+        pedido = self.dao.carregar(pedido_id)
+        if pedido is not None:
+            pedido.cliente
+            for item in pedido.itens:
+                item.roupa
+        return pedido
+
+
+class AsyncItemPedidoDAO(AsyncDAO):
+    classe_dao = ItemPedidoDAO
+
+    def reservar(self, pedido_id, itens):
+        return self._escrever(self.dao.reservar, pedido_id, list(itens))
+
+    def adicionar(self, pedido_id, roupa_id, quantidade):
+        return self._escrever(self.dao.adicionar, pedido_id, roupa_id, quantidade)
+
+    def listar(self, pedido_id, apos_id=0, limite=None):
+        return self._ler(self._pagina, self.dao.iterar_por_pedido, apos_id, limite, pedido_id)
+
+    def paginas(self, pedido_id, limite=None):
+        return self._paginas(self.listar, pedido_id, limite=limite)
+
+
+class AsyncPagamentoDAO(AsyncDAO):
+    classe_dao = PagamentoDAO
+
+    def inserir(self, pedido_id, valor, forma):
+        return self._escrever(self.dao.inserir, pedido_id, valor, forma)
+
+    def confirmar(self, pedido_id):
+        return self._escrever(self.dao.confirmar, pedido_id)
+
+    def processar_lote(self, pagamento_ids):
+        return self._escrever(self.dao.processar_lote, list(pagamento_ids))
+
+    def confirmar_lote(self, pagamento_ids):
+        return self._escrever(self.dao.confirmar_lote, list(pagamento_ids))
+
+    def estornar_lote(self, pagamento_ids):
+        return self._escrever(self.dao.estornar_lote, list(pagamento_ids))
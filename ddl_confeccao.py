@@ -1,138 +1,545 @@
+import itertools
+import os
 import sqlite3
+import sys
+import threading
+
+from pool_conexoes import PERFIL_PADRAO, aplicar_perfil
 
 # =======================================================
-# CONEXÃO E CRIAÇÃO DO BANCO
+# CRIAÇÃO DAS TABELAS
 # =======================================================
-conn = sqlite3.connect("confeccao.db")
-cursor = conn.cursor()
 
-# Ativa o uso de chaves estrangeiras no SQLite
-cursor.execute("PRAGMA foreign_keys = ON;")
+def criar_tabelas(cursor):
+    # Tabela: PESSOA (classe base)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS pessoa (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        telefone TEXT,
+        email TEXT,
+        tipo TEXT CHECK (tipo IN ('Cliente', 'Funcionario')) NOT NULL
+    );
+    """)
+
+    # Tabela: CLIENTE (herda de Pessoa)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS cliente (
+        id INTEGER PRIMARY KEY,
+        cpf TEXT UNIQUE,
+        endereco TEXT,
+        FOREIGN KEY (id) REFERENCES pessoa(id) ON DELETE CASCADE
+    );
+    """)
+
+    # Tabela: FUNCIONARIO (herda de Pessoa)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS funcionario (
+        id INTEGER PRIMARY KEY,
+        matricula TEXT UNIQUE,
+        cargo TEXT,
+        salario REAL DEFAULT 0.0,
+        FOREIGN KEY (id) REFERENCES pessoa(id) ON DELETE CASCADE
+    );
+    """)
+
+    # Tabela: ROUPA
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS roupa (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        codigo TEXT UNIQUE NOT NULL,
+        descricao TEXT NOT NULL,
+        tamanho TEXT,
+        cor TEXT,
+        preco REAL NOT NULL CHECK (preco >= 0),
+        estoque INTEGER NOT NULL DEFAULT 0 CHECK (estoque >= 0)
+    );
+    """)
+
+    # Tabela: PEDIDO
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS pedido (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        numero TEXT UNIQUE NOT NULL,
+        cliente_id INTEGER NOT NULL,
+        data_pedido TEXT DEFAULT (datetime('now')),
+        status TEXT CHECK (status IN ('Aberto', 'Em processamento', 'Finalizado', 'Cancelado')) DEFAULT 'Aberto',
+        FOREIGN KEY (cliente_id) REFERENCES cliente(id)
+    );
+    """)
+
+    # Tabela: ITEM_PEDIDO
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS item_pedido (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pedido_id INTEGER NOT NULL,
+        roupa_id INTEGER NOT NULL,
+        quantidade INTEGER NOT NULL CHECK (quantidade > 0),
+        valor_unitario REAL NOT NULL CHECK (valor_unitario >= 0),
+        FOREIGN KEY (pedido_id) REFERENCES pedido(id) ON DELETE CASCADE,
+        FOREIGN KEY (roupa_id) REFERENCES roupa(id)
+    );
+    """)
+
+    # Tabela: PAGAMENTO
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS pagamento (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        pedido_id INTEGER NOT NULL UNIQUE,
+        valor REAL NOT NULL CHECK (valor >= 0),
+        forma TEXT CHECK (forma IN ('Dinheiro', 'Cartão', 'Pix', 'Boleto')) NOT NULL,
+        status TEXT CHECK (status IN ('Pendente', 'Processando', 'Confirmado', 'Estornado')) DEFAULT 'Pendente',
+        data_pagamento TEXT DEFAULT (datetime('now')),
+        FOREIGN KEY (pedido_id) REFERENCES pedido(id) ON DELETE CASCADE
+    );
+    """)
+
+    # Tabela: PRODUCAO
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS producao (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        data_inicio TEXT,
+        data_fim TEXT,
+        status TEXT CHECK (status IN ('Planejada', 'Em andamento', 'Concluída', 'Cancelada')) DEFAULT 'Planejada'
+    );
+    """)
+
+    # Tabela: ETAPA_PRODUCAO
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS etapa_producao (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tipo TEXT CHECK (tipo IN ('Corte', 'Costura', 'Bordado', 'Acabamento', 'Inspeção')) NOT NULL,
+        descricao TEXT,
+        ordem INTEGER NOT NULL
+    );
+    """)
+
+    # Tabela: EXECUCAO_ETAPA
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS execucao_etapa (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        papel TEXT NOT NULL,
+        funcionario_id INTEGER,
+        horas_trabalhadas REAL DEFAULT 0.0,
+        observacoes TEXT,
+        FOREIGN KEY (funcionario_id) REFERENCES funcionario(id)
+    );
+    """)
+
 
 # =======================================================
-# CRIAÇÃO DAS TABELAS
+# MIGRAÇÕES (versionadas via PRAGMA user_version)
+# =======================================================
+# Cada migração tem um número de versão crescente e só é aplicada
+# em bancos cujo user_version ainda é menor que ela. Os comandos
+# usam IF NOT EXISTS para que reaplicar seja inofensivo.
+
+# Intervalo do gatilho de fotografia da migração 8 (removido na 9)
+INTERVALO_FOTO_ESTOQUE = 100_000
+
+MIGRACOES = [
+    (1, "Índices das chaves estrangeiras e filtros frequentes", [
+        "CREATE INDEX IF NOT EXISTS idx_item_pedido_pedido ON item_pedido (pedido_id)",
+        "CREATE INDEX IF NOT EXISTS idx_item_pedido_roupa ON item_pedido (roupa_id)",
+        "CREATE INDEX IF NOT EXISTS idx_pedido_cliente ON pedido (cliente_id)",
+        "CREATE INDEX IF NOT EXISTS idx_pessoa_tipo ON pessoa (tipo)",
+        "CREATE INDEX IF NOT EXISTS idx_execucao_etapa_funcionario ON execucao_etapa (funcionario_id)",
+    ]),
+    (2, "Total e quantidade de itens materializados em pedido", [
+        "ALTER TABLE pedido ADD COLUMN total REAL NOT NULL DEFAULT 0",
+        "ALTER TABLE pedido ADD COLUMN qtd_itens INTEGER NOT NULL DEFAULT 0",
+        """
+        UPDATE pedido SET
+            total = COALESCE((SELECT SUM(quantidade * valor_unitario) FROM item_pedido
+                              WHERE pedido_id = pedido.id), 0),
+            qtd_itens = (SELECT COUNT(*) FROM item_pedido WHERE pedido_id = pedido.id)
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_item_pedido_total_insert
+        AFTER INSERT ON item_pedido
+        BEGIN
+            UPDATE pedido SET total = total + NEW.quantidade * NEW.valor_unitario,
+                              qtd_itens = qtd_itens + 1
+            WHERE id = NEW.pedido_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_item_pedido_total_delete
+        AFTER DELETE ON item_pedido
+        BEGIN
+            UPDATE pedido SET total = total - OLD.quantidade * OLD.valor_unitario,
+                              qtd_itens = qtd_itens - 1
+            WHERE id = OLD.pedido_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_item_pedido_total_update
+        AFTER UPDATE OF pedido_id, quantidade, valor_unitario ON item_pedido
+        BEGIN
+            UPDATE pedido SET total = total - OLD.quantidade * OLD.valor_unitario,
+                              qtd_itens = qtd_itens - 1
+            WHERE id = OLD.pedido_id;
+            UPDATE pedido SET total = total + NEW.quantidade * NEW.valor_unitario,
+                              qtd_itens = qtd_itens + 1
+            WHERE id = NEW.pedido_id;
+        END
+        """,
+    ]),
+    (3, "Índices por data para os relatórios", [
+        # Cobre a receita por período sem ler a tabela pedido
+        "CREATE INDEX IF NOT EXISTS idx_pedido_data ON pedido (data_pedido, status, total, qtd_itens)",
+        "CREATE INDEX IF NOT EXISTS idx_pagamento_data ON pagamento (data_pagamento)",
+    ]),
+    (4, "Produção ligada ao pedido e execuções agendadas por etapa", [
+        "ALTER TABLE producao ADD COLUMN pedido_id INTEGER REFERENCES pedido(id) ON DELETE CASCADE",
+        "ALTER TABLE execucao_etapa ADD COLUMN producao_id INTEGER REFERENCES producao(id) ON DELETE CASCADE",
+        "ALTER TABLE execucao_etapa ADD COLUMN etapa_id INTEGER REFERENCES etapa_producao(id)",
+        "ALTER TABLE execucao_etapa ADD COLUMN inicio TEXT",
+        "ALTER TABLE execucao_etapa ADD COLUMN fim TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_producao_pedido ON producao (pedido_id)",
+        "CREATE INDEX IF NOT EXISTS idx_execucao_etapa_producao ON execucao_etapa (producao_id)",
+        # Etapas padrão, na ordem do fluxo da confecção
+        """
+        INSERT INTO etapa_producao (tipo, descricao, ordem)
+        SELECT tipo, descricao, ordem FROM (
+            SELECT 'Corte' AS tipo, 'Corte do tecido' AS descricao, 1 AS ordem
+            UNION ALL SELECT 'Costura', 'Montagem e costura', 2
+            UNION ALL SELECT 'Bordado', 'Bordado e personalização', 3
+            UNION ALL SELECT 'Acabamento', 'Acabamento e passadoria', 4
+            UNION ALL SELECT 'Inspeção', 'Inspeção de qualidade', 5
+        ) padrao
+        WHERE NOT EXISTS (SELECT 1 FROM etapa_producao e WHERE e.tipo = padrao.tipo)
+        """,
+    ]),
+    (5, "Índices de busca textual (FTS5) de roupas e clientes", [
+        # Roupa: índice de conteúdo externo (o texto fica só em "roupa");
+        # os gatilhos só disparam quando mudam as colunas indexadas, não
+        # nas baixas de estoque
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS busca_roupa USING fts5(
+            codigo, descricao, cor,
+            content='roupa', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        "INSERT INTO busca_roupa (busca_roupa) VALUES ('rebuild')",
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_busca_roupa_insert AFTER INSERT ON roupa
+        BEGIN
+            INSERT INTO busca_roupa (rowid, codigo, descricao, cor)
+            VALUES (NEW.id, NEW.codigo, NEW.descricao, NEW.cor);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_busca_roupa_delete AFTER DELETE ON roupa
+        BEGIN
+            INSERT INTO busca_roupa (busca_roupa, rowid, codigo, descricao, cor)
+            VALUES ('delete', OLD.id, OLD.codigo, OLD.descricao, OLD.cor);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_busca_roupa_update AFTER UPDATE OF codigo, descricao, cor ON roupa
+        BEGIN
+            INSERT INTO busca_roupa (busca_roupa, rowid, codigo, descricao, cor)
+            VALUES ('delete', OLD.id, OLD.codigo, OLD.descricao, OLD.cor);
+            INSERT INTO busca_roupa (rowid, codigo, descricao, cor)
+            VALUES (NEW.id, NEW.codigo, NEW.descricao, NEW.cor);
+        END
+        """,
+        # Cliente: nome vem de pessoa e cpf de cliente, então o índice guarda
+        # o próprio texto (rowid = id do cliente), com o CPF só com dígitos
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS busca_cliente USING fts5(
+            nome, cpf,
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        """
+        INSERT INTO busca_cliente (rowid, nome, cpf)
+        SELECT c.id, p.nome, replace(replace(replace(c.cpf, '.', ''), '-', ''), '/', '')
+        FROM cliente c JOIN pessoa p ON p.id = c.id
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_busca_cliente_insert AFTER INSERT ON cliente
+        BEGIN
+            INSERT INTO busca_cliente (rowid, nome, cpf)
+            SELECT NEW.id, p.nome, replace(replace(replace(NEW.cpf, '.', ''), '-', ''), '/', '')
+            FROM pessoa p WHERE p.id = NEW.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_busca_cliente_delete AFTER DELETE ON cliente
+        BEGIN
+            DELETE FROM busca_cliente WHERE rowid = OLD.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_busca_cliente_cpf AFTER UPDATE OF cpf ON cliente
+        BEGIN
+            UPDATE busca_cliente SET cpf = replace(replace(replace(NEW.cpf, '.', ''), '-', ''), '/', '')
+            WHERE rowid = NEW.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_busca_cliente_nome AFTER UPDATE OF nome ON pessoa
+        WHEN NEW.tipo = 'Cliente'
+        BEGIN
+            UPDATE busca_cliente SET nome = NEW.nome WHERE rowid = NEW.id;
+        END
+        """,
+    ]),
+    (6, "Livro de movimentos de estoque e fotografias periódicas", [
+        # Só acréscimos: cada mudança de roupa.estoque vira uma linha com a
+        # variação e o saldo resultante. Sem FK para a roupa, para que o
+        # histórico sobreviva à exclusão; sem AUTOINCREMENT, os ids seguem
+        # crescentes porque nada é apagado do livro
+        """
+        CREATE TABLE IF NOT EXISTS movimento_estoque (
+            id INTEGER PRIMARY KEY,
+            roupa_id INTEGER NOT NULL,
+            momento TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+            delta INTEGER NOT NULL,
+            saldo INTEGER NOT NULL
+        )
+        """,
+        # Saldo de uma roupa num instante: um único SEARCH neste índice
+        "CREATE INDEX IF NOT EXISTS idx_movimento_roupa ON movimento_estoque (roupa_id, momento)",
+        # Fotografia: estoque de todas as roupas até o movimento ultimo_movimento
+        """
+        CREATE TABLE IF NOT EXISTS foto_estoque (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            momento TEXT NOT NULL,
+            ultimo_movimento INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_foto_estoque_momento ON foto_estoque (momento)",
+        """
+        CREATE TABLE IF NOT EXISTS foto_estoque_item (
+            foto_id INTEGER NOT NULL,
+            roupa_id INTEGER NOT NULL,
+            estoque INTEGER NOT NULL,
+            PRIMARY KEY (foto_id, roupa_id),
+            FOREIGN KEY (foto_id) REFERENCES foto_estoque(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_movimento_estoque_insert AFTER INSERT ON roupa
+        WHEN NEW.estoque <> 0
+        BEGIN
+            INSERT INTO movimento_estoque (roupa_id, delta, saldo) VALUES (NEW.id, NEW.estoque, NEW.estoque);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_movimento_estoque_update AFTER UPDATE OF estoque ON roupa
+        WHEN NEW.estoque <> OLD.estoque
+        BEGIN
+            INSERT INTO movimento_estoque (roupa_id, delta, saldo)
+            VALUES (NEW.id, NEW.estoque - OLD.estoque, NEW.estoque);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_movimento_estoque_delete AFTER DELETE ON roupa
+        WHEN OLD.estoque <> 0
+        BEGIN
+            INSERT INTO movimento_estoque (roupa_id, delta, saldo) VALUES (OLD.id, -OLD.estoque, 0);
+        END
+        """,
+        # O livro começa com uma fotografia do estoque atual
+        """
+        INSERT INTO foto_estoque (momento, ultimo_movimento)
+        VALUES (strftime('%Y-%m-%d %H:%M:%f', 'now'), 0)
+        """,
+        """
+        INSERT INTO foto_estoque_item (foto_id, roupa_id, estoque)
+        SELECT (SELECT MAX(id) FROM foto_estoque), id, estoque FROM roupa
+        """,
+    ]),
+    (7, "Catálogo dos arquivos de pedidos antigos", [
+        # Um arquivo SQLite por período (arquivamento.py); as faixas de id
+        # e de datas dizem quais arquivos uma consulta precisa anexar
+        """
+        CREATE TABLE IF NOT EXISTS arquivo_pedido (
+            periodo TEXT PRIMARY KEY,
+            caminho TEXT NOT NULL,
+            pedidos INTEGER NOT NULL DEFAULT 0,
+            menor_id INTEGER,
+            maior_id INTEGER,
+            primeira_data TEXT,
+            ultima_data TEXT,
+            primeiro_pagamento TEXT,
+            ultimo_pagamento TEXT,
+            atualizado_em TEXT DEFAULT (datetime('now'))
+        )
+        """,
+    ]),
+    (8, "Fotografia automática do estoque a cada INTERVALO_FOTO_ESTOQUE movimentos", [
+        # Roda na mesma transação do movimento, seja qual for o caminho de
+        # escrita (DAOs, importação, SQL avulso). Os gatilhos de linha
+        # disparam linha a linha, então roupa.estoque aqui é exatamente o
+        # saldo até NEW.id, mesmo num UPDATE de várias roupas
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_movimento_estoque_foto AFTER INSERT ON movimento_estoque
+        WHEN NEW.id % {INTERVALO_FOTO_ESTOQUE} = 0
+        BEGIN
+            INSERT INTO foto_estoque (momento, ultimo_movimento)
+            VALUES (strftime('%Y-%m-%d %H:%M:%f', 'now'), NEW.id);
+            INSERT INTO foto_estoque_item (foto_id, roupa_id, estoque)
+            SELECT (SELECT MAX(id) FROM foto_estoque), id, estoque FROM roupa;
+        END
+        """,
+    ]),
+    (9, "Fotografia do estoque fora das transações de venda", [
+        # O gatilho da migração 8 copiava a tabela roupa inteira dentro da
+        # transação de quem gerou o movimento, segurando o lock de escrita
+        # no meio de uma venda. A fotografia agora é tarefa de manutenção
+        # (LivroEstoque.fotografar_se_preciso, chamada entre os grupos da
+        # escrita agrupada ou por "livro_estoque.py fotografar --se-preciso")
+        "DROP TRIGGER IF EXISTS trg_movimento_estoque_foto",
+    ]),
+]
+
+
+def versao_schema(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migracoes(conn):
+    aplicadas = []
+    for versao, descricao, comandos in MIGRACOES:
+        if versao <= versao_schema(conn):
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Outro processo pode ter aplicado a migração enquanto esperávamos o lock
+            if versao <= versao_schema(conn):
+                conn.rollback()
+                continue
+            for comando in comandos:
+                conn.execute(comando)
+            conn.execute(f"PRAGMA user_version = {versao}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        aplicadas.append((versao, descricao))
+    return aplicadas
+
+
+# =======================================================
+# CRIAÇÃO SOB DEMANDA
+# =======================================================
+# garantir_schema() é a entrada programática: num banco já na versão
+# atual custa um único PRAGMA user_version (e nada nas chamadas
+# seguintes do mesmo processo); só num banco novo ou desatualizado roda
+# o DDL e as migrações. Os DAOs chamam isso ao criar o pool de cada
+# banco, então nenhum processo precisa rodar este script antes.
+
+VERSAO_SCHEMA = MIGRACOES[-1][0]
+
+_garantidos = set()
+_garantidos_lock = threading.Lock()
+_contador_memoria = itertools.count(1)
+
+
+def em_memoria(db_name):
+    return db_name == ":memory:" or "mode=memory" in db_name
+
+
+def conectar(db_name):
+    # Nomes "file:..." são URIs (ex.: banco em memória compartilhado)
+    return sqlite3.connect(db_name, uri=db_name.startswith("file:"))
+
+
+def garantir_schema(db_name="confeccao.db", conn=None):
+    # Bancos em memória somem com a última conexão, então não ficam
+    # memorizados como prontos
+    if db_name in _garantidos:
+        return False
+    propria = conn is None
+    if propria:
+        conn = conectar(db_name)
+    try:
+        criado = versao_schema(conn) < VERSAO_SCHEMA
+        if criado:
+            conn.execute("PRAGMA foreign_keys = ON")
+            criar_tabelas(conn.cursor())
+            conn.commit()
+            aplicar_migracoes(conn)
+    finally:
+        if propria:
+            conn.close()
+    if not em_memoria(db_name):
+        with _garantidos_lock:
+            _garantidos.add(db_name)
+    return criado
+
+
+ensure_schema = garantir_schema
+
+
+def banco_em_memoria(nome=None):
+    # Banco em memória compartilhado entre as conexões do pool; existe
+    # enquanto alguma conexão estiver aberta (até DAO.fechar_pools())
+    nome = nome or f"confeccao-{os.getpid()}-{next(_contador_memoria)}"
+    return f"file:{nome}?mode=memory&cache=shared"
+
+
+def banco_temporario(diretorio=None):
+    # Arquivo novo num diretório temporário, já com o schema aplicado
+    import tempfile
+
+    caminho = os.path.join(diretorio or tempfile.mkdtemp(prefix="confeccao-"), "confeccao.db")
+    garantir_schema(caminho)
+    return caminho
+
+
 # =======================================================
+# VERIFICAÇÃO DOS PLANOS DE CONSULTA
+# =======================================================
+
+def verificar_planos(conn, consultas):
+    # Roda EXPLAIN QUERY PLAN em cada consulta dos DAOs e marca as
+    # que ainda fazem varredura completa (SCAN) ou ordenação temporária.
+    problemas = []
+    for nome, sql, parametros in consultas:
+        plano = [linha[3] for linha in conn.execute("EXPLAIN QUERY PLAN " + sql, parametros)]
+        varreduras = [p for p in plano if p.startswith("SCAN") or "TEMP B-TREE" in p]
+        if varreduras:
+            problemas.append(nome)
+        print(f"{'⚠️' if varreduras else '✅'} {nome}")
+        for passo in plano:
+            print(f"     {passo}")
+    return problemas
 
-# Tabela: PESSOA (classe base)
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS pessoa (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    nome TEXT NOT NULL,
-    telefone TEXT,
-    email TEXT,
-    tipo TEXT CHECK (tipo IN ('Cliente', 'Funcionario')) NOT NULL
-);
-""")
-
-# Tabela: CLIENTE (herda de Pessoa)
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS cliente (
-    id INTEGER PRIMARY KEY,
-    cpf TEXT UNIQUE,
-    endereco TEXT,
-    FOREIGN KEY (id) REFERENCES pessoa(id) ON DELETE CASCADE
-);
-""")
-
-# Tabela: FUNCIONARIO (herda de Pessoa)
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS funcionario (
-    id INTEGER PRIMARY KEY,
-    matricula TEXT UNIQUE,
-    cargo TEXT,
-    salario REAL DEFAULT 0.0,
-    FOREIGN KEY (id) REFERENCES pessoa(id) ON DELETE CASCADE
-);
-""")
-
-# Tabela: ROUPA
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS roupa (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    codigo TEXT UNIQUE NOT NULL,
-    descricao TEXT NOT NULL,
-    tamanho TEXT,
-    cor TEXT,
-    preco REAL NOT NULL CHECK (preco >= 0),
-    estoque INTEGER NOT NULL DEFAULT 0 CHECK (estoque >= 0)
-);
-""")
-
-# Tabela: PEDIDO
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS pedido (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    numero TEXT UNIQUE NOT NULL,
-    cliente_id INTEGER NOT NULL,
-    data_pedido TEXT DEFAULT (datetime('now')),
-    status TEXT CHECK (status IN ('Aberto', 'Em processamento', 'Finalizado', 'Cancelado')) DEFAULT 'Aberto',
-    FOREIGN KEY (cliente_id) REFERENCES cliente(id)
-);
-""")
-
-# Tabela: ITEM_PEDIDO
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS item_pedido (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    pedido_id INTEGER NOT NULL,
-    roupa_id INTEGER NOT NULL,
-    quantidade INTEGER NOT NULL CHECK (quantidade > 0),
-    valor_unitario REAL NOT NULL CHECK (valor_unitario >= 0),
-    FOREIGN KEY (pedido_id) REFERENCES pedido(id) ON DELETE CASCADE,
-    FOREIGN KEY (roupa_id) REFERENCES roupa(id)
-);
-""")
-
-# Tabela: PAGAMENTO
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS pagamento (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    pedido_id INTEGER NOT NULL UNIQUE,
-    valor REAL NOT NULL CHECK (valor >= 0),
-    forma TEXT CHECK (forma IN ('Dinheiro', 'Cartão', 'Pix', 'Boleto')) NOT NULL,
-    status TEXT CHECK (status IN ('Pendente', 'Processando', 'Confirmado', 'Estornado')) DEFAULT 'Pendente',
-    data_pagamento TEXT DEFAULT (datetime('now')),
-    FOREIGN KEY (pedido_id) REFERENCES pedido(id) ON DELETE CASCADE
-);
-""")
-
-# Tabela: PRODUCAO
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS producao (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    data_inicio TEXT,
-    data_fim TEXT,
-    status TEXT CHECK (status IN ('Planejada', 'Em andamento', 'Concluída', 'Cancelada')) DEFAULT 'Planejada'
-);
-""")
-
-# Tabela: ETAPA_PRODUCAO
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS etapa_producao (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    tipo TEXT CHECK (tipo IN ('Corte', 'Costura', 'Bordado', 'Acabamento', 'Inspeção')) NOT NULL,
-    descricao TEXT,
-    ordem INTEGER NOT NULL
-);
-""")
-
-# Tabela: EXECUCAO_ETAPA
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS execucao_etapa (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    papel TEXT NOT NULL,
-    funcionario_id INTEGER,
-    horas_trabalhadas REAL DEFAULT 0.0,
-    observacoes TEXT,
-    FOREIGN KEY (funcionario_id) REFERENCES funcionario(id)
-);
-""")
 
 # =======================================================
-# FINALIZAÇÃO
+# EXECUÇÃO COMO SCRIPT
 # =======================================================
-conn.commit()
-conn.close()
 
-print("✅ Banco de dados 'confeccao.db' criado com sucesso!")
-print("📊 Tabelas criadas: pessoa, cliente, funcionario, roupa, pedido, item_pedido, pagamento, producao, etapa_producao, execucao_etapa")
+if __name__ == "__main__":
+    conn = sqlite3.connect("confeccao.db")
+    cursor = conn.cursor()
+
+    # Ativa chaves estrangeiras e o modo WAL (persistente no arquivo),
+    # além dos demais PRAGMAs do perfil escolhido com --perfil=<nome>
+    perfil = next((a.split("=", 1)[1] for a in sys.argv if a.startswith("--perfil=")), PERFIL_PADRAO)
+    aplicar_perfil(conn, perfil)
+
+    criar_tabelas(cursor)
+    conn.commit()
+
+    for versao, descricao in aplicar_migracoes(conn):
+        print(f"🔧 Migração {versao} aplicada: {descricao}")
+
+    print("✅ Banco de dados 'confeccao.db' criado com sucesso!")
+    print("📊 Tabelas criadas: pessoa, cliente, funcionario, roupa, pedido, item_pedido, pagamento, producao, etapa_producao, execucao_etapa")
+    print(f"🏷️ Versão do schema: {versao_schema(conn)} | Perfil: {perfil}")
+
+    if "--planos" in sys.argv:
+        from main import CONSULTAS_DAO
+
+        print("\n🔍 PLANOS DE CONSULTA DOS DAOs:")
+        if verificar_planos(conn, CONSULTAS_DAO):
+            sys.exit(1)
+
+    conn.close()
@@ -0,0 +1,212 @@
+# =======================================================
+# ESCRITA AGRUPADA (GROUP COMMIT)
+# =======================================================
+#
+# Modo opcional em que PedidoDAO.criar, ItemPedidoDAO.adicionar/reservar
+# e PagamentoDAO.inserir não fazem mais um commit (um fsync) cada: as
+# operações entram numa fila e uma única thread escritora junta tudo
+# o que chegar em até "max_latencia" segundos numa só transação. Cada
+# operação roda dentro do seu próprio SAVEPOINT, então a falha de uma
+# (estoque insuficiente, FK inválida...) desfaz só ela e vai para o
+# Future dela; as demais do grupo são gravadas normalmente.
+#
+# Entre um grupo e outro, no máximo a cada "intervalo_foto" segundos, a
+# thread escritora fotografa o estoque se o livro acumulou mais que
+# "max_movimentos_foto" movimentos (LivroEstoque.fotografar_se_preciso),
+# numa transação própria e fora do caminho das vendas.
+#
+#   escritor = escrita_agrupada.ativar("confeccao.db", max_latencia=0.005)
+#   PedidoDAO().criar("PED-1", 1)          # mesmo uso de antes, agora agrupado
+#   futuro = escritor.enviar(lambda conn: conn.execute(...).lastrowid)
+#   futuro.result()
+#   escrita_agrupada.desativar("confeccao.db")
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from livro_estoque import MAX_MOVIMENTOS_SEM_FOTO, LivroEstoque
+from main import DAO
+
+_FIM = object()
+
+
+def ativar(db_name="confeccao.db", **opcoes):
+    with DAO._pools_lock:
+        antigo = DAO._agrupadores.pop(db_name, None)
+        escritor = DAO._agrupadores[db_name] = EscritorAgrupado(db_name, **opcoes)
+    if antigo:
+        antigo.fechar()
+    return escritor
+
+
+def desativar(db_name="confeccao.db"):
+    with DAO._pools_lock:
+        escritor = DAO._agrupadores.pop(db_name, None)
+    if escritor:
+        escritor.fechar()
+
+
+def desativar_todos():
+    for db_name in list(DAO._agrupadores):
+        desativar(db_name)
+
+
+# Registrado depois do DAO.fechar_pools, então roda antes dele na saída
+atexit.register(desativar_todos)
+
+
+class EscritorAgrupado:
+    def __init__(self, db_name="confeccao.db", max_latencia=0.005, max_lote=1000,
+                 intervalo_foto=60.0, max_movimentos_foto=MAX_MOVIMENTOS_SEM_FOTO):
+        self.db_name = db_name
+        self.max_latencia = max_latencia
+        self.max_lote = max_lote
+        self.intervalo_foto = intervalo_foto
+        self.max_movimentos_foto = max_movimentos_foto
+        self._dao = DAO(db_name)
+        self._livro = LivroEstoque(db_name)
+        self._proxima_foto = time.monotonic() + intervalo_foto
+        self._fila = queue.Queue()
+        self._lock = threading.Lock()
+        self.fechado = False
+        self.grupos = 0
+        self.operacoes = 0
+        self.falhas = 0
+        self.maior_grupo = 0
+        self.fotos = 0
+        self._thread = threading.Thread(target=self._rodar, name=f"escrita-agrupada-{db_name}", daemon=True)
+        self._thread.start()
+
+    def enviar(self, operacao):
+        # operacao(conn) roda na thread escritora, dentro da transação do grupo
+        futuro = Future()
+        if threading.current_thread() is self._thread:
+            # Chamada aninhada vinda de outra operação: roda direto no grupo atual
+            try:
+                futuro.set_result(operacao(self._dao.conectar()))
+            except Exception as erro:
+                futuro.set_exception(erro)
+            return futuro
+        with self._lock:
+            if self.fechado:
+                raise RuntimeError(f"Escrita agrupada de '{self.db_name}' já foi encerrada")
+            self._fila.put((operacao, futuro))
+        return futuro
+
+    def fechar(self):
+        # Grava o que já está na fila antes de parar
+        with self._lock:
+            if self.fechado:
+                return
+            self.fechado = True
+            self._fila.put(_FIM)
+        self._thread.join()
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "grupos": self.grupos,
+                "operacoes": self.operacoes,
+                "falhas": self.falhas,
+                "maior_grupo": self.maior_grupo,
+                "fotos": self.fotos,
+                "media_por_grupo": round(self.operacoes / self.grupos, 2) if self.grupos else None,
+                "na_fila": self._fila.qsize(),
+            }
+
+    # ---------------------------------------------------
+    # Thread escritora
+    # ---------------------------------------------------
+
+    def _rodar(self):
+        try:
+            while True:
+                primeiro = self._fila.get()
+                if primeiro is _FIM:
+                    return
+                grupo, parar = self._juntar(primeiro)
+                self._gravar_grupo(grupo)
+                self._talvez_fotografar()
+                if parar:
+                    return
+        finally:
+            DAO.obter_pool(self.db_name).liberar()
+
+    def _juntar(self, primeiro):
+        # Espera até max_latencia a partir da primeira operação do grupo
+        grupo = [primeiro]
+        limite = time.monotonic() + self.max_latencia
+        while len(grupo) < self.max_lote:
+            restante = limite - time.monotonic()
+            try:
+                item = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is _FIM:
+                return grupo, True
+            grupo.append(item)
+        return grupo, False
+
+    def _gravar_grupo(self, grupo):
+        grupo = [(operacao, futuro) for operacao, futuro in grupo if futuro.set_running_or_notify_cancel()]
+        if not grupo:
+            return
+        try:
+            resultados = self._dao._transacao_imediata(lambda conn: self._executar(conn, grupo))
+        except BaseException as erro:
+            # Falhou o BEGIN ou o COMMIT: nenhuma operação do grupo foi gravada
+            for _, futuro in grupo:
+                futuro.set_exception(erro)
+            with self._lock:
+                self.falhas += len(grupo)
+            if not isinstance(erro, Exception):
+                raise
+            return
+        falhas = 0
+        for (_, futuro), (ok, valor) in zip(grupo, resultados):
+            if ok:
+                futuro.set_result(valor)
+            else:
+                futuro.set_exception(valor)
+                falhas += 1
+        with self._lock:
+            self.grupos += 1
+            self.operacoes += len(grupo)
+            self.falhas += falhas
+            self.maior_grupo = max(self.maior_grupo, len(grupo))
+
+    def _talvez_fotografar(self):
+        agora = time.monotonic()
+        if agora < self._proxima_foto:
+            return
+        self._proxima_foto = agora + self.intervalo_foto
+        try:
+            # Transação própria: a cópia de roupa não entra em nenhum grupo
+            foto_id = self._dao._transacao_imediata(
+                lambda conn: self._livro._fotografar_se_preciso(conn, self.max_movimentos_foto))
+        except sqlite3.Error as erro:
+            # A próxima janela tenta de novo; as vendas não dependem da foto
+            print(f"⚠️ Fotografia do estoque adiada: {erro}")
+            return
+        if foto_id is not None:
+            with self._lock:
+                self.fotos += 1
+
+    def _executar(self, conn, grupo):
+        resultados = []
+        for operacao, _ in grupo:
+            conn.execute("SAVEPOINT operacao")
+            try:
+                resultado = operacao(conn)
+            except Exception as erro:
+                conn.execute("ROLLBACK TO operacao")
+                conn.execute("RELEASE operacao")
+                resultados.append((False, erro))
+                continue
+            conn.execute("RELEASE operacao")
+            resultados.append((True, resultado))
+        return resultados
@@ -0,0 +1,452 @@
+# =======================================================
+# GERADOR DE CARGA (SEM O MENU INTERATIVO)
+# =======================================================
+#
+# Reproduz o tráfego de balcão direto nos DAOs: cada trabalhador
+# (thread ou processo) sorteia uma das 13 operações do menu de main.py
+# segundo o mix configurado e a executa a uma taxa alvo. As roupas são
+# sorteadas com popularidade Zipf, então poucas peças concentram a
+# maior parte das vendas e a disputa de estoque aparece como num dia
+# real. No fim mostra vazão, percentis de latência por operação e a
+# taxa de erros de lock ("database is locked"), para dimensionar
+# máquina e validar ajustes (perfil, pool, escrita agrupada).
+#
+# As listagens leem uma página (como quem rola a tela), não a tabela
+# toda; os pedidos seguem o fluxo criar -> itens -> pagamento (pelo
+# total do pedido) -> confirmação.
+#
+#   python gerador_carga.py --duracao 30 --trabalhadores 8 --taxa 500
+#   python gerador_carga.py --modo processos --trabalhadores 4 --zipf 1.2
+#   python gerador_carga.py --mix adicionar_item=50,listar_roupas=5 --escrita-agrupada
+#   python gerador_carga.py --db confeccao.db --duracao 10     # banco existente
+
+import argparse
+import bisect
+import itertools
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from benchmark import percentil, popular, silenciado
+from main import (
+    DAO, Cliente, ClienteDAO, Funcionario, FuncionarioDAO, ItemPedidoDAO, PagamentoDAO,
+    PedidoDAO, Roupa, RoupaDAO,
+)
+from pool_conexoes import PERFIS
+
+# (operação, opção do menu, peso padrão): um dia de balcão é sobretudo
+# consulta ao catálogo e itens entrando nos pedidos
+OPERACOES = [
+    ("cadastrar_cliente", "1", 4),
+    ("listar_clientes", "2", 3),
+    ("cadastrar_funcionario", "3", 0.5),
+    ("listar_funcionarios", "4", 0.5),
+    ("cadastrar_roupa", "5", 1),
+    ("listar_roupas", "6", 20),
+    ("criar_pedido", "7", 10),
+    ("listar_pedidos", "8", 3),
+    ("adicionar_item", "9", 30),
+    ("ver_itens", "10", 12),
+    ("registrar_pagamento", "11", 8),
+    ("confirmar_pagamento", "12", 7),
+    ("listar_pagamentos", "13", 1),
+]
+MIX_PADRAO = {nome: peso for nome, _, peso in OPERACOES}
+FORMAS = ["Dinheiro", "Cartão", "Pix", "Boleto"]
+# Linhas lidas por listagem (uma tela)
+PAGINA = 50
+
+
+def ler_mix(texto):
+    # "adicionar_item=40,6=10": por nome ou pelo número do menu; as
+    # operações não citadas mantêm o peso padrão
+    mix = dict(MIX_PADRAO)
+    por_opcao = {opcao: nome for nome, opcao, _ in OPERACOES}
+    for parte in filter(None, (p.strip() for p in (texto or "").split(","))):
+        chave, _, peso = parte.partition("=")
+        nome = por_opcao.get(chave.strip(), chave.strip())
+        if nome not in mix:
+            raise ValueError(f"Operação desconhecida no mix: {chave}")
+        mix[nome] = float(peso)
+    if not any(mix.values()):
+        raise ValueError("O mix precisa de pelo menos uma operação com peso")
+    return mix
+
+
+class Zipf:
+    # Sorteio com probabilidade proporcional a 1 / posição^s; a ordem de
+    # popularidade vem de uma semente fixa, igual em todos os processos
+    def __init__(self, valores, s=1.1, semente=0):
+        self.valores = list(valores)
+        random.Random(semente).shuffle(self.valores)
+        self.acumulado = list(itertools.accumulate(1.0 / posicao ** s
+                                                   for posicao in range(1, len(self.valores) + 1)))
+
+    def sortear(self, rnd):
+        posicao = bisect.bisect_left(self.acumulado, rnd.random() * self.acumulado[-1])
+        return self.valores[min(posicao, len(self.valores) - 1)]
+
+
+# =======================================================
+# ESTADO COMPARTILHADO E SESSÕES
+# =======================================================
+
+class Estado:
+    # Pedidos em andamento, compartilhados pelas threads de um processo
+    def __init__(self, clientes, roupas, maior_pedido, zipf, prefixo):
+        self.lock = threading.Lock()
+        self.clientes = clientes
+        self.roupas = roupas
+        self.maior_pedido = maior_pedido
+        self.zipf = zipf
+        self.prefixo = prefixo
+        self.sequencia = itertools.count()
+        self.abertos = deque(maxlen=1000)
+        self.pagos = deque(maxlen=10_000)
+
+    def novo_codigo(self, tipo):
+        return f"{tipo}{self.prefixo}-{next(self.sequencia)}"
+
+    def guardar(self, fila, pedido_id):
+        with self.lock:
+            fila.append(pedido_id)
+
+    def retirar(self, fila):
+        with self.lock:
+            return fila.popleft() if fila else None
+
+    def qualquer(self, fila, rnd):
+        with self.lock:
+            return fila[rnd.randrange(len(fila))] if fila else None
+
+
+class SessaoCarga:
+    # Um "atendente": cada método é uma opção do menu e devolve o nome da
+    # operação de fato executada (sem pedido disponível, cria um)
+    def __init__(self, db_name, estado, mix, rnd):
+        self.estado = estado
+        self.rnd = rnd
+        self.nomes = list(mix)
+        self.pesos = list(itertools.accumulate(mix.values()))
+        self.clientes = ClienteDAO(db_name)
+        self.funcionarios = FuncionarioDAO(db_name)
+        self.roupas = RoupaDAO(db_name)
+        self.pedidos = PedidoDAO(db_name)
+        self.itens = ItemPedidoDAO(db_name)
+        self.pagamentos = PagamentoDAO(db_name)
+
+    def sortear(self):
+        return self.rnd.choices(self.nomes, cum_weights=self.pesos)[0]
+
+    def _pagina(self, iterar, maior_id):
+        return list(islice(iterar(apos_id=self.rnd.randint(0, max(0, maior_id - PAGINA))), PAGINA))
+
+    def cadastrar_cliente(self):
+        codigo = self.estado.novo_codigo("C")
+        cliente_id = self.clientes.inserir(Cliente(f"Cliente {codigo}", codigo, "Rua da Carga, 1"))
+        with self.estado.lock:
+            self.estado.clientes.append(cliente_id)
+        return "cadastrar_cliente"
+
+    def listar_clientes(self):
+        self._pagina(self.clientes.iterar, len(self.estado.clientes))
+        return "listar_clientes"
+
+    def cadastrar_funcionario(self):
+        codigo = self.estado.novo_codigo("F")
+        self.funcionarios.inserir(Funcionario(f"Funcionário {codigo}", codigo, "Costureira", 2500.0))
+        return "cadastrar_funcionario"
+
+    def listar_funcionarios(self):
+        self._pagina(self.funcionarios.iterar, PAGINA)
+        return "listar_funcionarios"
+
+    def cadastrar_roupa(self):
+        codigo = self.estado.novo_codigo("R")
+        self.roupas.inserir(Roupa(codigo, f"Peça {codigo}", "M", "azul", 99.9, 1000))
+        return "cadastrar_roupa"
+
+    def listar_roupas(self):
+        self._pagina(self.roupas.iterar, len(self.estado.roupas))
+        return "listar_roupas"
+
+    def criar_pedido(self):
+        cliente_id = self.estado.clientes[self.rnd.randrange(len(self.estado.clientes))]
+        pedido_id = self.pedidos.criar(self.estado.novo_codigo("P"), cliente_id)
+        self.estado.guardar(self.estado.abertos, pedido_id)
+        return "criar_pedido"
+
+    def listar_pedidos(self):
+        self._pagina(self.pedidos.iterar, self.estado.maior_pedido)
+        return "listar_pedidos"
+
+    def adicionar_item(self):
+        pedido_id = self.estado.qualquer(self.estado.abertos, self.rnd)
+        if pedido_id is None:
+            return self.criar_pedido()
+        self.itens.adicionar(pedido_id, self.estado.zipf.sortear(self.rnd), self.rnd.randint(1, 3))
+        return "adicionar_item"
+
+    def ver_itens(self):
+        pedido_id = self.estado.qualquer(self.estado.abertos, self.rnd)
+        if pedido_id is None:
+            pedido_id = self.rnd.randint(1, max(1, self.estado.maior_pedido))
+        list(self.itens.iterar_por_pedido(pedido_id))
+        return "ver_itens"
+
+    def registrar_pagamento(self):
+        pedido_id = self.estado.retirar(self.estado.abertos)
+        if pedido_id is None:
+            return self.criar_pedido()
+        total = self.pedidos.total(pedido_id)
+        self.pagamentos.inserir(pedido_id, total[0] if total else 0.0, self.rnd.choice(FORMAS))
+        self.estado.guardar(self.estado.pagos, pedido_id)
+        return "registrar_pagamento"
+
+    def confirmar_pagamento(self):
+        pedido_id = self.estado.retirar(self.estado.pagos)
+        if pedido_id is None:
+            return self.registrar_pagamento()
+        self.pagamentos.confirmar(pedido_id)
+        return "confirmar_pagamento"
+
+    def listar_pagamentos(self):
+        self._pagina(self.pagamentos.iterar, PAGINA)
+        return "listar_pagamentos"
+
+
+# =======================================================
+# MEDIÇÃO
+# =======================================================
+
+class Resultado:
+    def __init__(self):
+        self.latencias = {}
+        self.erros_lock = Counter()
+        self.erros = Counter()
+        self.exemplos = {}
+        self.segundos = 0.0
+
+    def registrar(self, nome, segundos):
+        vetor = self.latencias.get(nome)
+        if vetor is None:
+            vetor = self.latencias[nome] = array("d")
+        vetor.append(segundos)
+
+    def falhar(self, nome, erro):
+        mensagem = str(erro)
+        if isinstance(erro, sqlite3.OperationalError) and ("locked" in mensagem or "busy" in mensagem):
+            self.erros_lock[nome] += 1
+        else:
+            self.erros[nome] += 1
+        self.exemplos.setdefault(f"{nome}: {type(erro).__name__}", mensagem)
+
+    def juntar(self, outro):
+        for nome, vetor in outro.latencias.items():
+            self.latencias.setdefault(nome, array("d")).extend(vetor)
+        self.erros_lock.update(outro.erros_lock)
+        self.erros.update(outro.erros)
+        for chave, mensagem in outro.exemplos.items():
+            self.exemplos.setdefault(chave, mensagem)
+        self.segundos = max(self.segundos, outro.segundos)
+
+
+def trabalhar(sessao, duracao, intervalo, resultado):
+    # Laço aberto: com taxa alvo, as chamadas seguem um relógio fixo
+    # (intervalo entre inícios) e não esperam a anterior "folgar"
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    proximo = inicio
+    while True:
+        agora = time.perf_counter()
+        if agora >= fim:
+            break
+        if intervalo:
+            if proximo > agora:
+                time.sleep(min(proximo, fim) - agora)
+                if time.perf_counter() >= fim:
+                    break
+            proximo += intervalo
+        nome = sessao.sortear()
+        t0 = time.perf_counter()
+        try:
+            nome = getattr(sessao, nome)()
+        except Exception as erro:
+            resultado.falhar(nome, erro)
+            continue
+        resultado.registrar(nome, time.perf_counter() - t0)
+    resultado.segundos = time.perf_counter() - inicio
+
+
+def executar_trabalhadores(config, indice, threads):
+    # Roda num processo (o principal, no modo threads, ou um filho):
+    # prepara pool, estado e sessões e devolve o Resultado combinado
+    db_name = config["db"]
+    DAO.configurar_pool(db_name, perfil=config["perfil"], tamanho=threads + 2)
+    if config["escrita_agrupada"]:
+        import escrita_agrupada
+        escrita_agrupada.ativar(db_name)
+    conn = DAO(db_name).conectar()
+    clientes = [linha[0] for linha in conn.execute("SELECT id FROM cliente ORDER BY id")]
+    roupas = [linha[0] for linha in conn.execute("SELECT id FROM roupa ORDER BY id")]
+    maior_pedido = conn.execute("SELECT COALESCE(MAX(id), 0) FROM pedido").fetchone()[0]
+    if not clientes or not roupas:
+        raise ValueError("O banco precisa de clientes e roupas (use --escala para gerar)")
+    zipf = Zipf(roupas, config["zipf"], config["semente"])
+    estado = Estado(clientes, roupas, maior_pedido, zipf, f"{os.getpid()}-{indice}-{time.time_ns()}")
+    intervalo = config["trabalhadores"] / config["taxa"] if config["taxa"] else 0.0
+
+    resultados = [Resultado() for _ in range(threads)]
+    sessoes = [SessaoCarga(db_name, estado, config["mix"], random.Random(config["semente"] * 1000 + indice * 100 + i))
+               for i in range(threads)]
+    with silenciado():
+        linhas = [threading.Thread(target=trabalhar, args=(sessao, config["duracao"], intervalo, resultado))
+                  for sessao, resultado in zip(sessoes, resultados)]
+        for linha in linhas:
+            linha.start()
+        for linha in linhas:
+            linha.join()
+    if config["escrita_agrupada"]:
+        escrita_agrupada.desativar(db_name)
+    DAO.fechar_pools()
+    total = Resultado()
+    for resultado in resultados:
+        total.juntar(resultado)
+    return total
+
+
+def gerar_carga(config):
+    if config["modo"] == "threads":
+        return executar_trabalhadores(config, 0, config["trabalhadores"])
+    total = Resultado()
+    with ProcessPoolExecutor(config["trabalhadores"]) as executor:
+        futuros = [executor.submit(executar_trabalhadores, config, indice, 1)
+                   for indice in range(config["trabalhadores"])]
+        for futuro in futuros:
+            total.juntar(futuro.result())
+    return total
+
+
+# =======================================================
+# RELATÓRIO
+# =======================================================
+
+def resumir(resultado, config):
+    segundos = resultado.segundos or config["duracao"]
+    resumo = {"operacoes": {}}
+    todas = array("d")
+    for nome, _, _ in OPERACOES:
+        latencias = sorted(resultado.latencias.get(nome, ()))
+        falhas = resultado.erros_lock[nome] + resultado.erros[nome]
+        if not latencias and not falhas:
+            continue
+        todas.extend(latencias)
+        medida = {"ops": len(latencias), "ops_por_s": round(len(latencias) / segundos, 1),
+                  "erros_lock": resultado.erros_lock[nome], "erros": resultado.erros[nome]}
+        if latencias:
+            medida.update({f"p{int(p * 100)}_ms": round(percentil(latencias, p) * 1000, 3)
+                           for p in (0.50, 0.95, 0.99)})
+            medida["max_ms"] = round(latencias[-1] * 1000, 3)
+        resumo["operacoes"][nome] = medida
+    todas = sorted(todas)
+    erros_lock = sum(resultado.erros_lock.values())
+    erros = sum(resultado.erros.values())
+    tentativas = len(todas) + erros_lock + erros
+    resumo.update({
+        "segundos": round(segundos, 2),
+        "ops": len(todas),
+        "ops_por_s": round(len(todas) / segundos, 1),
+        "p50_ms": round(percentil(todas, 0.50) * 1000, 3) if todas else None,
+        "p99_ms": round(percentil(todas, 0.99) * 1000, 3) if todas else None,
+        "taxa_erros_lock": round(erros_lock / tentativas, 5) if tentativas else 0.0,
+        "taxa_erros": round(erros / tentativas, 5) if tentativas else 0.0,
+        "exemplos_erro": resultado.exemplos,
+    })
+    return resumo
+
+
+def exibir(resumo, config):
+    alvo = f"{config['taxa']:.0f} ops/s" if config["taxa"] else "sem limite"
+    print(f"\n📊 CARGA: {resumo['segundos']} s | {config['trabalhadores']} {config['modo']} | "
+          f"perfil {config['perfil']} | alvo {alvo} | obtido {resumo['ops_por_s']} ops/s")
+    print(f"{'operação':<22} {'ops':>8} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'máx ms':>9} {'locks':>6} {'erros':>6}")
+    for nome, m in resumo["operacoes"].items():
+        print(f"{nome:<22} {m['ops']:>8} {m['ops_por_s']:>9} {m.get('p50_ms', 0):>9.3f} "
+              f"{m.get('p95_ms', 0):>9.3f} {m.get('p99_ms', 0):>9.3f} {m.get('max_ms', 0):>9.3f} "
+              f"{m['erros_lock']:>6} {m['erros']:>6}")
+    print(f"{'TOTAL':<22} {resumo['ops']:>8} {resumo['ops_por_s']:>9} {resumo['p50_ms'] or 0:>9.3f} "
+          f"{'':>9} {resumo['p99_ms'] or 0:>9.3f}")
+    aviso = "✅" if not resumo["taxa_erros_lock"] and not resumo["taxa_erros"] else "⚠️"
+    print(f"{aviso} Erros de lock: {resumo['taxa_erros_lock'] * 100:.3f}% | "
+          f"outros erros: {resumo['taxa_erros'] * 100:.3f}%")
+    for chave, mensagem in list(resumo["exemplos_erro"].items())[:5]:
+        print(f"   {chave} -> {mensagem}")
+
+
+# =======================================================
+# EXECUÇÃO COMO SCRIPT
+# =======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera carga de balcão nos DAOs")
+    parser.add_argument("--db", help="banco existente (padrão: banco temporário gerado com --escala)")
+    parser.add_argument("--escala", type=int, default=10_000, help="clientes/roupas/pedidos do banco gerado")
+    parser.add_argument("--duracao", type=float, default=30.0, help="segundos de carga")
+    parser.add_argument("--trabalhadores", type=int, default=4)
+    parser.add_argument("--modo", choices=["threads", "processos"], default="threads")
+    parser.add_argument("--taxa", type=float, default=0.0, help="ops/s no total (0: sem limite)")
+    parser.add_argument("--mix", help="pesos, ex.: adicionar_item=40,6=10 (nome ou número do menu)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="expoente da popularidade das roupas")
+    parser.add_argument("--perfil", choices=sorted(PERFIS), default="seguro")
+    parser.add_argument("--escrita-agrupada", action="store_true")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="grava o resumo em JSON")
+    args = parser.parse_args(argv)
+    try:
+        mix = ler_mix(args.mix)
+    except ValueError as erro:
+        print(f"⚠️ {erro}")
+        return
+
+    diretorio = None
+    db_name = args.db
+    if db_name is None:
+        from ddl_confeccao import banco_temporario
+
+        diretorio = tempfile.mkdtemp(prefix="confeccao-carga-")
+        db_name = banco_temporario(diretorio)
+        print(f"⏳ Gerando banco com {args.escala} clientes, roupas e pedidos...")
+        with silenciado():
+            popular(db_name, args.escala, random.Random(args.semente))
+        DAO.fechar_pools()
+    config = {
+        "db": db_name, "duracao": args.duracao, "trabalhadores": args.trabalhadores, "modo": args.modo,
+        "taxa": args.taxa, "mix": mix, "zipf": args.zipf, "perfil": args.perfil,
+        "escrita_agrupada": args.escrita_agrupada, "semente": args.semente,
+    }
+    try:
+        resumo = resumir(gerar_carga(config), config)
+    finally:
+        if diretorio:
+            shutil.rmtree(diretorio, ignore_errors=True)
+    exibir(resumo, config)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"config": {k: v for k, v in config.items() if k != "db"}, **resumo},
+                      arquivo, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resumo gravado em {args.saida}")
+    return resumo
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+# =======================================================
+# IMPORTAÇÃO E EXPORTAÇÃO (CSV / JSONL)
+# =======================================================
+#
+# Carga em lote de roupa, cliente, funcionario e pedido+item_pedido a
+# partir de exportações do ERP, e exportação das mesmas tabelas. Tudo
+# é lido e escrito em fluxo (geradores + paginação por chave), então a
+# memória usada depende do tamanho do lote e não do arquivo. Cada
+# registro é validado em Python contra as restrições (CHECK/NOT NULL)
+# de ddl_confeccao.py antes de ir para o SQLite; os inválidos são
+# rejeitados com o número da linha e o resto segue.
+#
+#   python importacao.py importar roupa catalogo.csv --lote 5000
+#   python importacao.py importar pedido pedidos.jsonl --rejeitados erros.jsonl
+#   python importacao.py exportar pedido pedidos.csv
+#
+# Pedidos em CSV vêm "achatados", uma linha por item, com as colunas
+# do pedido repetidas (numero, cliente_id, status, data_pedido) e a
+# roupa em roupa_codigo ou roupa_id; linhas consecutivas com o mesmo
+# numero formam um pedido. Em JSONL cada linha é um pedido com a
+# lista "itens". O estoque não é baixado: são pedidos já vendidos.
+
+import argparse
+import csv
+import json
+import math
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from collections import namedtuple
+from itertools import groupby
+
+from main import (
+    DAO, Cliente, ClienteDAO, Funcionario, FuncionarioDAO, Roupa, RoupaDAO, StatusPedido, em_lotes,
+)
+
+STATUS_PEDIDO = {status.value for status in StatusPedido}
+
+
+class RegistroInvalido(Exception):
+    pass
+
+
+# Linha que nem chega a ser um registro (JSON malformado ou que não é um
+# objeto); vai para os rejeitados com o texto original
+LinhaInvalida = namedtuple("LinhaInvalida", "texto motivo")
+
+
+# =======================================================
+# LEITURA E ESCRITA EM FLUXO
+# =======================================================
+
+def formato_de(caminho, formato=None):
+    formato = formato or ("jsonl" if caminho.endswith((".jsonl", ".ndjson")) else "csv")
+    if formato not in ("csv", "jsonl"):
+        raise ValueError(f"Formato desconhecido: {formato} (use csv ou jsonl)")
+    return formato
+
+
+def ler(caminho, formato=None):
+    # Gera (número da linha, registro) sem carregar o arquivo
+    formato = formato_de(caminho, formato)
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        if formato == "csv":
+            leitor = csv.DictReader(arquivo)
+            for registro in leitor:
+                yield leitor.line_num, registro
+        else:
+            for numero, linha in enumerate(arquivo, 1):
+                if linha.strip():
+                    yield numero, _objeto_json(linha)
+
+
+def _objeto_json(linha):
+    try:
+        registro = json.loads(linha)
+    except json.JSONDecodeError as erro:
+        return LinhaInvalida(linha.rstrip("\r\n"), f"JSON inválido: {erro.msg} (coluna {erro.colno})")
+    if not isinstance(registro, dict):
+        return LinhaInvalida(linha.rstrip("\r\n"), "a linha não é um objeto JSON")
+    return registro
+
+
+class Escritor:
+    def __init__(self, arquivo, formato, colunas):
+        self.arquivo = arquivo
+        self.formato = formato
+        self.colunas = colunas
+        if formato == "csv":
+            self._csv = csv.writer(arquivo)
+            self._csv.writerow(colunas)
+
+    def escrever(self, valores):
+        if self.formato == "csv":
+            self._csv.writerow(valores)
+        else:
+            self.escrever_objeto(dict(zip(self.colunas, valores)))
+
+    def escrever_objeto(self, objeto):
+        self.arquivo.write(json.dumps(objeto, ensure_ascii=False) + "\n")
+
+
+# =======================================================
+# VALIDAÇÃO (espelha as restrições de ddl_confeccao.py)
+# =======================================================
+
+def _vazio(valor):
+    return valor is None or (isinstance(valor, str) and not valor.strip())
+
+
+def _texto(registro, campo, obrigatorio=False):
+    valor = registro.get(campo)
+    if _vazio(valor):
+        if obrigatorio:
+            raise RegistroInvalido(f"'{campo}' é obrigatório")
+        return None
+    if isinstance(valor, (dict, list)):
+        raise RegistroInvalido(f"'{campo}' não é um texto: {valor!r}")
+    return str(valor).strip()
+
+
+def _numero(registro, campo, tipo, minimo=None, obrigatorio=False, padrao=None, estrito=False):
+    valor = registro.get(campo)
+    if _vazio(valor):
+        if obrigatorio:
+            raise RegistroInvalido(f"'{campo}' é obrigatório")
+        return padrao
+    try:
+        # Exportações do ERP usam vírgula decimal
+        numero = float(valor.replace(",", ".")) if isinstance(valor, str) else float(valor)
+    except (TypeError, ValueError):
+        raise RegistroInvalido(f"'{campo}' não é numérico: {valor!r}") from None
+    if isinstance(valor, bool) or not math.isfinite(numero):
+        raise RegistroInvalido(f"'{campo}' não é numérico: {valor!r}")
+    if tipo is int:
+        if not numero.is_integer():
+            raise RegistroInvalido(f"'{campo}' precisa ser inteiro: {valor!r}")
+        numero = int(numero)
+    if minimo is not None and (numero <= minimo if estrito else numero < minimo):
+        raise RegistroInvalido(f"'{campo}' precisa ser {'>' if estrito else '>='} {minimo}: {valor!r}")
+    return numero
+
+
+def _data(registro, campo):
+    valor = _texto(registro, campo)
+    if valor is None:
+        return None
+    try:
+        return datetime.fromisoformat(valor).strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        raise RegistroInvalido(f"'{campo}' não é uma data ISO: {valor!r}") from None
+
+
+def validar_roupa(registro):
+    return Roupa(_texto(registro, "codigo", True), _texto(registro, "descricao", True),
+                 _texto(registro, "tamanho"), _texto(registro, "cor"),
+                 _numero(registro, "preco", float, 0, obrigatorio=True),
+                 _numero(registro, "estoque", int, 0, padrao=0))
+
+
+def validar_cliente(registro):
+    return Cliente(_texto(registro, "nome", True), _texto(registro, "cpf"), _texto(registro, "endereco"),
+                   _texto(registro, "telefone"), _texto(registro, "email"))
+
+
+def validar_funcionario(registro):
+    return Funcionario(_texto(registro, "nome", True), _texto(registro, "matricula"),
+                       _texto(registro, "cargo"), _numero(registro, "salario", float, 0, padrao=0.0),
+                       _texto(registro, "telefone"), _texto(registro, "email"))
+
+
+def validar_item(registro):
+    # O código da roupa é a chave estável entre bancos; tem precedência sobre o id
+    codigo = _texto(registro, "roupa_codigo")
+    roupa_id = None if codigo else _numero(registro, "roupa_id", int)
+    if roupa_id is None and codigo is None:
+        raise RegistroInvalido("item sem 'roupa_id' nem 'roupa_codigo'")
+    return (roupa_id, codigo, _numero(registro, "quantidade", int, 0, obrigatorio=True, estrito=True),
+            _numero(registro, "valor_unitario", float, 0, obrigatorio=True))
+
+
+def validar_pedido(registro):
+    status = _texto(registro, "status") or StatusPedido.ABERTO.value
+    if status not in STATUS_PEDIDO:
+        raise RegistroInvalido(f"'status' inválido: {status!r} (use {', '.join(sorted(STATUS_PEDIDO))})")
+    pedido = (_texto(registro, "numero", True), _numero(registro, "cliente_id", int, obrigatorio=True),
+              status, _data(registro, "data_pedido"))
+    itens = registro.get("itens") or []
+    if not isinstance(itens, list) or not all(isinstance(item, dict) for item in itens):
+        raise RegistroInvalido("'itens' precisa ser uma lista de objetos")
+    return pedido, [validar_item(item) for item in itens]
+
+
+def pedidos_de_linhas(linhas):
+    # Junta as linhas achatadas (uma por item) de cada pedido; um pedido
+    # sem itens vem numa linha com as colunas de item vazias
+    for numero, grupo in groupby(linhas, key=lambda linha: linha[1].get("numero")):
+        grupo = list(grupo)
+        registro = dict(grupo[0][1])
+        registro["itens"] = [r for _, r in grupo
+                             if not (_vazio(r.get("roupa_id")) and _vazio(r.get("roupa_codigo")))]
+        yield grupo[0][0], registro
+
+
+# =======================================================
+# GRAVAÇÃO POR LOTE
+# =======================================================
+
+def gravar_roupas(db_name, bloco):
+    return RoupaDAO(db_name).inserir_lote(bloco, tamanho_lote=len(bloco))
+
+
+def gravar_clientes(db_name, bloco):
+    return len(ClienteDAO(db_name).inserir_lote(bloco, tamanho_lote=len(bloco)))
+
+
+def gravar_funcionarios(db_name, bloco):
+    return len(FuncionarioDAO(db_name).inserir_lote(bloco, tamanho_lote=len(bloco)))
+
+
+def gravar_pedidos(db_name, bloco):
+    return DAO(db_name)._gravar(lambda conn: _gravar_pedidos(conn, bloco))
+
+
+def _gravar_pedidos(conn, bloco):
+    codigos = {codigo for _, itens in bloco for roupa_id, codigo, _, _ in itens if roupa_id is None}
+    ids_por_codigo = {}
+    for parte in em_lotes(codigos, 500):
+        marcadores = ", ".join("?" * len(parte))
+        ids_por_codigo.update(conn.execute(f"SELECT codigo, id FROM roupa WHERE codigo IN ({marcadores})", parte))
+    faltando = codigos - ids_por_codigo.keys()
+    if faltando:
+        raise RegistroInvalido(f"roupa_codigo inexistente: {', '.join(sorted(faltando))}")
+
+    conn.executemany("""
+        INSERT INTO pedido (numero, cliente_id, status, data_pedido)
+        VALUES (?, ?, ?, COALESCE(?, datetime('now')))
+    """, (pedido for pedido, _ in bloco))
+    # Com o lock de escrita mantido os ids AUTOINCREMENT são consecutivos
+    ultimo = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    conn.executemany("""
+        INSERT INTO item_pedido (pedido_id, roupa_id, quantidade, valor_unitario) VALUES (?, ?, ?, ?)
+    """, ((pedido_id, roupa_id if roupa_id is not None else ids_por_codigo[codigo], quantidade, valor)
+          for pedido_id, (_, itens) in zip(range(ultimo - len(bloco) + 1, ultimo + 1), bloco)
+          for roupa_id, codigo, quantidade, valor in itens))
+    return len(bloco)
+
+
+ENTIDADES = {
+    "roupa": (validar_roupa, gravar_roupas),
+    "cliente": (validar_cliente, gravar_clientes),
+    "funcionario": (validar_funcionario, gravar_funcionarios),
+    "pedido": (validar_pedido, gravar_pedidos),
+}
+
+
+# =======================================================
+# IMPORTAÇÃO
+# =======================================================
+
+class Relatorio:
+    def __init__(self, rejeitados=None, max_exibidos=20):
+        self.lidos = 0
+        self.gravados = 0
+        self.rejeitados = 0
+        self.inicio = time.perf_counter()
+        self._arquivo_rejeitados = rejeitados
+        self.max_exibidos = max_exibidos
+
+    def rejeitar(self, linha, registro, motivo):
+        self.rejeitados += 1
+        if self.rejeitados <= self.max_exibidos:
+            print(f"⚠️ Linha {linha}: {motivo}", file=sys.stderr)
+        if self._arquivo_rejeitados:
+            self._arquivo_rejeitados.write(json.dumps(
+                {"linha": linha, "motivo": str(motivo), "registro": registro}, ensure_ascii=False) + "\n")
+
+    @property
+    def segundos(self):
+        return time.perf_counter() - self.inicio
+
+    def exibir(self, final=False):
+        taxa = self.lidos / self.segundos if self.segundos else 0
+        print(f"{'✅' if final else '⏳'} Lidos: {self.lidos} | Gravados: {self.gravados} | "
+              f"Rejeitados: {self.rejeitados} | {self.segundos:.1f}s | {taxa:,.0f} registros/s")
+
+
+def _validos(registros, validar, relatorio):
+    for linha, registro in registros:
+        relatorio.lidos += 1
+        if isinstance(registro, LinhaInvalida):
+            relatorio.rejeitar(linha, registro.texto, registro.motivo)
+            continue
+        try:
+            yield linha, registro, validar(registro)
+        except (RegistroInvalido, TypeError, ValueError) as erro:
+            # TypeError/ValueError: campo de tipo inesperado que escapou da validação
+            relatorio.rejeitar(linha, registro, erro)
+
+
+def importar(db_name, entidade, caminho, formato=None, tamanho_lote=1000, rejeitados=None, progresso=10):
+    validar, gravar = ENTIDADES[entidade]
+    registros = ler(caminho, formato)
+    if entidade == "pedido" and formato_de(caminho, formato) == "csv":
+        registros = pedidos_de_linhas(registros)
+    relatorio = Relatorio(rejeitados)
+    for numero_lote, bloco in enumerate(em_lotes(_validos(registros, validar, relatorio), tamanho_lote), 1):
+        try:
+            relatorio.gravados += gravar(db_name, [objeto for _, _, objeto in bloco])
+        except (sqlite3.IntegrityError, RegistroInvalido):
+            # Uma violação (UNIQUE, FK...) desfaz o lote inteiro; regrava um
+            # a um para rejeitar só os registros culpados
+            for linha, registro, objeto in bloco:
+                try:
+                    relatorio.gravados += gravar(db_name, [objeto])
+                except (sqlite3.IntegrityError, RegistroInvalido) as erro:
+                    relatorio.rejeitar(linha, registro, erro)
+        if progresso and numero_lote % progresso == 0:
+            relatorio.exibir()
+    relatorio.exibir(final=True)
+    return relatorio
+
+
+# =======================================================
+# EXPORTAÇÃO
+# =======================================================
+
+SQL_EXPORTAR = {
+    "roupa": ("""
+        SELECT id, codigo, descricao, tamanho, cor, preco, estoque FROM roupa
+        WHERE id > ? ORDER BY id LIMIT ?
+    """, ["id", "codigo", "descricao", "tamanho", "cor", "preco", "estoque"]),
+    "cliente": ("""
+        SELECT p.id, p.nome, p.telefone, p.email, c.cpf, c.endereco
+        FROM pessoa p JOIN cliente c ON c.id = p.id
+        WHERE p.id > ? ORDER BY p.id LIMIT ?
+    """, ["id", "nome", "telefone", "email", "cpf", "endereco"]),
+    "funcionario": ("""
+        SELECT p.id, p.nome, p.telefone, p.email, f.matricula, f.cargo, f.salario
+        FROM pessoa p JOIN funcionario f ON f.id = p.id
+        WHERE p.id > ? ORDER BY p.id LIMIT ?
+    """, ["id", "nome", "telefone", "email", "matricula", "cargo", "salario"]),
+}
+SQL_EXPORTAR_PEDIDOS = """
+    SELECT id, numero, cliente_id, status, data_pedido FROM pedido
+    WHERE id > ? ORDER BY id LIMIT ?
+"""
+SQL_EXPORTAR_ITENS = """
+    SELECT ip.pedido_id, ip.roupa_id, r.codigo, ip.quantidade, ip.valor_unitario
+    FROM item_pedido ip JOIN roupa r ON r.id = ip.roupa_id
+    WHERE ip.pedido_id BETWEEN ? AND ? ORDER BY ip.pedido_id, ip.id
+"""
+COLUNAS_PEDIDO = ["id", "numero", "cliente_id", "status", "data_pedido"]
+COLUNAS_ITEM = ["roupa_id", "roupa_codigo", "quantidade", "valor_unitario"]
+
+
+def pedidos_com_itens(db_name, tamanho_lote=None):
+    # Uma página de pedidos por vez, com os itens da faixa de ids da
+    # página buscados numa única consulta
+    dao = DAO(db_name)
+    tamanho_lote = tamanho_lote or dao.tamanho_lote
+    for pagina in em_lotes(dao._paginar(SQL_EXPORTAR_PEDIDOS, tamanho_lote=tamanho_lote), tamanho_lote):
+        itens = {}
+        for pedido_id, *item in dao.conectar().execute(SQL_EXPORTAR_ITENS, (pagina[0][0], pagina[-1][0])):
+            itens.setdefault(pedido_id, []).append(item)
+        for pedido in pagina:
+            yield pedido, itens.get(pedido[0], [])
+
+
+def exportar(db_name, entidade, caminho, formato=None, tamanho_lote=None):
+    formato = formato_de(caminho, formato)
+    inicio = time.perf_counter()
+    total = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        if entidade == "pedido":
+            escritor = Escritor(arquivo, formato, COLUNAS_PEDIDO + COLUNAS_ITEM)
+            for pedido, itens in pedidos_com_itens(db_name, tamanho_lote):
+                total += 1
+                if formato == "jsonl":
+                    escritor.escrever_objeto({**dict(zip(COLUNAS_PEDIDO, pedido)),
+                                              "itens": [dict(zip(COLUNAS_ITEM, item)) for item in itens]})
+                else:
+                    for item in itens or [[None] * len(COLUNAS_ITEM)]:
+                        escritor.escrever((*pedido, *item))
+        else:
+            sql, colunas = SQL_EXPORTAR[entidade]
+            escritor = Escritor(arquivo, formato, colunas)
+            for linha in DAO(db_name)._paginar(sql, tamanho_lote=tamanho_lote):
+                escritor.escrever(linha)
+                total += 1
+    segundos = time.perf_counter() - inicio
+    print(f"✅ {total} registros de '{entidade}' exportados para {caminho} | "
+          f"{segundos:.1f}s | {total / segundos if segundos else 0:,.0f} registros/s")
+    return total
+
+
+# =======================================================
+# EXECUÇÃO COMO SCRIPT
+# =======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importação e exportação em CSV/JSONL")
+    parser.add_argument("acao", choices=["importar", "exportar"])
+    parser.add_argument("entidade", choices=list(ENTIDADES))
+    parser.add_argument("arquivo")
+    parser.add_argument("--db", default="confeccao.db")
+    parser.add_argument("--formato", choices=["csv", "jsonl"], help="padrão: pela extensão do arquivo")
+    parser.add_argument("--lote", type=int, default=1000, help="registros por commit / por página")
+    parser.add_argument("--rejeitados", help="grava os registros rejeitados neste arquivo JSONL")
+    parser.add_argument("--progresso", type=int, default=10, help="mostra o progresso a cada N lotes")
+    args = parser.parse_args(argv)
+
+    if args.acao == "exportar":
+        exportar(args.db, args.entidade, args.arquivo, args.formato, args.lote)
+        return
+    rejeitados = open(args.rejeitados, "w", encoding="utf-8") if args.rejeitados else None
+    try:
+        relatorio = importar(args.db, args.entidade, args.arquivo, args.formato, args.lote,
+                             rejeitados, args.progresso)
+    finally:
+        if rejeitados:
+            rejeitados.close()
+    if relatorio.rejeitados:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
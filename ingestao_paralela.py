@@ -0,0 +1,308 @@
+# =======================================================
+# INGESTÃO PARALELA DE PEDIDOS
+# =======================================================
+#
+# Reprocessamento em massa de pedidos (marketplace) sem passar item a
+# item por ItemPedidoDAO.adicionar. Os pedidos são lidos em rodadas; em
+# cada rodada os itens são particionados por roupa_id (roupa_id % N),
+# então todo o estoque de uma roupa é disputado dentro de um único
+# processo do ProcessPoolExecutor, que valida, confere o estoque na
+# ordem de chegada e precifica. Só o processo principal escreve: ele
+# segura o lock de escrita (BEGIN IMMEDIATE) durante a rodada, para que
+# o estoque lido pelos processos não mude até o commit, e grava
+# pedidos, itens e baixas com executemany.
+#
+# A semântica é a do caminho serial: cada item entra ou é rejeitado
+# sozinho (roupa inexistente, quantidade inválida, estoque insuficiente)
+# e o pedido é criado mesmo que algum item seja recusado.
+#
+#   python ingestao_paralela.py pedidos.jsonl --trabalhadores 4
+#   python ingestao_paralela.py --benchmark --pedidos 20000
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from urllib.parse import quote
+
+from cache_roupa import cache_para
+from importacao import RegistroInvalido, Relatorio, _numero, _texto, _validos, ler
+from main import DAO, ItemPedidoDAO, PedidoDAO, em_lotes
+
+
+# =======================================================
+# TRABALHADORES (rodam em outro processo)
+# =======================================================
+
+def processar_particao(db_name, itens):
+    # itens: [(posição, roupa_id, quantidade)] na ordem de chegada.
+    # Devolve os aceitos com preço, os rejeitados com motivo e a baixa
+    # total por roupa. Abre a própria conexão, somente leitura (o caminho
+    # vai escapado na URI: "?", "#" ou "%" no nome mudariam o arquivo aberto).
+    conn = sqlite3.connect(f"file:{quote(os.path.abspath(db_name))}?mode=ro", uri=True)
+    try:
+        roupas = {}
+        ids = sorted({roupa_id for _, roupa_id, _ in itens if isinstance(roupa_id, int)})
+        for bloco in em_lotes(ids, 500):
+            marcadores = ", ".join("?" * len(bloco))
+            for roupa_id, preco, estoque in conn.execute(
+                    f"SELECT id, preco, estoque FROM roupa WHERE id IN ({marcadores})", bloco):
+                roupas[roupa_id] = [preco, estoque]
+    finally:
+        conn.close()
+
+    aceitos = []
+    rejeitados = []
+    baixas = {}
+    for posicao, roupa_id, quantidade in itens:
+        if not isinstance(quantidade, int) or quantidade <= 0:
+            rejeitados.append((posicao, f"Quantidade inválida: {quantidade!r}"))
+            continue
+        roupa = roupas.get(roupa_id)
+        if roupa is None:
+            rejeitados.append((posicao, f"Roupa {roupa_id} não encontrada"))
+            continue
+        preco, disponivel = roupa
+        if disponivel < quantidade:
+            rejeitados.append((posicao, f"Estoque insuficiente da roupa {roupa_id}: "
+                                        f"pedido {quantidade}, disponível {disponivel}"))
+            continue
+        roupa[1] = disponivel - quantidade
+        baixas[roupa_id] = baixas.get(roupa_id, 0) + quantidade
+        aceitos.append((posicao, roupa_id, quantidade, preco))
+    return aceitos, rejeitados, baixas
+
+
+class ExecutorLocal:
+    # Mesma interface do ProcessPoolExecutor, rodando as partições no
+    # próprio processo: a ingestão em lotes sem paralelismo
+    def submit(self, funcao, *args):
+        futuro = Future()
+        try:
+            futuro.set_result(funcao(*args))
+        except Exception as erro:
+            futuro.set_exception(erro)
+        return futuro
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        return False
+
+
+# =======================================================
+# PROCESSO ESCRITOR
+# =======================================================
+
+class IngestaoParalela:
+    def __init__(self, db_name="confeccao.db", trabalhadores=None, tamanho_rodada=10_000, processos=True):
+        self.db_name = db_name
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.tamanho_rodada = tamanho_rodada
+        self.processos = processos
+        self._dao = DAO(db_name)
+
+    def ingerir(self, pedidos):
+        # pedidos: iterável de (numero, cliente_id, [(roupa_id, quantidade), ...])
+        resultado = {"pedidos": 0, "itens": 0, "rejeitados": [], "segundos": 0.0}
+        inicio = time.perf_counter()
+        executor = ProcessPoolExecutor(self.trabalhadores) if self.processos else ExecutorLocal()
+        with executor:
+            for rodada in em_lotes(pedidos, self.tamanho_rodada):
+                baixas = self._dao._gravar(
+                    lambda conn: self._rodada(conn, executor, rodada, resultado))
+                # O cache do catálogo só reflete a baixa depois do commit
+                cache = cache_para(self.db_name)
+                for roupa_id, quantidade in baixas.items():
+                    cache.ajustar_estoque(roupa_id, -quantidade)
+        resultado["segundos"] = time.perf_counter() - inicio
+        return resultado
+
+    def _rodada(self, conn, executor, rodada, resultado):
+        pedidos, rejeitados = self._validar_pedidos(conn, rodada)
+        resultado["rejeitados"].extend(rejeitados)
+        if not pedidos:
+            return {}
+
+        # Itens numerados na ordem de chegada e separados por roupa
+        itens = [(numero, roupa_id, quantidade)
+                 for numero, _, itens_pedido in pedidos for roupa_id, quantidade in itens_pedido]
+        particoes = [[] for _ in range(self.trabalhadores)]
+        for posicao, (_, roupa_id, quantidade) in enumerate(itens):
+            particao = roupa_id % self.trabalhadores if isinstance(roupa_id, int) else 0
+            particoes[particao].append((posicao, roupa_id, quantidade))
+        futuros = [executor.submit(processar_particao, self.db_name, particao)
+                   for particao in particoes if particao]
+
+        conn.executemany("INSERT INTO pedido (numero, cliente_id) VALUES (?, ?)",
+                         ((numero, cliente_id) for numero, cliente_id, _ in pedidos))
+        # ids AUTOINCREMENT de um executemany com o lock mantido são consecutivos
+        ultimo = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        ids = dict(zip((numero for numero, _, _ in pedidos), range(ultimo - len(pedidos) + 1, ultimo + 1)))
+
+        aceitos = []
+        baixas = {}
+        for futuro in futuros:
+            aceitos_particao, rejeitados_particao, baixas_particao = futuro.result()
+            aceitos.extend(aceitos_particao)
+            baixas.update(baixas_particao)
+            resultado["rejeitados"].extend((itens[posicao][0], motivo) for posicao, motivo in rejeitados_particao)
+        aceitos.sort()
+        conn.executemany("""
+            INSERT INTO item_pedido (pedido_id, roupa_id, quantidade, valor_unitario) VALUES (?, ?, ?, ?)
+        """, ((ids[itens[posicao][0]], roupa_id, quantidade, preco)
+              for posicao, roupa_id, quantidade, preco in aceitos))
+        conn.executemany("UPDATE roupa SET estoque = estoque - ? WHERE id = ?",
+                         ((quantidade, roupa_id) for roupa_id, quantidade in baixas.items()))
+        resultado["pedidos"] += len(pedidos)
+        resultado["itens"] += len(aceitos)
+        return baixas
+
+    def _validar_pedidos(self, conn, rodada):
+        # Cabeçalhos: numero único (no lote e no banco) e cliente existente
+        numeros = [numero for numero, _, _ in rodada]
+        clientes = {cliente_id for _, cliente_id, _ in rodada}
+        existentes = set()
+        for bloco in em_lotes(numeros, 500):
+            marcadores = ", ".join("?" * len(bloco))
+            existentes.update(n for n, in conn.execute(
+                f"SELECT numero FROM pedido WHERE numero IN ({marcadores})", bloco))
+        validos_clientes = set()
+        for bloco in em_lotes(clientes, 500):
+            marcadores = ", ".join("?" * len(bloco))
+            validos_clientes.update(c for c, in conn.execute(
+                f"SELECT id FROM cliente WHERE id IN ({marcadores})", bloco))
+
+        pedidos = []
+        rejeitados = []
+        for numero, cliente_id, itens in rodada:
+            if numero in existentes:
+                rejeitados.append((numero, "Pedido já existe"))
+            elif cliente_id not in validos_clientes:
+                rejeitados.append((numero, f"Cliente {cliente_id} não encontrado"))
+            else:
+                existentes.add(numero)
+                pedidos.append((numero, cliente_id, itens))
+        return pedidos, rejeitados
+
+
+def pedido_de_registro(registro):
+    # Só o cabeçalho é validado aqui: cada item entra ou é recusado
+    # sozinho na partição, como no caminho serial
+    itens = registro.get("itens") or []
+    if not isinstance(itens, list) or not all(isinstance(item, dict) for item in itens):
+        raise RegistroInvalido("'itens' precisa ser uma lista de objetos")
+    return (_texto(registro, "numero", True), _numero(registro, "cliente_id", int, obrigatorio=True),
+            [(item.get("roupa_id"), item.get("quantidade")) for item in itens])
+
+
+def ingerir_serial(db_name, pedidos):
+    # Caminho de referência: um PedidoDAO.criar + um adicionar por item
+    pedido_dao = PedidoDAO(db_name)
+    item_dao = ItemPedidoDAO(db_name)
+    inicio = time.perf_counter()
+    total = 0
+    for numero, cliente_id, itens in pedidos:
+        pedido_id = pedido_dao.criar(numero, cliente_id)
+        for roupa_id, quantidade in itens:
+            item_dao.adicionar(pedido_id, roupa_id, quantidade)
+        total += 1
+    return {"pedidos": total, "segundos": time.perf_counter() - inicio}
+
+
+# =======================================================
+# BENCHMARK
+# =======================================================
+
+def pedidos_sinteticos(quantidade, clientes, roupas, itens_por_pedido, rnd, prefixo="MKT"):
+    for i in range(quantidade):
+        yield (f"{prefixo}{i:08d}", rnd.randint(1, clientes),
+               [(rnd.randint(1, roupas), rnd.randint(1, 3)) for _ in range(itens_por_pedido)])
+
+
+def benchmark(quantidade, itens_por_pedido, catalogo, serial, semente):
+    import benchmark as bench
+
+    niveis = sorted({1, 2, 4, os.cpu_count() or 1})
+    diretorio = tempfile.mkdtemp(prefix="ingestao_")
+    try:
+        db_name = bench.criar_banco(diretorio)
+        with bench.silenciado():
+            bench.popular(db_name, catalogo, random.Random(semente))
+        print(f"\n🚚 INGESTÃO: {quantidade} pedidos x {itens_por_pedido} itens | "
+              f"{catalogo} roupas | {os.cpu_count()} CPUs")
+
+        rnd = random.Random(semente)
+        pedidos = list(pedidos_sinteticos(serial, catalogo, catalogo, itens_por_pedido, rnd, "SER"))
+        with bench.silenciado():
+            base = ingerir_serial(db_name, pedidos)
+        print(f"{'serial (adicionar)':<22} {base['pedidos'] / base['segundos']:>10,.0f} pedidos/s  "
+              f"({serial} pedidos)")
+
+        # Referência dos ganhos: a mesma gravação em lotes, num só processo.
+        # A diferença para "serial (adicionar)" vem dos lotes; a dos
+        # paralelos para esta linha, dos processos.
+        pedidos = pedidos_sinteticos(quantidade, catalogo, catalogo, itens_por_pedido,
+                                     random.Random(semente), "LOT-")
+        resultado = IngestaoParalela(db_name, 1, processos=False).ingerir(pedidos)
+        taxa_lotes = resultado["pedidos"] / resultado["segundos"]
+        print(f"{'serial (lotes)':<22} {taxa_lotes:>10,.0f} pedidos/s  {1:>6.1f}x | "
+              f"itens: {resultado['itens']} | rejeitados: {len(resultado['rejeitados'])}")
+
+        for trabalhadores in niveis:
+            pedidos = pedidos_sinteticos(quantidade, catalogo, catalogo, itens_por_pedido,
+                                         random.Random(semente), f"P{trabalhadores}-")
+            resultado = IngestaoParalela(db_name, trabalhadores).ingerir(pedidos)
+            taxa = resultado["pedidos"] / resultado["segundos"]
+            print(f"{f'paralelo x{trabalhadores}':<22} {taxa:>10,.0f} pedidos/s  "
+                  f"{taxa / taxa_lotes:>6.1f}x | itens: {resultado['itens']} | "
+                  f"rejeitados: {len(resultado['rejeitados'])}")
+    finally:
+        DAO.fechar_pools()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+# =======================================================
+# EXECUÇÃO COMO SCRIPT
+# =======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingestão paralela de pedidos")
+    parser.add_argument("arquivo", nargs="?", help="JSONL: {numero, cliente_id, itens: [{roupa_id, quantidade}]}")
+    parser.add_argument("--db", default="confeccao.db")
+    parser.add_argument("--trabalhadores", type=int, default=None)
+    parser.add_argument("--rodada", type=int, default=10_000, help="pedidos por transação")
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--pedidos", type=int, default=20_000)
+    parser.add_argument("--itens-por-pedido", type=int, default=3)
+    parser.add_argument("--catalogo", type=int, default=5_000)
+    parser.add_argument("--serial", type=int, default=1_000, help="pedidos medidos no caminho serial")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.pedidos, args.itens_por_pedido, args.catalogo, args.serial, args.semente)
+        return
+    if not args.arquivo:
+        parser.error("informe o arquivo JSONL ou use --benchmark")
+
+    # Linhas malformadas ou sem numero/cliente_id vão para o relatório
+    # (⚠️ Linha N: motivo) e a ingestão segue com as demais
+    relatorio = Relatorio()
+    pedidos = (pedido for _, _, pedido in _validos(ler(args.arquivo, "jsonl"), pedido_de_registro, relatorio))
+    resultado = IngestaoParalela(args.db, args.trabalhadores, args.rodada).ingerir(pedidos)
+    for numero, motivo in resultado["rejeitados"][:20]:
+        print(f"⚠️ {numero}: {motivo}")
+    print(f"✅ Pedidos: {resultado['pedidos']} | Itens: {resultado['itens']} | "
+          f"Linhas inválidas: {relatorio.rejeitados} | "
+          f"Rejeitados: {len(resultado['rejeitados'])} | {resultado['segundos']:.1f}s | "
+          f"{resultado['pedidos'] / resultado['segundos']:,.0f} pedidos/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# =======================================================
+# REGISTRO DE INSTRUÇÕES SQL
+# =======================================================
+#
+# Catálogo, por nome, das instruções SQL dos DAOs de main.py
+# ("RoupaDAO.BUSCAR" -> RoupaDAO.SQL_BUSCAR). O módulo sqlite3 guarda
+# em cada conexão um cache LRU das instruções já compiladas, indexado
+# pelo texto do SQL: como os DAOs sempre passam a mesma constante, basta
+# o cache (cached_statements) comportar o registro inteiro para que cada
+# instrução seja compilada uma única vez por conexão do pool.
+#
+# Cada instrução também sabe montar as suas linhas:
+#   "tupla"   -> a tupla do sqlite3 (padrão, a mais barata)
+#   "nomeada" -> namedtuple com os nomes das colunas
+#   "objeto"  -> classe do domínio, nas instruções com construtor
+
+from collections import namedtuple
+
+FORMAS_LINHA = ("tupla", "nomeada", "objeto")
+# Folga no cache para o SQL montado na hora (listas IN, consultas avulsas)
+FOLGA_CACHE = 64
+
+
+class Instrucao:
+    __slots__ = ("nome", "sql", "construtor", "_tipo")
+
+    def __init__(self, nome, sql, construtor=None):
+        self.nome = nome
+        self.sql = sql
+        self.construtor = construtor
+        self._tipo = None
+
+    def fabrica(self, forma, cursor):
+        # Função linha -> objeto na forma pedida (None: a própria tupla)
+        if forma is None or forma == "tupla":
+            return None
+        if forma == "nomeada":
+            # O tipo nasce na primeira leitura, a partir de cursor.description
+            if self._tipo is None:
+                self._tipo = namedtuple(self.nome.replace(".", "_"),
+                                        [coluna[0] for coluna in cursor.description], rename=True)
+            return self._tipo._make
+        if forma == "objeto":
+            if self.construtor is None:
+                raise ValueError(f"A instrução {self.nome} não tem construtor do domínio")
+            return self.construtor
+        raise ValueError(f"Forma de linha desconhecida: {forma} (use {', '.join(FORMAS_LINHA)})")
+
+
+class RegistroInstrucoes:
+    def __init__(self):
+        self._por_nome = {}
+        self._por_sql = {}
+
+    def registrar(self, nome, sql, construtor=None):
+        if nome in self._por_nome:
+            raise ValueError(f"Instrução já registrada: {nome}")
+        instrucao = Instrucao(nome, sql, construtor)
+        self._por_nome[nome] = instrucao
+        self._por_sql.setdefault(sql, instrucao)
+        return instrucao
+
+    def registrar_classe(self, classe, construtores=None):
+        # Toda constante SQL_* da classe entra como "Classe.NOME"
+        construtores = construtores or {}
+        for atributo, sql in vars(classe).items():
+            if atributo.startswith("SQL_") and isinstance(sql, str):
+                nome = atributo[4:]
+                self.registrar(f"{classe.__name__}.{nome}", sql, construtores.get(nome))
+
+    def __getitem__(self, nome):
+        return self._por_nome[nome]
+
+    def __iter__(self):
+        return iter(self._por_nome.values())
+
+    def __len__(self):
+        return len(self._por_nome)
+
+    def de_sql(self, sql):
+        # SQL fora do registro ganha uma instrução avulsa (só tupla/nomeada)
+        instrucao = self._por_sql.get(sql)
+        return instrucao if instrucao is not None else Instrucao("consulta", sql)
+
+    def fabrica(self, sql, forma, cursor):
+        return self.de_sql(sql).fabrica(forma, cursor)
+
+    def tamanho_cache(self):
+        return len(self) + FOLGA_CACHE
@@ -0,0 +1,284 @@
+# =======================================================
+# INSTRUMENTAÇÃO DAS CONSULTAS DOS DAOs
+# =======================================================
+#
+# Quando ativada, DAO.conectar() devolve a conexão do pool envolvida
+# num proxy que cronometra cada comando (execute/executemany + fetch),
+# conta linhas e avisa os ouvintes registrados. Desativada, o único
+# custo no caminho quente é o teste de "instrumentacao.ativo".
+#
+#   import instrumentacao
+#   histograma = instrumentacao.OuvinteHistograma()
+#   instrumentacao.ativar(histograma, instrumentacao.OuvinteLog(), limite_lento_ms=50)
+#   ...
+#   histograma.exibir()
+
+import bisect
+import threading
+import time
+from collections import namedtuple
+
+ativo = False
+limite_lento = 0.1
+_ouvintes = []
+# Registro de instruções dos DAOs (main.INSTRUCOES, preenchido por main.py)
+registro = None
+
+Medicao = namedtuple("Medicao", "metodo sql parametros duracao linhas lenta plano")
+
+
+def ativar(*ouvintes, limite_lento_ms=100):
+    global ativo, limite_lento
+    _ouvintes.extend(ouvintes)
+    limite_lento = limite_lento_ms / 1000
+    ativo = True
+
+
+def desativar():
+    global ativo
+    ativo = False
+    _ouvintes.clear()
+
+
+def adicionar_ouvinte(ouvinte):
+    _ouvintes.append(ouvinte)
+
+
+def remover_ouvinte(ouvinte):
+    _ouvintes.remove(ouvinte)
+
+
+def envolver(conn, dao, metodo=None):
+    return ConexaoInstrumentada(conn, type(dao).__name__, metodo)
+
+
+def _nome_instrucao(classe, sql):
+    # Quem chama DAO.conectar() sem dizer o método é identificado pelo
+    # nome da instrução no registro ("RoupaDAO.BUSCAR"); SQL montado na
+    # hora fica como "Classe.consulta"
+    nome = registro.de_sql(sql).nome if registro is not None else "consulta"
+    return nome if "." in nome else f"{classe}.{nome}"
+
+
+def _notificar(medicao):
+    for ouvinte in list(_ouvintes):
+        ouvinte(medicao)
+
+
+# =======================================================
+# PROXIES DE CONEXÃO E CURSOR
+# =======================================================
+
+class ConexaoInstrumentada:
+    def __init__(self, conn, classe, metodo=None):
+        self._conn = conn
+        self.classe = classe
+        self.metodo = f"{classe}.{metodo}" if metodo else None
+
+    def nomear(self, sql):
+        return self.metodo or _nome_instrucao(self.classe, sql)
+
+    def cursor(self):
+        return CursorInstrumentado(self._conn.cursor(), self)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self.cursor().executemany(sql, parametros)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *erro):
+        return self._conn.__exit__(*erro)
+
+    def __getattr__(self, nome):
+        return getattr(self._conn, nome)
+
+
+class CursorInstrumentado:
+    # Um SELECT só termina quando as linhas são lidas, então o tempo e as
+    # linhas dos fetch* são somados ao comando e a medição é publicada
+    # quando o resultado se esgota (ou quando o cursor é reutilizado).
+    def __init__(self, cursor, conexao):
+        self._cursor = cursor
+        self._conexao = conexao
+        self._pendente = None
+
+    def execute(self, sql, parametros=()):
+        self._publicar()
+        inicio = time.perf_counter()
+        self._cursor.execute(sql, parametros)
+        self._registrar(sql, parametros, time.perf_counter() - inicio)
+        return self
+
+    def executemany(self, sql, parametros):
+        self._publicar()
+        inicio = time.perf_counter()
+        self._cursor.executemany(sql, parametros)
+        self._registrar(sql, None, time.perf_counter() - inicio)
+        return self
+
+    def fetchone(self):
+        linha = self._cronometrar(self._cursor.fetchone)
+        self._contar(0 if linha is None else 1, esgotou=linha is None)
+        return linha
+
+    def fetchmany(self, tamanho=None):
+        tamanho = tamanho or self._cursor.arraysize
+        linhas = self._cronometrar(self._cursor.fetchmany, tamanho)
+        self._contar(len(linhas), esgotou=len(linhas) < tamanho)
+        return linhas
+
+    def fetchall(self):
+        linhas = self._cronometrar(self._cursor.fetchall)
+        self._contar(len(linhas), esgotou=True)
+        return linhas
+
+    def __iter__(self):
+        while True:
+            linha = self.fetchone()
+            if linha is None:
+                return
+            yield linha
+
+    def close(self):
+        self._publicar()
+        self._cursor.close()
+
+    def __del__(self):
+        self._publicar()
+
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+
+    def _registrar(self, sql, parametros, duracao):
+        if self._cursor.description is None:
+            self._emitir(sql, parametros, duracao, max(self._cursor.rowcount, 0))
+        else:
+            self._pendente = [sql, parametros, duracao, 0]
+
+    def _cronometrar(self, funcao, *args):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        if self._pendente is not None:
+            self._pendente[2] += time.perf_counter() - inicio
+        return resultado
+
+    def _contar(self, linhas, esgotou):
+        if self._pendente is not None:
+            self._pendente[3] += linhas
+            if esgotou:
+                self._publicar()
+
+    def _publicar(self):
+        if self._pendente is not None:
+            pendente, self._pendente = self._pendente, None
+            self._emitir(*pendente)
+
+    def _emitir(self, sql, parametros, duracao, linhas):
+        lenta = duracao >= limite_lento
+        plano = None
+        if lenta and parametros is not None:
+            try:
+                plano = [linha[3] for linha in
+                         self._conexao._conn.execute("EXPLAIN QUERY PLAN " + sql, parametros)]
+            except Exception:
+                plano = None
+        _notificar(Medicao(self._conexao.nomear(sql), " ".join(sql.split()), parametros,
+                           duracao, linhas, lenta, plano))
+
+
+# =======================================================
+# OUVINTES
+# =======================================================
+
+class OuvinteLog:
+    def __init__(self, logger=None, somente_lentas=False):
+        # logging só é importado por quem usa o ouvinte (custa ~10 ms na partida)
+        import logging
+
+        self.logger = logger or logging.getLogger("confeccao.sql")
+        self.somente_lentas = somente_lentas
+
+    def __call__(self, medicao):
+        if medicao.lenta:
+            self.logger.warning("🐢 %s levou %.2f ms (%d linhas): %s | plano: %s",
+                                medicao.metodo, medicao.duracao * 1000, medicao.linhas,
+                                medicao.sql, " / ".join(medicao.plano or []))
+        elif not self.somente_lentas:
+            self.logger.debug("%s %.3f ms (%d linhas): %s", medicao.metodo,
+                              medicao.duracao * 1000, medicao.linhas, medicao.sql)
+
+
+class OuvinteHistograma:
+    # Faixas em microssegundos, dobrando a cada faixa (1 µs .. ~17 s)
+    FAIXAS_US = [2 ** i for i in range(25)]
+
+    def __init__(self, max_lentas=100):
+        self.max_lentas = max_lentas
+        self._lock = threading.Lock()
+        self._metodos = {}
+        self.lentas = []
+
+    def __call__(self, medicao):
+        micros = medicao.duracao * 1_000_000
+        with self._lock:
+            dados = self._metodos.get(medicao.metodo)
+            if dados is None:
+                dados = self._metodos[medicao.metodo] = {
+                    "chamadas": 0, "linhas": 0, "total": 0.0, "maximo": 0.0,
+                    "faixas": [0] * (len(self.FAIXAS_US) + 1),
+                }
+            dados["chamadas"] += 1
+            dados["linhas"] += medicao.linhas
+            dados["total"] += medicao.duracao
+            dados["maximo"] = max(dados["maximo"], medicao.duracao)
+            dados["faixas"][bisect.bisect_left(self.FAIXAS_US, micros)] += 1
+            if medicao.lenta:
+                self.lentas.append(medicao)
+                del self.lentas[:-self.max_lentas]
+
+    def _percentil(self, faixas, chamadas, p):
+        alvo = p * chamadas
+        acumulado = 0
+        for indice, quantidade in enumerate(faixas):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                limite = self.FAIXAS_US[min(indice, len(self.FAIXAS_US) - 1)]
+                return limite / 1000
+        return None
+
+    def resumo(self):
+        with self._lock:
+            return {
+                metodo: {
+                    "chamadas": dados["chamadas"],
+                    "linhas": dados["linhas"],
+                    "total_ms": round(dados["total"] * 1000, 3),
+                    "media_ms": round(dados["total"] * 1000 / dados["chamadas"], 3),
+                    "max_ms": round(dados["maximo"] * 1000, 3),
+                    # Percentis aproximados pelo limite superior da faixa
+                    "p50_ms": self._percentil(dados["faixas"], dados["chamadas"], 0.50),
+                    "p99_ms": self._percentil(dados["faixas"], dados["chamadas"], 0.99),
+                }
+                for metodo, dados in self._metodos.items()
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._metodos.clear()
+            self.lentas.clear()
+
+    def exibir(self):
+        print("\n📊 CONSULTAS POR MÉTODO:")
+        for metodo, dados in sorted(self.resumo().items(), key=lambda item: -item[1]["total_ms"]):
+            print(f"{metodo} | Chamadas: {dados['chamadas']} | Linhas: {dados['linhas']} | "
+                  f"Total: {dados['total_ms']:.2f} ms | Média: {dados['media_ms']:.3f} ms | "
+                  f"p99 ≤ {dados['p99_ms']} ms")
+        for medicao in self.lentas:
+            print(f"🐢 {medicao.metodo} {medicao.duracao * 1000:.2f} ms: {medicao.sql}")
+            for passo in medicao.plano or []:
+                print(f"     {passo}")
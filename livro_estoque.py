@@ -0,0 +1,366 @@
+# =======================================================
+# LIVRO DE ESTOQUE (CONSULTAS NO TEMPO)
+# =======================================================
+#
+# Os gatilhos da migração 6 de ddl_confeccao.py gravam em
+# movimento_estoque cada mudança de roupa.estoque (reservas, estornos,
+# importações, ajustes manuais) com a variação e o saldo resultante.
+# Fotografias periódicas (foto_estoque) guardam o estoque de todas as
+# roupas e o último movimento que elas já incluem, então:
+#   - o estoque de uma roupa num instante é o saldo do último movimento
+#     até ele (um SEARCH em idx_movimento_roupa);
+#   - o estoque do catálogo inteiro num instante é a fotografia anterior
+#     mais a soma dos movimentos desde ela, lidos por faixa de id.
+# As fotografias ficam fora do caminho das vendas: fotografar_se_preciso
+# só grava quando o livro acumulou mais que MAX_MOVIMENTOS_SEM_FOTO desde
+# a última, e roda entre os grupos da escrita agrupada (escrita_agrupada.py)
+# ou num agendamento ("fotografar --se-preciso", ex.: cron a cada hora).
+# Os instantes são em UTC, como o datetime('now') do SQLite; uma data
+# sozinha vale pelo fim do dia.
+#
+#   python livro_estoque.py roupa 42 --em 2025-10-17
+#   python livro_estoque.py catalogo --em "2025-10-17 18:00:00"
+#   python livro_estoque.py fotografar
+#   python livro_estoque.py fotografar --se-preciso --max-movimentos 20000
+#   python livro_estoque.py --benchmark --movimentos 10000000
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from main import DAO, em_lotes
+
+# Fotografa quando o livro acumula mais que isto desde a última foto
+MAX_MOVIMENTOS_SEM_FOTO = 100_000
+MAIOR_ID = 2 ** 63 - 1
+
+
+def instante(valor):
+    # datetime/date/texto -> texto comparável com movimento_estoque.momento
+    if isinstance(valor, datetime):
+        return valor.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    if isinstance(valor, date):
+        return f"{valor.isoformat()} 23:59:59.999"
+    valor = str(valor).strip().replace("T", " ")
+    return f"{valor} 23:59:59.999" if len(valor) == 10 else valor
+
+
+class LivroEstoque(DAO):
+    SQL_SALDO_ATE = """
+        SELECT saldo FROM movimento_estoque
+        WHERE roupa_id = ? AND momento <= ?
+        ORDER BY momento DESC, id DESC LIMIT 1
+    """
+    SQL_SALDO_ANTES_DE = """
+        SELECT saldo - delta FROM movimento_estoque
+        WHERE roupa_id = ? AND momento > ?
+        ORDER BY momento, id LIMIT 1
+    """
+    # A foto seguinte limita a faixa: tudo depois da marca dela aconteceu
+    # depois do instante pedido
+    SQL_FOTO_ATE = """
+        SELECT id, ultimo_movimento,
+               (SELECT MIN(ultimo_movimento) FROM foto_estoque WHERE momento > ?)
+        FROM foto_estoque
+        WHERE momento <= ? ORDER BY momento DESC LIMIT 1
+    """
+    SQL_INICIO = "SELECT MIN(momento) FROM foto_estoque"
+    SQL_ITENS_FOTO = "SELECT roupa_id, estoque FROM foto_estoque_item WHERE foto_id = ?"
+    # Faixa de id entre duas fotos (a chave primária): não precisa de outro
+    # índice. Sem o limite superior o SQLite preferiria varrer
+    # idx_movimento_roupa inteiro para agrupar sem ordenar
+    SQL_DELTAS_DESDE = """
+        SELECT roupa_id, SUM(delta) FROM movimento_estoque
+        WHERE id > ? AND id <= ? AND momento <= ?
+        GROUP BY roupa_id
+    """
+    SQL_PENDENTES = """
+        SELECT COALESCE((SELECT MAX(id) FROM movimento_estoque), 0)
+             - COALESCE((SELECT MAX(ultimo_movimento) FROM foto_estoque), 0)
+    """
+
+    def estoque_em(self, roupa_id, momento):
+        # None: instante anterior ao início do livro ou roupa inexistente
+        momento = instante(momento)
+        conn = self.conectar()
+        linha = conn.execute(self.SQL_SALDO_ATE, (roupa_id, momento)).fetchone()
+        if linha is not None:
+            return linha[0]
+        inicio = conn.execute(self.SQL_INICIO).fetchone()[0]
+        if inicio is None or momento < inicio:
+            return None
+        # Sem movimento até o instante: o saldo de antes do próximo movimento
+        linha = conn.execute(self.SQL_SALDO_ANTES_DE, (roupa_id, momento)).fetchone()
+        if linha is None:
+            linha = conn.execute("SELECT estoque FROM roupa WHERE id = ?", (roupa_id,)).fetchone()
+        return None if linha is None else linha[0]
+
+    def catalogo_em(self, momento):
+        # {roupa_id: estoque} no instante; None antes da primeira fotografia
+        momento = instante(momento)
+        conn = self.conectar()
+        foto = conn.execute(self.SQL_FOTO_ATE, (momento, momento)).fetchone()
+        if foto is None:
+            return None
+        foto_id, ultimo_movimento, limite = foto
+        estoque = dict(conn.execute(self.SQL_ITENS_FOTO, (foto_id,)))
+        faixa = (ultimo_movimento, limite if limite is not None else MAIOR_ID, momento)
+        for roupa_id, delta in conn.execute(self.SQL_DELTAS_DESDE, faixa):
+            estoque[roupa_id] = estoque.get(roupa_id, 0) + delta
+        return estoque
+
+    def fotografar(self):
+        return self._gravar(self._fotografar)
+
+    def _fotografar(self, conn):
+        # Dentro da transação IMMEDIATE nenhum movimento novo entra, então
+        # roupa.estoque é exatamente o saldo até MAX(id) do livro
+        foto_id = conn.execute("""
+            INSERT INTO foto_estoque (momento, ultimo_movimento)
+            VALUES (strftime('%Y-%m-%d %H:%M:%f', 'now'),
+                    COALESCE((SELECT MAX(id) FROM movimento_estoque), 0))
+        """).lastrowid
+        conn.execute("INSERT INTO foto_estoque_item (foto_id, roupa_id, estoque) "
+                     "SELECT ?, id, estoque FROM roupa", (foto_id,))
+        return foto_id
+
+    def pendentes(self):
+        return self.conectar().execute(self.SQL_PENDENTES).fetchone()[0]
+
+    def fotografar_se_preciso(self, max_movimentos=MAX_MOVIMENTOS_SEM_FOTO):
+        # Entrada de manutenção: mantém limitado o trecho do livro que
+        # catalogo_em precisa somar. A leitura sem lock descarta o caso comum;
+        # a conferência se repete com o lock para duas chamadas simultâneas
+        # não fotografarem o mesmo trecho
+        if self.pendentes() <= max_movimentos:
+            return None
+        return self._gravar(lambda conn: self._fotografar_se_preciso(conn, max_movimentos))
+
+    def _fotografar_se_preciso(self, conn, max_movimentos=MAX_MOVIMENTOS_SEM_FOTO):
+        if conn.execute(self.SQL_PENDENTES).fetchone()[0] > max_movimentos:
+            return self._fotografar(conn)
+        return None
+
+    def descartar_fotos(self, antes_de):
+        # Poda de fotografias antigas; a primeira fica (é o início do livro)
+        # e os movimentos nunca são apagados
+        def operacao(conn):
+            return conn.execute("""
+                DELETE FROM foto_estoque
+                WHERE momento < ? AND id > (SELECT MIN(id) FROM foto_estoque)
+            """, (instante(antes_de),)).rowcount
+        return self._gravar(operacao)
+
+
+# =======================================================
+# BENCHMARK (livro sintético)
+# =======================================================
+
+def _cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[len(tempos) // 2] * 1000, tempos[min(len(tempos) - 1, int(len(tempos) * 0.99))] * 1000
+
+
+def _tamanho_mb(conn):
+    paginas = conn.execute("PRAGMA page_count").fetchone()[0]
+    return paginas * conn.execute("PRAGMA page_size").fetchone()[0] / 1048576
+
+
+def popular_livro(conn, movimentos, roupas, intervalo_foto, rnd, dias=90):
+    # Histórico de `dias` dias: vendas de 1 a 5 peças e reposições de
+    # 50 a 200, com popularidade desigual entre as roupas (90% das vendas
+    # nos 20% mais vendidos), e uma fotografia a cada intervalo_foto
+    # movimentos. Os gatilhos ficam de fora da carga sintética.
+    gatilhos = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_movimento_estoque_%'").fetchall()
+    for nome, _ in gatilhos:
+        conn.execute(f"DROP TRIGGER {nome}")
+    conn.execute("DELETE FROM foto_estoque")
+    conn.execute("DROP INDEX IF EXISTS idx_movimento_roupa")
+    conn.executemany("INSERT INTO roupa (codigo, descricao, preco, estoque) VALUES (?, ?, ?, 0)",
+                     ((f"LIVRO{i:07d}", f"Peça {i}", 50.0) for i in range(roupas)))
+    primeira = conn.execute("SELECT MIN(id) FROM roupa WHERE codigo LIKE 'LIVRO%'").fetchone()[0]
+    saldos = [0] * roupas
+    populares = max(1, roupas // 5)
+    inicio = datetime.now() - timedelta(days=dias)
+    passo = timedelta(days=dias) / movimentos
+    fotos = []
+
+    def gerar():
+        for i in range(movimentos):
+            indice = rnd.randrange(populares) if rnd.random() < 0.9 else rnd.randrange(roupas)
+            venda = rnd.randint(1, 5)
+            delta = -venda if saldos[indice] >= venda else rnd.randint(50, 200)
+            saldos[indice] += delta
+            momento = (inicio + passo * i).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            yield i + 1, primeira + indice, momento, delta, saldos[indice]
+            if (i + 1) % intervalo_foto == 0:
+                fotos.append((i + 1, momento, list(saldos)))
+
+    t0 = time.perf_counter()
+    for bloco in em_lotes(gerar(), 200_000):
+        conn.executemany("INSERT INTO movimento_estoque (id, roupa_id, momento, delta, saldo) "
+                         "VALUES (?, ?, ?, ?, ?)", bloco)
+        for ultimo, momento, estado in fotos:
+            foto_id = conn.execute("INSERT INTO foto_estoque (momento, ultimo_movimento) VALUES (?, ?)",
+                                   (momento, ultimo)).lastrowid
+            conn.executemany("INSERT INTO foto_estoque_item (foto_id, roupa_id, estoque) VALUES (?, ?, ?)",
+                             ((foto_id, primeira + k, s) for k, s in enumerate(estado)))
+        fotos.clear()
+    conn.executemany("UPDATE roupa SET estoque = ? WHERE id = ?",
+                     ((s, primeira + k) for k, s in enumerate(saldos)))
+    conn.commit()
+    carga = time.perf_counter() - t0
+    tamanho_sem_indice = _tamanho_mb(conn)
+
+    t0 = time.perf_counter()
+    conn.execute("CREATE INDEX idx_movimento_roupa ON movimento_estoque (roupa_id, momento)")
+    for _, sql in gatilhos:
+        conn.execute(sql)
+    conn.commit()
+    indexacao = time.perf_counter() - t0
+    return {
+        "primeira_roupa": primeira,
+        "inicio": inicio,
+        "carga_s": round(carga, 2),
+        "indexacao_s": round(indexacao, 2),
+        "tamanho_sem_indice_mb": round(tamanho_sem_indice, 1),
+        "tamanho_com_indice_mb": round(_tamanho_mb(conn), 1),
+    }
+
+
+def benchmark(movimentos, roupas, intervalo_foto, consultas, semente):
+    from ddl_confeccao import banco_temporario
+
+    rnd = random.Random(semente)
+    diretorio = tempfile.mkdtemp(prefix="confeccao-livro-")
+    try:
+        db_name = banco_temporario(diretorio)
+        DAO.configurar_pool(db_name, perfil="throughput")
+        livro = LivroEstoque(db_name)
+        conn = livro.conectar()
+        print(f"⏱️ Livro sintético: {movimentos:,} movimentos, {roupas:,} roupas, "
+              f"foto a cada {intervalo_foto:,} movimentos")
+        carga = popular_livro(conn, movimentos, roupas, intervalo_foto, rnd)
+        print(f"Carga: {carga['carga_s']} s | índice (roupa_id, momento): {carga['indexacao_s']} s | "
+              f"banco {carga['tamanho_sem_indice_mb']} MB -> {carga['tamanho_com_indice_mb']} MB")
+
+        primeira, inicio = carga["primeira_roupa"], carga["inicio"]
+
+        def sorteio():
+            # Depois da primeira fotografia (o livro sintético começa nela)
+            return (primeira + rnd.randrange(roupas), inicio + timedelta(seconds=rnd.uniform(5, 90) * 86400))
+
+        resultados = {"carga": {k: v for k, v in carga.items() if k not in ("primeira_roupa", "inicio")}}
+
+        # Conferência: as roupas pela fotografia + delta e pelo saldo do livro
+        _, momento = sorteio()
+        catalogo = livro.catalogo_em(momento)
+        conferidas = [livro.estoque_em(r, momento) == catalogo.get(r, 0)
+                      for r in (primeira + rnd.randrange(roupas) for _ in range(200))]
+        print(f"{'✅' if all(conferidas) else '⚠️'} estoque_em x catalogo_em: "
+              f"{sum(conferidas)}/{len(conferidas)} iguais")
+
+        casos = [("estoque_em (índice)", lambda: livro.estoque_em(*sorteio()), consultas)]
+        casos.append(("catalogo_em (foto + delta)", lambda: livro.catalogo_em(sorteio()[1]),
+                      max(3, consultas // 100)))
+        replay = """
+            SELECT roupa_id, SUM(delta) FROM movimento_estoque WHERE momento <= ? GROUP BY roupa_id
+        """
+        casos.append(("catalogo (livro inteiro)",
+                      lambda: conn.execute(replay, (instante(sorteio()[1]),)).fetchall(), 3))
+        for nome, funcao, repeticoes in casos:
+            p50, p99 = _cronometrar(funcao, repeticoes)
+            resultados[nome] = {"p50_ms": round(p50, 3), "p99_ms": round(p99, 3)}
+            print(f"{nome:<28} p50 {p50:10.3f} ms | p99 {p99:10.3f} ms")
+
+        # Sem o índice (dentro de uma transação desfeita no fim)
+        conn.execute("BEGIN")
+        conn.execute("DROP INDEX idx_movimento_roupa")
+        p50, p99 = _cronometrar(lambda: livro.estoque_em(*sorteio()), 3)
+        conn.rollback()
+        resultados["estoque_em (sem índice)"] = {"p50_ms": round(p50, 3), "p99_ms": round(p99, 3)}
+        print(f"{'estoque_em (sem índice)':<28} p50 {p50:10.3f} ms | p99 {p99:10.3f} ms")
+
+        # Custo dos gatilhos numa baixa de estoque
+        baixas = [(primeira + rnd.randrange(roupas),) for _ in range(20_000)]
+        custo = {}
+        for nome, remover in (("com livro", False), ("sem livro", True)):
+            conn.execute("BEGIN")
+            if remover:
+                conn.execute("DROP TRIGGER trg_movimento_estoque_update")
+            inicio_baixas = time.perf_counter()
+            conn.executemany("UPDATE roupa SET estoque = estoque + 1 WHERE id = ?", baixas)
+            custo[nome] = (time.perf_counter() - inicio_baixas) / len(baixas) * 1e6
+            conn.rollback()
+        resultados["baixa_us"] = {k: round(v, 2) for k, v in custo.items()}
+        print(f"Baixa de estoque: {custo['com livro']:.2f} µs com o livro | "
+              f"{custo['sem livro']:.2f} µs sem")
+        return resultados
+    finally:
+        DAO.fechar_pools()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+# =======================================================
+# EXECUÇÃO COMO SCRIPT
+# =======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estoque em instantes passados")
+    parser.add_argument("acao", nargs="?", choices=["roupa", "catalogo", "fotografar"])
+    parser.add_argument("roupa_id", nargs="?", type=int)
+    parser.add_argument("--em", default=None, help="instante (UTC); padrão: agora")
+    parser.add_argument("--se-preciso", action="store_true",
+                        help="fotografar só se o livro acumulou mais que --max-movimentos")
+    parser.add_argument("--max-movimentos", type=int, default=MAX_MOVIMENTOS_SEM_FOTO)
+    parser.add_argument("--db", default="confeccao.db")
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--movimentos", type=int, default=10_000_000)
+    parser.add_argument("--roupas", type=int, default=10_000)
+    parser.add_argument("--intervalo-foto", type=int, default=MAX_MOVIMENTOS_SEM_FOTO)
+    parser.add_argument("--consultas", type=int, default=1000)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.movimentos, args.roupas, args.intervalo_foto, args.consultas, args.semente)
+        return
+    livro = LivroEstoque(args.db)
+    momento = args.em or datetime.now(timezone.utc)
+    if args.acao == "roupa":
+        if args.roupa_id is None:
+            parser.error("informe o id da roupa")
+        estoque = livro.estoque_em(args.roupa_id, momento)
+        if estoque is None:
+            print("⚠️ Sem registro de estoque para essa roupa nesse instante.")
+        else:
+            print(f"📦 Roupa {args.roupa_id} em {instante(momento)}: {estoque} peças")
+    elif args.acao == "catalogo":
+        estoque = livro.catalogo_em(momento)
+        if estoque is None:
+            print("⚠️ O livro de estoque começa depois desse instante.")
+            return
+        print(f"\n📦 ESTOQUE EM {instante(momento)}:")
+        for roupa_id in sorted(estoque):
+            print(f"Roupa {roupa_id}: {estoque[roupa_id]}")
+    elif args.acao == "fotografar":
+        foto_id = livro.fotografar_se_preciso(args.max_movimentos) if args.se_preciso else livro.fotografar()
+        if foto_id is None:
+            print(f"✅ {livro.pendentes()} movimentos desde a última fotografia; nada a fazer.")
+        else:
+            print(f"📸 Fotografia {foto_id} gravada!")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
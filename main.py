@@ -2,10 +2,23 @@
 # SISTEMA DE CONFECÇÃO DE ROUPAS - OOP + CRUD
 # =======================================================
 
+import atexit
+import os
+import random
 import sqlite3
+import threading
+import time
+from collections import namedtuple
+from itertools import islice
 from enum import Enum
 from datetime import date
 
+import instrumentacao
+from cache_roupa import cache_para
+from ddl_confeccao import garantir_schema
+from instrucoes_sql import RegistroInstrucoes
+from pool_conexoes import TAMANHO_PADRAO, PoolConexoes
+
 # =======================================================
 # ENUMS
 # =======================================================
@@ -41,12 +54,47 @@ class TipoEtapa(Enum):
     ACABAMENTO = "Acabamento"
     INSPECAO = "Inspeção"
 
+# Transições de pagamento aceitas pelo banco: novo status -> status de origem.
+# Pix e boleto chegam já liquidados, então Pendente -> Confirmado também vale.
+TRANSICOES_PAGAMENTO = {
+    StatusPagamento.PROCESSANDO: (StatusPagamento.PENDENTE,),
+    StatusPagamento.CONFIRMADO: (StatusPagamento.PENDENTE, StatusPagamento.PROCESSANDO),
+    StatusPagamento.ESTORNADO: (StatusPagamento.CONFIRMADO,),
+}
+# Status do pedido exigido em cada transição e o status que ele passa a ter
+PEDIDO_NA_TRANSICAO = {
+    StatusPagamento.PROCESSANDO: ((StatusPedido.ABERTO, StatusPedido.EM_PROCESSAMENTO), None),
+    StatusPagamento.CONFIRMADO: ((StatusPedido.ABERTO, StatusPedido.EM_PROCESSAMENTO), StatusPedido.FINALIZADO),
+    StatusPagamento.ESTORNADO: ((StatusPedido.FINALIZADO,), StatusPedido.CANCELADO),
+}
+
+ResultadoPagamento = namedtuple("ResultadoPagamento", "pagamento_id ok status motivo")
+
 # =======================================================
 # CLASSES DO DOMÍNIO
 # =======================================================
+# Todas usam __slots__: sem __dict__ por instância, o que reduz bastante
+# a memória ao hidratar históricos grandes de pedidos.
+
+class Preguicoso:
+    # Marca um relacionamento ainda não carregado: guarda a função de
+    # busca (compartilhada entre objetos) e a chave, e só consulta o
+    # banco no primeiro acesso ao atributo
+    __slots__ = ("carregar", "chave")
+    
+    def __init__(self, carregar, chave):
+        self.carregar = carregar
+        self.chave = chave
+    
+    def resolver(self):
+        return self.carregar(self.chave)
+
 
 class Pessoa:
-    def __init__(self, nome, telefone=None, email=None):
+    __slots__ = ("id", "nome", "telefone", "email")
+    
+    def __init__(self, nome, telefone=None, email=None, id=None):
+        self.id = id
         self.nome = nome
         self.telefone = telefone
         self.email = email
@@ -59,8 +107,10 @@ class Pessoa:
 
 
 class Cliente(Pessoa):
-    def __init__(self, nome, cpf, endereco, telefone=None, email=None):
-        super().__init__(nome, telefone, email)
+    __slots__ = ("cpf", "endereco")
+    
+    def __init__(self, nome, cpf, endereco, telefone=None, email=None, id=None):
+        super().__init__(nome, telefone, email, id)
         self.cpf = cpf
         self.endereco = endereco
     
@@ -76,8 +126,10 @@ class Cliente(Pessoa):
 
 
 class Funcionario(Pessoa):
-    def __init__(self, nome, matricula, cargo, salario, telefone=None, email=None):
-        super().__init__(nome, telefone, email)
+    __slots__ = ("matricula", "cargo", "salario")
+    
+    def __init__(self, nome, matricula, cargo, salario, telefone=None, email=None, id=None):
+        super().__init__(nome, telefone, email, id)
         self.matricula = matricula
         self.cargo = cargo
         self.salario = salario
@@ -90,7 +142,10 @@ class Funcionario(Pessoa):
 
 
 class Roupa:
-    def __init__(self, codigo, descricao, tamanho, cor, preco, estoque):
+    __slots__ = ("id", "codigo", "descricao", "tamanho", "cor", "preco", "estoque")
+    
+    def __init__(self, codigo, descricao, tamanho, cor, preco, estoque, id=None):
+        self.id = id
         self.codigo = codigo
         self.descricao = descricao
         self.tamanho = tamanho
@@ -108,14 +163,47 @@ class Roupa:
 
 
 class Pedido:
-    def __init__(self, numero, id=None, cliente=None, status=StatusPedido.ABERTO):
+    __slots__ = ("id", "numero", "_cliente", "_itens", "_total", "status", "pagamento")
+    
+    def __init__(self, numero, id=None, cliente=None, status=StatusPedido.ABERTO, itens=None, total=None):
         self.id = id
         self.numero = numero
-        self.cliente = cliente
-        self.itens = []
+        self._cliente = cliente
+        self._itens = [] if itens is None else itens
+        # Total corrente, mantido por adicionar_item/remover_item; None
+        # significa "ainda não conhecido" (itens preguiçosos sem total do banco)
+        self._total = total
+        if total is None and type(self._itens) is not Preguicoso:
+            self._total = self._somar_itens()
         self.status = status
         self.pagamento = None
     
+    @property
+    def cliente(self):
+        if type(self._cliente) is Preguicoso:
+            self._cliente = self._cliente.resolver()
+        return self._cliente
+    
+    @cliente.setter
+    def cliente(self, cliente):
+        self._cliente = cliente
+    
+    @property
+    def itens(self):
+        if type(self._itens) is Preguicoso:
+            self._itens = self._itens.resolver()
+            if self._total is None:
+                self._total = self._somar_itens()
+        return self._itens
+    
+    @itens.setter
+    def itens(self, itens):
+        self._itens = itens
+        self._total = None if type(itens) is Preguicoso else self._somar_itens()
+    
+    def _somar_itens(self):
+        return sum(item.calcular_subtotal() for item in self._itens)
+    
     def adicionar_item(self, item):
         if item.quantidade <= 0:
             print("Quantidade inválida")
@@ -124,19 +212,23 @@ class Pedido:
             print("Estoque insuficiente")
             return
         self.itens.append(item)
+        self._total += item.calcular_subtotal()
         item.roupa.atualizar_estoque(-item.quantidade)
         print(f"Adicionado {item.quantidade}x {item.roupa.descricao}")
     
     def remover_item(self, item):
         if item in self.itens:
             self.itens.remove(item)
+            self._total -= item.calcular_subtotal()
             item.roupa.atualizar_estoque(item.quantidade)
             print(f"Removido {item.quantidade}x {item.roupa.descricao}")
         else:
             print("Item não encontrado")
     
     def calcular_total(self):
-        return round(sum(item.calcular_subtotal() for item in self.itens), 2)
+        if self._total is None:
+            self.itens
+        return round(self._total, 2)
     
     def atualizar_status(self, novo_status):
         self.status = novo_status
@@ -151,16 +243,31 @@ class Pedido:
 
 
 class ItemPedido:
-    def __init__(self, roupa, quantidade, valor_unitario=None):
-        self.roupa = roupa
+    __slots__ = ("id", "_roupa", "quantidade", "valor_unitario")
+    
+    def __init__(self, roupa, quantidade, valor_unitario=None, id=None):
+        self.id = id
+        self._roupa = roupa
         self.quantidade = int(quantidade)
-        self.valor_unitario = float(valor_unitario) if valor_unitario else float(roupa.preco)
+        self.valor_unitario = float(valor_unitario) if valor_unitario else float(self.roupa.preco)
+    
+    @property
+    def roupa(self):
+        if type(self._roupa) is Preguicoso:
+            self._roupa = self._roupa.resolver()
+        return self._roupa
+    
+    @roupa.setter
+    def roupa(self, roupa):
+        self._roupa = roupa
     
     def calcular_subtotal(self):
         return self.valor_unitario * self.quantidade
 
 
 class Pagamento:
+    __slots__ = ("pedido", "valor", "forma", "status")
+    
     def __init__(self, valor, forma, pedido=None):
         self.pedido = pedido
         self.valor = float(valor)
@@ -185,6 +292,8 @@ class Pagamento:
 
 
 class Producao:
+    __slots__ = ("id", "data_inicio", "data_fim", "status")
+    
     def __init__(self, id, data_inicio=None, data_fim=None):
         self.id = id
         self.data_inicio = data_inicio or date.today()
@@ -203,6 +312,8 @@ class Producao:
 
 
 class EtapaProducao:
+    __slots__ = ("id", "tipo", "descricao", "ordem")
+    
     def __init__(self, id, tipo, descricao, ordem):
         self.id = id
         self.tipo = tipo
@@ -211,6 +322,8 @@ class EtapaProducao:
 
 
 class ExecucaoEtapa:
+    __slots__ = ("papel", "funcionario", "horas_trabalhadas", "observacoes")
+    
     def __init__(self, papel, funcionario=None):
         self.papel = papel
         self.funcionario = funcionario
@@ -223,201 +336,769 @@ class ExecucaoEtapa:
 # =======================================================
 
 class DAO:
+    # Um pool por arquivo de banco, compartilhado por todos os DAOs
+    _pools = {}
+    _pools_lock = threading.Lock()
+    # Escritores de escrita agrupada ativos, por arquivo (escrita_agrupada.ativar)
+    _agrupadores = {}
+    # "tamanho" limita as threads vivas que usam o banco, mesmo ociosas:
+    # cada uma fica com a sua conexão até terminar (pool_conexoes.py)
+    opcoes_pool = {"tamanho": TAMANHO_PADRAO, "perfil": os.environ.get("CONFECCAO_PERFIL", "seguro")}
+    tamanho_lote = 500
+    tentativas_lock = 5
+    espera_lock = 0.02
+    # Cria/migra o banco na primeira conexão de cada arquivo (ddl_confeccao.garantir_schema)
+    criar_schema = True
+
     def __init__(self, db_name="confeccao.db"):
         self.db_name = db_name
     
-    def conectar(self):
-        return sqlite3.connect(self.db_name)
+    @classmethod
+    def configurar_pool(cls, db_name="confeccao.db", **opcoes):
+        with DAO._pools_lock:
+            antigo = DAO._pools.pop(db_name, None)
+            DAO._pools[db_name] = DAO._novo_pool(db_name, {**DAO.opcoes_pool, **opcoes})
+        if antigo:
+            antigo.fechar()
+    
+    @classmethod
+    def obter_pool(cls, db_name="confeccao.db"):
+        pool = DAO._pools.get(db_name)
+        if pool is None:
+            with DAO._pools_lock:
+                pool = DAO._pools.get(db_name)
+                if pool is None:
+                    pool = DAO._novo_pool(db_name, DAO.opcoes_pool)
+                    DAO._pools[db_name] = pool
+        return pool
+    
+    @staticmethod
+    def _novo_pool(db_name, opcoes):
+        # Cache de instruções do sqlite3 do tamanho do registro (INSTRUCOES)
+        pool = PoolConexoes(db_name, **{"cached_statements": INSTRUCOES.tamanho_cache(), **opcoes})
+        if DAO.criar_schema:
+            # Usa uma conexão do próprio pool: um banco em memória só
+            # existe enquanto ela estiver aberta
+            garantir_schema(db_name, pool.obter())
+        return pool
+    
+    @classmethod
+    def fechar_pools(cls):
+        with DAO._pools_lock:
+            pools = list(DAO._pools.values())
+            DAO._pools.clear()
+        for pool in pools:
+            pool.fechar()
+    
+    def conectar(self, metodo=None):
+        conn = DAO.obter_pool(self.db_name).obter()
+        if instrumentacao.ativo:
+            return instrumentacao.envolver(conn, self, metodo)
+        return conn
+    
+    def _paginar(self, sql, parametros=(), apos_id=0, tamanho_lote=None, forma=None, metodo=None):
+        # Paginação por chave (keyset): cada página é uma consulta curta
+        # "... id > ? ORDER BY id LIMIT ?" e a primeira coluna de cada linha
+        # é o id usado como cursor da próxima página. Nenhuma página fica
+        # aberta entre um lote e outro, então a memória não cresce com a tabela.
+        # metodo: nome usado pela instrumentação (sem ele, vale o nome da
+        # instrução no registro, ex.: "ItemPedidoDAO.ITENS_DO_PEDIDO").
+        # forma: "tupla" (padrão), "nomeada" ou "objeto" (instrucoes_sql.py)
+        return self._paginas(sql, parametros, apos_id, tamanho_lote or self.tamanho_lote, metodo, forma)
+    
+    def _paginas(self, sql, parametros, apos_id, tamanho_lote, metodo, forma=None):
+        fabrica = None
+        while True:
+            cursor = self.conectar(metodo).execute(sql, (*parametros, apos_id, tamanho_lote))
+            linhas = cursor.fetchmany(tamanho_lote)
+            if fabrica is None and forma:
+                fabrica = INSTRUCOES.fabrica(sql, forma, cursor)
+            yield from (linhas if fabrica is None else map(fabrica, linhas))
+            if len(linhas) < tamanho_lote:
+                return
+            apos_id = linhas[-1][0]
+    
+    def _transacao_imediata(self, operacao):
+        # BEGIN IMMEDIATE pega o lock de escrita já no início, antes de
+        # qualquer leitura, então nenhuma outra conexão consegue mudar os
+        # dados entre a verificação e a escrita. Se o lock não sair dentro
+        # do busy_timeout, tenta de novo com espera exponencial + jitter.
+        conn = self.conectar()
+        if conn.in_transaction:
+            return operacao(conn)
+        for tentativa in range(self.tentativas_lock):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                break
+            except sqlite3.OperationalError as erro:
+                if "locked" not in str(erro) and "busy" not in str(erro):
+                    raise
+                if tentativa == self.tentativas_lock - 1:
+                    raise
+                time.sleep(self.espera_lock * (2 ** tentativa) * random.uniform(0.5, 1.5))
+        try:
+            resultado = operacao(conn)
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        return resultado
+    
+    def _gravar(self, operacao):
+        # Com a escrita agrupada ativa, a operação vai para a fila do
+        # escritor único e esta chamada espera o commit do grupo
+        agrupador = DAO._agrupadores.get(self.db_name)
+        if agrupador is not None:
+            return agrupador.enviar(operacao).result()
+        return self._transacao_imediata(operacao)
+    
+    def _gravar_comando(self, sql, parametros=()):
+        # Comando de escrita avulso (ex.: DELETE por id) pelo mesmo caminho
+        return self._gravar(lambda conn: conn.execute(sql, parametros).rowcount)
+    
+    def _inserir_pessoas_lote(self, conn, tipo, pessoas, sql_detalhe, detalhe, tamanho_lote):
+        # Insere pessoa + tabela filha por blocos dentro da transação aberta.
+        # Com o lock de escrita mantido, os ids AUTOINCREMENT de um
+        # executemany são consecutivos, então o id de cada pessoa é
+        # reconstruído a partir de last_insert_rowid().
+        cursor = conn.cursor()
+        ids = []
+        for bloco in em_lotes(pessoas, tamanho_lote):
+            cursor.executemany(
+                f"INSERT INTO pessoa (nome, telefone, email, tipo) VALUES (?, ?, ?, '{tipo}')",
+                ((p.nome, p.telefone, p.email) for p in bloco))
+            ultimo_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ids_bloco = range(ultimo_id - len(bloco) + 1, ultimo_id + 1)
+            cursor.executemany(sql_detalhe,
+                               ((pessoa_id, *detalhe(p)) for pessoa_id, p in zip(ids_bloco, bloco)))
+            ids.extend(ids_bloco)
+        return ids
+
+
+class RoupaNaoEncontrada(Exception):
+    def __init__(self, roupa_id):
+        super().__init__(f"Roupa {roupa_id} não encontrada")
+        self.roupa_id = roupa_id
+
+
+class EstoqueInsuficiente(Exception):
+    def __init__(self, roupa_id, quantidade, disponivel):
+        super().__init__(f"Estoque insuficiente da roupa {roupa_id}: pedido {quantidade}, disponível {disponivel}")
+        self.roupa_id = roupa_id
+        self.quantidade = quantidade
+        self.disponivel = disponivel
+
+
+def cliente_de_linha(linha):
+    cliente_id, nome, telefone, email, cpf, endereco = linha
+    return Cliente(nome, cpf, endereco, telefone, email, cliente_id)
+
+
+def roupa_de_linha(linha):
+    roupa_id, codigo, descricao, tamanho, cor, preco, estoque = linha
+    return Roupa(codigo, descricao, tamanho, cor, preco, estoque, roupa_id)
+
+
+def em_lotes(iteravel, tamanho):
+    iterador = iter(iteravel)
+    while True:
+        bloco = list(islice(iterador, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+
+atexit.register(DAO.fechar_pools)
 
 
 class ClienteDAO(DAO):
+    SQL_ITERAR = """
+        SELECT p.id, p.nome, c.cpf, c.endereco 
+        FROM pessoa p JOIN cliente c ON p.id = c.id
+        WHERE p.id > ? ORDER BY p.id LIMIT ?
+    """
+    SQL_BUSCAR = """
+        SELECT p.id, p.nome, p.telefone, p.email, c.cpf, c.endereco
+        FROM pessoa p JOIN cliente c ON p.id = c.id
+        WHERE p.id = ?
+    """
+    SQL_INSERIR_PESSOA = "INSERT INTO pessoa (nome, telefone, email, tipo) VALUES (?, ?, ?, 'Cliente')"
+    SQL_INSERIR = "INSERT INTO cliente (id, cpf, endereco) VALUES (?, ?, ?)"
+    SQL_DELETAR = "DELETE FROM pessoa WHERE id = ?"
+    
     def inserir(self, cliente):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO pessoa (nome, telefone, email, tipo) VALUES (?, ?, ?, 'Cliente')",
-                         (cliente.nome, cliente.telefone, cliente.email))
-            pessoa_id = cursor.lastrowid
-            cursor.execute("INSERT INTO cliente (id, cpf, endereco) VALUES (?, ?, ?)",
-                         (pessoa_id, cliente.cpf, cliente.endereco))
-            conn.commit()
-            print(f"✅ Cliente '{cliente.nome}' cadastrado!")
+        pessoa_id = self._gravar(lambda conn: self._inserir(conn, cliente))
+        print(f"✅ Cliente '{cliente.nome}' cadastrado!")
+        return pessoa_id
+    
+    def _inserir(self, conn, cliente):
+        pessoa_id = conn.execute(self.SQL_INSERIR_PESSOA, (cliente.nome, cliente.telefone, cliente.email)).lastrowid
+        conn.execute(self.SQL_INSERIR, (pessoa_id, cliente.cpf, cliente.endereco))
+        return pessoa_id
+    
+    def inserir_lote(self, clientes, tamanho_lote=1000):
+        return self._gravar(lambda conn: self._inserir_pessoas_lote(
+            conn, "Cliente", clientes, self.SQL_INSERIR, lambda c: (c.cpf, c.endereco), tamanho_lote))
+    
+    def iterar(self, apos_id=0, tamanho_lote=None, forma=None):
+        return self._paginar(self.SQL_ITERAR, apos_id=apos_id, tamanho_lote=tamanho_lote, forma=forma,
+                             metodo="iterar")
     
     def listar(self):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT p.id, p.nome, c.cpf, c.endereco 
-                FROM pessoa p JOIN cliente c ON p.id = c.id
-            """)
-            print("\n📋 CLIENTES:")
-            for c in cursor.fetchall():
-                print(f"ID: {c[0]} | Nome: {c[1]} | CPF: {c[2]} | Endereço: {c[3]}")
+        exibir_clientes(self.iterar())
+    
+    def buscar(self, id_cliente):
+        linha = self.conectar().execute(self.SQL_BUSCAR, (id_cliente,)).fetchone()
+        return None if linha is None else cliente_de_linha(linha)
     
     def deletar(self, id_cliente):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM pessoa WHERE id = ?", (id_cliente,))
-            conn.commit()
-            print("🗑️ Cliente removido!")
+        self._gravar_comando(self.SQL_DELETAR, (id_cliente,))
+        print("🗑️ Cliente removido!")
 
 
 class RoupaDAO(DAO):
+    SQL_ITERAR = """
+        SELECT id, codigo, descricao, preco, estoque, tamanho, cor FROM roupa
+        WHERE id > ? ORDER BY id LIMIT ?
+    """
+    SQL_BUSCAR = "SELECT id, codigo, descricao, tamanho, cor, preco, estoque FROM roupa WHERE id = ?"
+    SQL_BUSCAR_POR_CODIGO = "SELECT id, codigo, descricao, tamanho, cor, preco, estoque FROM roupa WHERE codigo = ?"
+    SQL_INSERIR = """
+        INSERT INTO roupa (codigo, descricao, tamanho, cor, preco, estoque)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    SQL_DELETAR = "DELETE FROM roupa WHERE id = ?"
+    
+    @property
+    def cache(self):
+        return cache_para(self.db_name)
+    
     def inserir(self, roupa):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO roupa (codigo, descricao, tamanho, cor, preco, estoque)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (roupa.codigo, roupa.descricao, roupa.tamanho, roupa.cor, roupa.preco, roupa.estoque))
-            conn.commit()
-            print(f"✅ Roupa '{roupa.descricao}' cadastrada!")
+        roupa_id = self._gravar(lambda conn: conn.execute(self.SQL_INSERIR, (
+            roupa.codigo, roupa.descricao, roupa.tamanho, roupa.cor, roupa.preco, roupa.estoque)).lastrowid)
+        # Write-through: a linha recém-gravada já entra no cache
+        self.cache.guardar((roupa_id, roupa.codigo, roupa.descricao, roupa.tamanho, roupa.cor,
+                            roupa.preco, roupa.estoque))
+        print(f"✅ Roupa '{roupa.descricao}' cadastrada!")
+        return roupa_id
+    
+    def inserir_lote(self, roupas, tamanho_lote=1000):
+        return self._gravar(lambda conn: self._inserir_lote(conn, roupas, tamanho_lote))
+    
+    def _inserir_lote(self, conn, roupas, tamanho_lote):
+        total = 0
+        cursor = conn.cursor()
+        for bloco in em_lotes(roupas, tamanho_lote):
+            cursor.executemany(self.SQL_INSERIR, ((r.codigo, r.descricao, r.tamanho, r.cor, r.preco, r.estoque)
+                                                  for r in bloco))
+            total += cursor.rowcount
+        return total
+    
+    def iterar(self, apos_id=0, tamanho_lote=None, forma=None):
+        return self._paginar(self.SQL_ITERAR, apos_id=apos_id, tamanho_lote=tamanho_lote, forma=forma,
+                             metodo="iterar")
     
     def listar(self):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, codigo, descricao, preco, estoque FROM roupa")
-            print("\n👕 ROUPAS:")
-            for r in cursor.fetchall():
-                print(f"ID: {r[0]} | Código: {r[1]} | {r[2]} | R$ {r[3]:.2f} | Estoque: {r[4]}")
+        exibir_roupas(self.iterar())
+    
+    def buscar(self, roupa_id):
+        linha = self.cache.obter(roupa_id)
+        if linha is None:
+            linha = self.conectar().execute(self.SQL_BUSCAR, (roupa_id,)).fetchone()
+            if linha is not None:
+                self.cache.guardar(linha)
+        return linha
+    
+    def obter(self, roupa_id):
+        linha = self.buscar(roupa_id)
+        return None if linha is None else roupa_de_linha(linha)
+    
+    def buscar_por_codigo(self, codigo):
+        linha = self.cache.obter_por_codigo(codigo)
+        if linha is None:
+            linha = self.conectar().execute(self.SQL_BUSCAR_POR_CODIGO, (codigo,)).fetchone()
+            if linha is not None:
+                self.cache.guardar(linha)
+        return linha
     
     def deletar(self, id_roupa):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM roupa WHERE id = ?", (id_roupa,))
-            conn.commit()
-            print("🗑️ Roupa removida!")
+        self._gravar_comando(self.SQL_DELETAR, (id_roupa,))
+        self.cache.invalidar(id_roupa)
+        print("🗑️ Roupa removida!")
 
 
 class FuncionarioDAO(DAO):
+    SQL_ITERAR = """
+        SELECT p.id, p.nome, f.matricula, f.cargo, f.salario 
+        FROM pessoa p JOIN funcionario f ON p.id = f.id
+        WHERE p.id > ? ORDER BY p.id LIMIT ?
+    """
+    SQL_INSERIR_PESSOA = "INSERT INTO pessoa (nome, telefone, email, tipo) VALUES (?, ?, ?, 'Funcionario')"
+    SQL_INSERIR = "INSERT INTO funcionario (id, matricula, cargo, salario) VALUES (?, ?, ?, ?)"
+    SQL_DELETAR = "DELETE FROM pessoa WHERE id = ?"
+    
     def inserir(self, funcionario):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO pessoa (nome, telefone, email, tipo) VALUES (?, ?, ?, 'Funcionario')",
-                         (funcionario.nome, funcionario.telefone, funcionario.email))
-            pessoa_id = cursor.lastrowid
-            cursor.execute("INSERT INTO funcionario (id, matricula, cargo, salario) VALUES (?, ?, ?, ?)",
-                         (pessoa_id, funcionario.matricula, funcionario.cargo, funcionario.salario))
-            conn.commit()
-            print(f"✅ Funcionário '{funcionario.nome}' cadastrado!")
+        pessoa_id = self._gravar(lambda conn: self._inserir(conn, funcionario))
+        print(f"✅ Funcionário '{funcionario.nome}' cadastrado!")
+        return pessoa_id
+    
+    def _inserir(self, conn, funcionario):
+        pessoa_id = conn.execute(self.SQL_INSERIR_PESSOA,
+                                 (funcionario.nome, funcionario.telefone, funcionario.email)).lastrowid
+        conn.execute(self.SQL_INSERIR, (pessoa_id, funcionario.matricula, funcionario.cargo, funcionario.salario))
+        return pessoa_id
+    
+    def inserir_lote(self, funcionarios, tamanho_lote=1000):
+        return self._gravar(lambda conn: self._inserir_pessoas_lote(
+            conn, "Funcionario", funcionarios, self.SQL_INSERIR,
+            lambda f: (f.matricula, f.cargo, f.salario), tamanho_lote))
+    
+    def iterar(self, apos_id=0, tamanho_lote=None, forma=None):
+        return self._paginar(self.SQL_ITERAR, apos_id=apos_id, tamanho_lote=tamanho_lote, forma=forma,
+                             metodo="iterar")
     
     def listar(self):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT p.id, p.nome, f.matricula, f.cargo, f.salario 
-                FROM pessoa p JOIN funcionario f ON p.id = f.id
-            """)
-            print("\n👷 FUNCIONÁRIOS:")
-            for f in cursor.fetchall():
-                print(f"ID: {f[0]} | Nome: {f[1]} | Matrícula: {f[2]} | Cargo: {f[3]} | Salário: R$ {f[4]:.2f}")
+        exibir_funcionarios(self.iterar())
     
     def deletar(self, id_funcionario):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM pessoa WHERE id = ?", (id_funcionario,))
-            conn.commit()
-            print("🗑️ Funcionário removido!")
+        self._gravar_comando(self.SQL_DELETAR, (id_funcionario,))
+        print("🗑️ Funcionário removido!")
 
 
 class PedidoDAO(DAO):
+    SQL_ITERAR = """
+        SELECT ped.id, ped.numero, p.nome, ped.status, ped.total, ped.qtd_itens
+        FROM pedido ped 
+        JOIN cliente c ON ped.cliente_id = c.id 
+        JOIN pessoa p ON c.id = p.id
+        WHERE ped.id > ? ORDER BY ped.id LIMIT ?
+    """
+    SQL_ITERAR_OBJETOS = """
+        SELECT id, numero, cliente_id, status, total FROM pedido
+        WHERE id > ? ORDER BY id LIMIT ?
+    """
+    SQL_CARREGAR = "SELECT id, numero, cliente_id, status, total FROM pedido WHERE id = ?"
+    # total e qtd_itens são mantidos pelos gatilhos de item_pedido (migração 2)
+    SQL_TOTAL = "SELECT total, qtd_itens FROM pedido WHERE id = ?"
+    SQL_CRIAR = "INSERT INTO pedido (numero, cliente_id) VALUES (?, ?)"
+    
     def criar(self, numero, cliente_id):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO pedido (numero, cliente_id) VALUES (?, ?)", (numero, cliente_id))
-            conn.commit()
-            print(f"✅ Pedido '{numero}' criado!")
+        pedido_id = self._gravar(lambda conn: self._criar(conn, numero, cliente_id))
+        print(f"✅ Pedido '{numero}' criado!")
+        return pedido_id
+    
+    def _criar(self, conn, numero, cliente_id):
+        return conn.execute(self.SQL_CRIAR, (numero, cliente_id)).lastrowid
+    
+    def iterar(self, apos_id=0, tamanho_lote=None, forma=None):
+        return self._paginar(self.SQL_ITERAR, apos_id=apos_id, tamanho_lote=tamanho_lote, forma=forma,
+                             metodo="iterar")
     
     def listar(self):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT ped.id, ped.numero, p.nome, ped.status 
-                FROM pedido ped 
-                JOIN cliente c ON ped.cliente_id = c.id 
-                JOIN pessoa p ON c.id = p.id
-            """)
-            print("\n📦 PEDIDOS:")
-            for p in cursor.fetchall():
-                print(f"ID: {p[0]} | Número: {p[1]} | Cliente: {p[2]} | Status: {p[3]}")
+        exibir_pedidos(self.iterar())
+    
+    def total(self, pedido_id):
+        linha = self.conectar().execute(self.SQL_TOTAL, (pedido_id,)).fetchone()
+        return None if linha is None else (round(linha[0], 2), linha[1])
+    
+    def carregar(self, pedido_id):
+        linha = self.conectar().execute(self.SQL_CARREGAR, (pedido_id,)).fetchone()
+        return None if linha is None else self._hidratar(linha, *self._carregadores())
+    
+    def iterar_objetos(self, apos_id=0, tamanho_lote=None):
+        # Hidrata pedidos em fluxo; cliente e itens só são buscados se acessados
+        carregadores = self._carregadores()
+        for linha in self._paginar(self.SQL_ITERAR_OBJETOS, apos_id=apos_id, tamanho_lote=tamanho_lote,
+                                  metodo="iterar_objetos"):
+            yield self._hidratar(linha, *carregadores)
+    
+    def _carregadores(self):
+        return ClienteDAO(self.db_name).buscar, ItemPedidoDAO(self.db_name).itens_do_pedido
+    
+    def _hidratar(self, linha, buscar_cliente, buscar_itens):
+        pedido_id, numero, cliente_id, status, total = linha
+        return Pedido(numero, pedido_id, Preguicoso(buscar_cliente, cliente_id), StatusPedido(status),
+                      Preguicoso(buscar_itens, pedido_id), total)
 
 
 class ItemPedidoDAO(DAO):
+    SQL_ITERAR_POR_PEDIDO = """
+        SELECT ip.id, r.descricao, ip.quantidade, ip.valor_unitario,
+               (ip.quantidade * ip.valor_unitario) as subtotal
+        FROM item_pedido ip
+        JOIN roupa r ON ip.roupa_id = r.id
+        WHERE ip.pedido_id = ? AND ip.id > ? ORDER BY ip.id LIMIT ?
+    """
+    SQL_ITENS_DO_PEDIDO = """
+        SELECT id, roupa_id, quantidade, valor_unitario FROM item_pedido
+        WHERE pedido_id = ? AND id > ? ORDER BY id LIMIT ?
+    """
+    SQL_BAIXAR_ESTOQUE = "UPDATE roupa SET estoque = estoque - ? WHERE id = ? AND estoque >= ?"
+    SQL_INSERIR = """
+        INSERT INTO item_pedido (pedido_id, roupa_id, quantidade, valor_unitario)
+        VALUES (?, ?, ?, ?)
+    """
+    
     def adicionar(self, pedido_id, roupa_id, quantidade):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            # Busca preço e estoque
-            cursor.execute("SELECT preco, estoque FROM roupa WHERE id = ?", (roupa_id,))
-            resultado = cursor.fetchone()
-            
-            if not resultado:
-                print("⚠️ Roupa não encontrada!")
-                return
-            
-            preco, estoque = resultado
-            
-            if estoque < quantidade:
-                print(f"⚠️ Estoque insuficiente! Disponível: {estoque}")
-                return
-            
-            # Adiciona item
-            cursor.execute("""
-                INSERT INTO item_pedido (pedido_id, roupa_id, quantidade, valor_unitario)
-                VALUES (?, ?, ?, ?)
-            """, (pedido_id, roupa_id, quantidade, preco))
-            
-            # Atualiza estoque
-            cursor.execute("UPDATE roupa SET estoque = estoque - ? WHERE id = ?", (quantidade, roupa_id))
-            conn.commit()
-            print(f"✅ Item adicionado! Subtotal: R$ {preco * quantidade:.2f}")
+        try:
+            (_, _, preco), = self.reservar(pedido_id, [(roupa_id, quantidade)])
+        except RoupaNaoEncontrada:
+            print("⚠️ Roupa não encontrada!")
+            return
+        except EstoqueInsuficiente as erro:
+            print(f"⚠️ Estoque insuficiente! Disponível: {erro.disponivel}")
+            return
+        print(f"✅ Item adicionado! Subtotal: R$ {preco * quantidade:.2f}")
+    
+    def reservar(self, pedido_id, itens):
+        # Reserva todos os itens de um pedido numa única transação IMMEDIATE:
+        # ou todos entram e baixam estoque, ou nenhum (levanta a exceção).
+        itens = list(itens)
+        cache = cache_para(self.db_name)
+        lidas = []
+        reservados = self._gravar(
+            lambda conn: self._reservar(conn, pedido_id, itens, cache, lidas))
+        # O cache só passa a refletir a baixa depois do commit
+        ids_lidos = {linha[0] for linha in lidas}
+        for linha in lidas:
+            cache.guardar(linha)
+        for roupa_id, quantidade, _ in reservados:
+            if roupa_id not in ids_lidos:
+                cache.ajustar_estoque(roupa_id, -quantidade)
+        return reservados
+    
+    def _reservar(self, conn, pedido_id, itens, cache, lidas):
+        reservados = []
+        # Ordem fixa por roupa_id para que reservas concorrentes disputem
+        # os mesmos registros sempre na mesma sequência
+        for roupa_id, quantidade in sorted(itens, key=lambda item: item[0]):
+            if quantidade <= 0:
+                raise ValueError(f"Quantidade inválida: {quantidade}")
+            # Baixa condicional: só altera a linha se ainda houver estoque,
+            # então a verificação e a baixa acontecem no mesmo comando
+            cursor = conn.execute(self.SQL_BAIXAR_ESTOQUE, (quantidade, roupa_id, quantidade))
+            # Baixa feita: o preço vem do cache, sem outra ida ao banco
+            linha = cache.obter(roupa_id) if cursor.rowcount else None
+            if linha is None:
+                linha = conn.execute(RoupaDAO.SQL_BUSCAR, (roupa_id,)).fetchone()
+                if linha is None:
+                    raise RoupaNaoEncontrada(roupa_id)
+                if cursor.rowcount == 0:
+                    raise EstoqueInsuficiente(roupa_id, quantidade, linha[6])
+                lidas.append(linha)
+            reservados.append((roupa_id, quantidade, linha[5]))
+        conn.executemany(self.SQL_INSERIR, ((pedido_id, roupa_id, quantidade, preco)
+                                            for roupa_id, quantidade, preco in reservados))
+        return reservados
+    
+    def iterar_por_pedido(self, pedido_id, apos_id=0, tamanho_lote=None, forma=None):
+        return self._paginar(self.SQL_ITERAR_POR_PEDIDO, (pedido_id,), apos_id=apos_id,
+                             tamanho_lote=tamanho_lote, forma=forma, metodo="iterar_por_pedido")
     
     def listar_por_pedido(self, pedido_id):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT r.descricao, ip.quantidade, ip.valor_unitario,
-                       (ip.quantidade * ip.valor_unitario) as subtotal
-                FROM item_pedido ip
-                JOIN roupa r ON ip.roupa_id = r.id
-                WHERE ip.pedido_id = ?
-            """, (pedido_id,))
-            print(f"\n🛒 ITENS DO PEDIDO {pedido_id}:")
-            total = 0
-            for item in cursor.fetchall():
-                print(f"{item[0]} | Qtd: {item[1]} | Valor: R$ {item[2]:.2f} | Subtotal: R$ {item[3]:.2f}")
-                total += item[3]
-            print(f"\n💰 TOTAL: R$ {total:.2f}")
+        total = PedidoDAO(self.db_name).total(pedido_id)
+        exibir_itens_pedido(pedido_id, self.iterar_por_pedido(pedido_id), total[0] if total else 0)
+    
+    def itens_do_pedido(self, pedido_id):
+        # Itens com a roupa carregada sob demanda (via cache do catálogo)
+        obter_roupa = RoupaDAO(self.db_name).obter
+        return [ItemPedido(Preguicoso(obter_roupa, roupa_id), quantidade, valor_unitario, item_id)
+                for item_id, roupa_id, quantidade, valor_unitario
+                in self._paginar(self.SQL_ITENS_DO_PEDIDO, (pedido_id,), metodo="itens_do_pedido")]
 
 
 class PagamentoDAO(DAO):
+    # Ids por comando nas transições em lote (limite de parâmetros do SQLite)
+    LOTE_TRANSICAO = 500
+    SQL_ITERAR = """
+        SELECT pag.id, ped.numero, pag.valor, pag.forma, pag.status
+        FROM pagamento pag
+        JOIN pedido ped ON pag.pedido_id = ped.id
+        WHERE pag.id > ? ORDER BY pag.id LIMIT ?
+    """
+    # Valida contra o total materializado do pedido no próprio INSERT
+    SQL_INSERIR = """
+        INSERT INTO pagamento (pedido_id, valor, forma, status)
+        SELECT id, ?, ?, 'Pendente' FROM pedido
+        WHERE id = ? AND round(total, 2) <= round(?, 2)
+    """
+    SQL_POR_PEDIDO = "SELECT id FROM pagamento WHERE pedido_id = ?"
+    
     def inserir(self, pedido_id, valor, forma):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO pagamento (pedido_id, valor, forma, status)
-                VALUES (?, ?, ?, 'Pendente')
-            """, (pedido_id, valor, forma))
-            conn.commit()
-            print(f"✅ Pagamento registrado! Forma: {forma} | Valor: R$ {valor:.2f}")
+        pagamento_id = self._gravar(lambda conn: self._inserir(conn, pedido_id, valor, forma))
+        if pagamento_id is None:
+            total = PedidoDAO(self.db_name).total(pedido_id)
+            if total is None:
+                print("⚠️ Pedido não encontrado!")
+            else:
+                print(f"⚠️ Valor insuficiente! Total do pedido: R$ {total[0]:.2f}")
+            return
+        print(f"✅ Pagamento registrado! Forma: {forma} | Valor: R$ {valor:.2f}")
+        return pagamento_id
+    
+    def _inserir(self, conn, pedido_id, valor, forma):
+        cursor = conn.execute(self.SQL_INSERIR, (valor, forma, pedido_id, valor))
+        return cursor.lastrowid if cursor.rowcount else None
     
     def confirmar(self, pedido_id):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("UPDATE pagamento SET status = 'Confirmado' WHERE pedido_id = ?", (pedido_id,))
-            cursor.execute("UPDATE pedido SET status = 'Finalizado' WHERE id = ?", (pedido_id,))
-            conn.commit()
+        linha = self.conectar().execute(self.SQL_POR_PEDIDO, (pedido_id,)).fetchone()
+        if linha is None:
+            print("⚠️ Pagamento não encontrado!")
+            return
+        resultado, = self.confirmar_lote([linha[0]])
+        if resultado.ok:
             print("✅ Pagamento confirmado e pedido finalizado!")
+        else:
+            print(f"⚠️ {resultado.motivo}")
+        return resultado
+    
+    def processar_lote(self, pagamento_ids):
+        return self._transicionar_lote(pagamento_ids, StatusPagamento.PROCESSANDO)
+    
+    def confirmar_lote(self, pagamento_ids):
+        return self._transicionar_lote(pagamento_ids, StatusPagamento.CONFIRMADO)
+    
+    def estornar_lote(self, pagamento_ids):
+        return self._transicionar_lote(pagamento_ids, StatusPagamento.ESTORNADO)
+    
+    def _transicionar_lote(self, pagamento_ids, novo):
+        # Todos os ids numa única transação IMMEDIATE; o resultado vem um por
+        # id (na ordem recebida, sem repetições)
+        pagamento_ids = list(dict.fromkeys(pagamento_ids))
+        devolvido = {}
+        resultados = self._gravar(
+            lambda conn: self._transicionar(conn, pagamento_ids, novo, devolvido))
+        # Estoque devolvido pelos estornos só entra no cache depois do commit
+        cache = cache_para(self.db_name)
+        for roupa_id, quantidade in devolvido.items():
+            cache.ajustar_estoque(roupa_id, quantidade)
+        return resultados
+    
+    def _transicionar(self, conn, pagamento_ids, novo, devolvido):
+        origens = [status.value for status in TRANSICOES_PAGAMENTO[novo]]
+        exigidos, pedido_novo = PEDIDO_NA_TRANSICAO[novo]
+        exigidos = [status.value for status in exigidos]
+        resultados = {}
+        for bloco in em_lotes(pagamento_ids, self.LOTE_TRANSICAO):
+            marcadores = ", ".join("?" * len(bloco))
+            # Atualização condicional: só muda quem está num status de origem
+            # válido e cujo pedido aceita a transição (RETURNING: SQLite 3.35+)
+            feitos = conn.execute(f"""
+                UPDATE pagamento SET status = ?
+                WHERE id IN ({marcadores})
+                  AND status IN ({", ".join("?" * len(origens))})
+                  AND EXISTS (SELECT 1 FROM pedido ped WHERE ped.id = pagamento.pedido_id
+                              AND ped.status IN ({", ".join("?" * len(exigidos))}))
+                RETURNING id, pedido_id
+            """, (novo.value, *bloco, *origens, *exigidos)).fetchall()
+            pedidos = [pedido_id for _, pedido_id in feitos]
+            if pedidos:
+                marcadores_pedidos = ", ".join("?" * len(pedidos))
+                if novo is StatusPagamento.ESTORNADO:
+                    self._devolver_estoque(conn, pedidos, marcadores_pedidos, devolvido)
+                if pedido_novo is not None:
+                    conn.execute(f"UPDATE pedido SET status = ? WHERE id IN ({marcadores_pedidos})",
+                                 (pedido_novo.value, *pedidos))
+            for pagamento_id, _ in feitos:
+                resultados[pagamento_id] = ResultadoPagamento(pagamento_id, True, novo.value, None)
+            falhas = [pagamento_id for pagamento_id in bloco if pagamento_id not in resultados]
+            if falhas:
+                resultados.update(self._motivos(conn, falhas, novo, origens))
+        return [resultados[pagamento_id] for pagamento_id in pagamento_ids]
+    
+    def _devolver_estoque(self, conn, pedidos, marcadores, devolvido):
+        quantidades = {}
+        for roupa_id, quantidade in conn.execute(
+                f"SELECT roupa_id, quantidade FROM item_pedido WHERE pedido_id IN ({marcadores})", pedidos):
+            quantidades[roupa_id] = quantidades.get(roupa_id, 0) + quantidade
+        # Uma atualização por roupa, em ordem de id, como na reserva
+        conn.executemany("UPDATE roupa SET estoque = estoque + ? WHERE id = ?",
+                         [(quantidades[roupa_id], roupa_id) for roupa_id in sorted(quantidades)])
+        for roupa_id, quantidade in quantidades.items():
+            devolvido[roupa_id] = devolvido.get(roupa_id, 0) + quantidade
+    
+    def _motivos(self, conn, falhas, novo, origens):
+        motivos = {pagamento_id: ResultadoPagamento(pagamento_id, False, None, "Pagamento não encontrado")
+                   for pagamento_id in falhas}
+        linhas = conn.execute(f"""
+            SELECT pag.id, pag.status, ped.status FROM pagamento pag
+            JOIN pedido ped ON ped.id = pag.pedido_id
+            WHERE pag.id IN ({", ".join("?" * len(falhas))})
+        """, falhas)
+        for pagamento_id, status, status_pedido in linhas:
+            if status not in origens:
+                motivo = f"Transição inválida: {status} -> {novo.value}"
+            else:
+                motivo = f"Pedido {status_pedido} não aceita pagamento {novo.value}"
+            motivos[pagamento_id] = ResultadoPagamento(pagamento_id, False, status, motivo)
+        return motivos
+    
+    def iterar(self, apos_id=0, tamanho_lote=None, forma=None):
+        return self._paginar(self.SQL_ITERAR, apos_id=apos_id, tamanho_lote=tamanho_lote, forma=forma,
+                             metodo="iterar")
+    
+    def listar(self):
+        exibir_pagamentos(self.iterar())
+
+
+class ProducaoDAO(DAO):
+    SQL_ITERAR = """
+        SELECT pr.id, ped.numero, pr.status, pr.data_inicio, pr.data_fim
+        FROM producao pr
+        JOIN pedido ped ON pr.pedido_id = ped.id
+        WHERE pr.id > ? ORDER BY pr.id LIMIT ?
+    """
+    # Pedidos em aberto com itens e ainda sem produção (migração 4)
+    SQL_DEMANDA = """
+        SELECT ped.id, ped.numero, SUM(ip.quantidade)
+        FROM pedido ped
+        JOIN item_pedido ip ON ip.pedido_id = ped.id
+        WHERE ped.status IN ('Aberto', 'Em processamento')
+          AND NOT EXISTS (SELECT 1 FROM producao pr WHERE pr.pedido_id = ped.id)
+        GROUP BY ped.id
+        ORDER BY ped.id
+    """
+    SQL_EXECUCOES = """
+        SELECT ex.id, e.tipo, p.nome, ex.inicio, ex.fim
+        FROM execucao_etapa ex
+        JOIN etapa_producao e ON ex.etapa_id = e.id
+        LEFT JOIN pessoa p ON ex.funcionario_id = p.id
+        WHERE ex.producao_id = ? AND ex.id > ? ORDER BY ex.id LIMIT ?
+    """
+    SQL_ETAPAS = "SELECT id, tipo FROM etapa_producao ORDER BY ordem, id"
+    SQL_FUNCIONARIOS = "SELECT id, cargo FROM funcionario ORDER BY id"
+    SQL_INSERIR = """
+        INSERT INTO producao (pedido_id, data_inicio, data_fim, status) VALUES (?, ?, ?, 'Planejada')
+    """
+    SQL_INSERIR_EXECUCAO = """
+        INSERT INTO execucao_etapa (producao_id, etapa_id, papel, funcionario_id, inicio, fim)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    
+    def demanda(self, conn=None):
+        return (conn or self.conectar()).execute(self.SQL_DEMANDA).fetchall()
+    
+    def etapas(self, conn=None):
+        etapas = {}
+        for etapa_id, tipo in (conn or self.conectar()).execute(self.SQL_ETAPAS):
+            etapas.setdefault(TipoEtapa(tipo), etapa_id)
+        return etapas
+    
+    def funcionarios(self, conn=None):
+        return (conn or self.conectar()).execute(self.SQL_FUNCIONARIOS).fetchall()
+    
+    def _gravar_plano(self, conn, producoes):
+        # producoes: [(pedido_id, inicio, fim, [(etapa_id, papel, funcionario_id, inicio, fim), ...])]
+        conn.executemany(self.SQL_INSERIR, ((pedido_id, inicio, fim) for pedido_id, inicio, fim, _ in producoes))
+        # ids AUTOINCREMENT de um executemany com o lock mantido são consecutivos
+        ultimo = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        ids = range(ultimo - len(producoes) + 1, ultimo + 1)
+        conn.executemany(self.SQL_INSERIR_EXECUCAO, ((producao_id, *execucao) for producao_id, (_, _, _, execucoes) in zip(ids, producoes)
+              for execucao in execucoes))
+        return list(ids)
+    
+    def iterar(self, apos_id=0, tamanho_lote=None, forma=None):
+        return self._paginar(self.SQL_ITERAR, apos_id=apos_id, tamanho_lote=tamanho_lote, forma=forma,
+                             metodo="iterar")
     
     def listar(self):
-        with self.conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT pag.id, ped.numero, pag.valor, pag.forma, pag.status
-                FROM pagamento pag
-                JOIN pedido ped ON pag.pedido_id = ped.id
-            """)
-            print("\n💳 PAGAMENTOS:")
-            for p in cursor.fetchall():
-                print(f"ID: {p[0]} | Pedido: {p[1]} | Valor: R$ {p[2]:.2f} | Forma: {p[3]} | Status: {p[4]}")
+        exibir_producoes(self.iterar())
+    
+    def iterar_execucoes(self, producao_id, apos_id=0, tamanho_lote=None, forma=None):
+        return self._paginar(self.SQL_EXECUCOES, (producao_id,), apos_id=apos_id,
+                             tamanho_lote=tamanho_lote, forma=forma, metodo="iterar_execucoes")
+
+
+# Instruções dos DAOs por nome ("RoupaDAO.BUSCAR"); construtores das que
+# trazem todas as colunas de uma classe do domínio (forma="objeto")
+INSTRUCOES = RegistroInstrucoes()
+INSTRUCOES.registrar_classe(ClienteDAO, {
+    "ITERAR": lambda linha: Cliente(linha[1], linha[2], linha[3], id=linha[0]),
+    "BUSCAR": cliente_de_linha,
+})
+INSTRUCOES.registrar_classe(RoupaDAO, {
+    "ITERAR": lambda linha: Roupa(linha[1], linha[2], linha[5], linha[6], linha[3], linha[4], linha[0]),
+    "BUSCAR": roupa_de_linha,
+    "BUSCAR_POR_CODIGO": roupa_de_linha,
+})
+INSTRUCOES.registrar_classe(FuncionarioDAO, {
+    "ITERAR": lambda linha: Funcionario(linha[1], linha[2], linha[3], linha[4], id=linha[0]),
+})
+INSTRUCOES.registrar_classe(PedidoDAO)
+INSTRUCOES.registrar_classe(ItemPedidoDAO)
+INSTRUCOES.registrar_classe(PagamentoDAO)
+INSTRUCOES.registrar_classe(ProducaoDAO)
+instrumentacao.registro = INSTRUCOES
+
+# Consultas verificadas por "python ddl_confeccao.py --planos"
+CONSULTAS_DAO = [
+    ("ClienteDAO.iterar", ClienteDAO.SQL_ITERAR, (0, DAO.tamanho_lote)),
+    ("RoupaDAO.iterar", RoupaDAO.SQL_ITERAR, (0, DAO.tamanho_lote)),
+    ("FuncionarioDAO.iterar", FuncionarioDAO.SQL_ITERAR, (0, DAO.tamanho_lote)),
+    ("PedidoDAO.iterar", PedidoDAO.SQL_ITERAR, (0, DAO.tamanho_lote)),
+    ("PedidoDAO.iterar_objetos", PedidoDAO.SQL_ITERAR_OBJETOS, (0, DAO.tamanho_lote)),
+    ("ItemPedidoDAO.itens_do_pedido", ItemPedidoDAO.SQL_ITENS_DO_PEDIDO, (1, 0, DAO.tamanho_lote)),
+    ("ClienteDAO.buscar", ClienteDAO.SQL_BUSCAR, (1,)),
+    ("ItemPedidoDAO.iterar_por_pedido", ItemPedidoDAO.SQL_ITERAR_POR_PEDIDO, (1, 0, DAO.tamanho_lote)),
+    ("PagamentoDAO.iterar", PagamentoDAO.SQL_ITERAR, (0, DAO.tamanho_lote)),
+    ("ProducaoDAO.iterar", ProducaoDAO.SQL_ITERAR, (0, DAO.tamanho_lote)),
+    ("ProducaoDAO.iterar_execucoes", ProducaoDAO.SQL_EXECUCOES, (1, 0, DAO.tamanho_lote)),
+    ("RoupaDAO.buscar", RoupaDAO.SQL_BUSCAR, (1,)),
+    ("RoupaDAO.buscar_por_codigo", RoupaDAO.SQL_BUSCAR_POR_CODIGO, ("X",)),
+    ("PagamentoDAO.confirmar (pagamento)", PagamentoDAO.SQL_POR_PEDIDO, (1,)),
+    ("PagamentoDAO.estornar_lote (itens)",
+     "SELECT roupa_id, quantidade FROM item_pedido WHERE pedido_id IN (?, ?)", (1, 2)),
+    ("RoupaDAO.deletar (verificação de FK)", "SELECT 1 FROM item_pedido WHERE roupa_id = ?", (1,)),
+    ("ClienteDAO (pedidos do cliente)", "SELECT id FROM pedido WHERE cliente_id = ?", (1,)),
+]
+
+
+# =======================================================
+# APRESENTAÇÃO (consome os geradores dos DAOs)
+# =======================================================
+
+def exibir_clientes(linhas):
+    print("\n📋 CLIENTES:")
+    for c in linhas:
+        print(f"ID: {c[0]} | Nome: {c[1]} | CPF: {c[2]} | Endereço: {c[3]}")
+
+
+def exibir_roupas(linhas):
+    print("\n👕 ROUPAS:")
+    for r in linhas:
+        print(f"ID: {r[0]} | Código: {r[1]} | {r[2]} | R$ {r[3]:.2f} | Estoque: {r[4]}")
+
+
+def exibir_funcionarios(linhas):
+    print("\n👷 FUNCIONÁRIOS:")
+    for f in linhas:
+        print(f"ID: {f[0]} | Nome: {f[1]} | Matrícula: {f[2]} | Cargo: {f[3]} | Salário: R$ {f[4]:.2f}")
+
+
+def exibir_pedidos(linhas):
+    print("\n📦 PEDIDOS:")
+    for p in linhas:
+        print(f"ID: {p[0]} | Número: {p[1]} | Cliente: {p[2]} | Status: {p[3]} | "
+              f"Itens: {p[5]} | Total: R$ {p[4]:.2f}")
+
+
+def exibir_itens_pedido(pedido_id, linhas, total):
+    print(f"\n🛒 ITENS DO PEDIDO {pedido_id}:")
+    for item in linhas:
+        print(f"{item[1]} | Qtd: {item[2]} | Valor: R$ {item[3]:.2f} | Subtotal: R$ {item[4]:.2f}")
+    print(f"\n💰 TOTAL: R$ {total:.2f}")
+
+
+def exibir_pagamentos(linhas):
+    print("\n💳 PAGAMENTOS:")
+    for p in linhas:
+        print(f"ID: {p[0]} | Pedido: {p[1]} | Valor: R$ {p[2]:.2f} | Forma: {p[3]} | Status: {p[4]}")
+
+
+def exibir_producoes(linhas):
+    print("\n🏭 PRODUÇÕES:")
+    for p in linhas:
+        print(f"ID: {p[0]} | Pedido: {p[1]} | Status: {p[2]} | Início: {p[3]} | Fim: {p[4]}")
 
 
 # =======================================================
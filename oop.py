@@ -1,6 +1,8 @@
 
 
 class Pessoa:
+    __slots__ = ("nome", "telefone", "email")
+
     def __init__(self, nome, telefone=None, email=None):
         self.nome = nome
         self.telefone = telefone
@@ -14,6 +16,8 @@ class Pessoa:
 
 
 class Cliente(Pessoa):
+    __slots__ = ("cpf", "endereco")
+
     def __init__(self, nome, cpf=None, endereco=None, telefone=None, email=None):
         super().__init__(nome, telefone, email)
         self.cpf = cpf
@@ -24,6 +28,8 @@ class Cliente(Pessoa):
 
 
 class Funcionario(Pessoa):
+    __slots__ = ("matricula", "cargo", "salario")
+
     def __init__(self, nome, matricula=None, cargo=None, salario=0.0):
         super().__init__(nome)
         self.matricula = matricula
@@ -35,6 +41,8 @@ class Funcionario(Pessoa):
 
 
 class Roupa:
+    __slots__ = ("codigo", "descricao", "tamanho", "cor", "preco", "estoque")
+
     def __init__(self, codigo, descricao, tamanho, cor, preco, estoque):
         self.codigo = codigo
         self.descricao = descricao
@@ -51,6 +59,8 @@ class Roupa:
 
 
 class ItemPedido:
+    __slots__ = ("roupa", "quantidade", "valor_unitario")
+
     def __init__(self, roupa, quantidade):
         self.roupa = roupa
         self.quantidade = int(quantidade)
@@ -61,6 +71,8 @@ class ItemPedido:
 
 
 class Pagamento:
+    __slots__ = ("valor", "forma", "status")
+
     def __init__(self, valor, forma):
         self.valor = float(valor)
         self.forma = forma 
@@ -79,6 +91,8 @@ class Pagamento:
 
 
 class Pedido:
+    __slots__ = ("numero", "cliente", "itens", "status", "pagamento")
+
     def __init__(self, numero, cliente):
         self.numero = numero
         self.cliente = cliente
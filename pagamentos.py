@@ -0,0 +1,89 @@
+# =======================================================
+# CONCILIAÇÃO DE PAGAMENTOS EM LOTE
+# =======================================================
+#
+# Processa, confirma ou estorna uma lista de pagamentos (ids) numa única
+# transação, usando as transições em lote do PagamentoDAO: cada id só
+# muda se o status atual do pagamento e do pedido permitirem
+# (TRANSICOES_PAGAMENTO / PEDIDO_NA_TRANSICAO em main.py), o estorno
+# cancela o pedido e devolve o estoque, e cada id tem o seu resultado.
+# Os ids vêm da linha de comando ou de um arquivo (um por linha, "-"
+# para a entrada padrão; linhas em branco e "#" são ignoradas).
+#
+#   python pagamentos.py confirmar 10 11 12
+#   python pagamentos.py estornar --arquivo estornos.txt
+#   python pagamentos.py confirmar --arquivo - < liquidados_do_dia.txt
+
+import argparse
+import sys
+import time
+
+from main import PagamentoDAO
+
+
+def ler_ids(arquivo):
+    for numero, linha in enumerate(arquivo, 1):
+        linha = linha.strip()
+        if not linha or linha.startswith("#"):
+            continue
+        try:
+            yield int(linha.split(",")[0])
+        except ValueError:
+            raise ValueError(f"Linha {numero}: id inválido '{linha}'") from None
+
+
+def conciliar(db_name, acao, pagamento_ids):
+    dao = PagamentoDAO(db_name)
+    operacao = {
+        "processar": dao.processar_lote,
+        "confirmar": dao.confirmar_lote,
+        "estornar": dao.estornar_lote,
+    }[acao]
+    t0 = time.perf_counter()
+    resultados = operacao(pagamento_ids)
+    return resultados, time.perf_counter() - t0
+
+
+def exibir_resultados(acao, resultados, duracao, limite_falhas=50):
+    falhas = [r for r in resultados if not r.ok]
+    for r in falhas[:limite_falhas]:
+        print(f"⚠️ Pagamento {r.pagamento_id}: {r.motivo}")
+    if len(falhas) > limite_falhas:
+        print(f"⚠️ ... e mais {len(falhas) - limite_falhas} falhas")
+    ritmo = len(resultados) / duracao if duracao else 0
+    print(f"✅ {acao.capitalize()}: {len(resultados) - len(falhas)} de {len(resultados)} pagamentos | "
+          f"Falhas: {len(falhas)} | {duracao * 1000:.1f} ms ({ritmo:,.0f}/s)")
+
+
+# =======================================================
+# EXECUÇÃO COMO SCRIPT
+# =======================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Processa, confirma ou estorna pagamentos em lote")
+    parser.add_argument("acao", choices=["processar", "confirmar", "estornar"])
+    parser.add_argument("ids", nargs="*", type=int, help="ids dos pagamentos")
+    parser.add_argument("--arquivo", help="arquivo com um id por linha ('-' para a entrada padrão)")
+    parser.add_argument("--db", default="confeccao.db")
+    args = parser.parse_args(argv)
+
+    pagamento_ids = list(args.ids)
+    try:
+        if args.arquivo == "-":
+            pagamento_ids.extend(ler_ids(sys.stdin))
+        elif args.arquivo:
+            with open(args.arquivo, encoding="utf-8") as arquivo:
+                pagamento_ids.extend(ler_ids(arquivo))
+    except (OSError, ValueError) as erro:
+        print(f"⚠️ {erro}")
+        return
+    if not pagamento_ids:
+        print("⚠️ Nenhum pagamento informado.")
+        return
+
+    resultados, duracao = conciliar(args.db, args.acao, pagamento_ids)
+    exibir_resultados(args.acao, resultados, duracao)
+
+
+if __name__ == "__main__":
+    main()
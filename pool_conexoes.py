@@ -0,0 +1,250 @@
+# =======================================================
+# POOL DE CONEXÕES SQLITE
+# =======================================================
+#
+# Mantém conexões abertas e reaproveitadas entre chamadas dos DAOs.
+# Cada thread fica presa à mesma conexão enquanto estiver viva
+# (afinidade por thread); conexões de threads encerradas voltam
+# para o pool e são reaproveitadas por outras threads.
+#
+# Regra de dimensionamento: "tamanho" é o número máximo de threads
+# VIVAS que já usaram o banco, ociosas ou não. Uma thread parada
+# continua segurando a sua conexão, então com tamanho=N a thread N+1
+# recebe PoolEsgotado mesmo que as outras não estejam fazendo nada.
+# Threads de longa duração que ficam ociosas devem chamar
+# pool.liberar() ao terminar cada bloco de trabalho.
+
+import os
+import sqlite3
+import threading
+import time
+
+# =======================================================
+# PERFIS DE DESEMPENHO
+# =======================================================
+# PRAGMAs aplicados em toda conexão recém-aberta. Ambos usam WAL,
+# que deixa leitores e um escritor trabalharem ao mesmo tempo, e
+# busy_timeout, que faz o SQLite esperar o lock em vez de falhar
+# com "database is locked".
+#   seguro     -> synchronous=FULL: nenhum commit se perde em queda de energia
+#   throughput -> synchronous=NORMAL + cache/mmap maiores: o último commit
+#                 pode se perder numa queda do SO, mas o banco nunca corrompe
+
+PERFIS = {
+    "seguro": {
+        "pragmas": {
+            "foreign_keys": "ON",
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "busy_timeout": 5000,
+        },
+        "intervalo_checkpoint": 60.0,
+    },
+    "throughput": {
+        "pragmas": {
+            "foreign_keys": "ON",
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 10000,
+            "cache_size": -64000,
+            "mmap_size": 268435456,
+            "temp_store": "MEMORY",
+            "wal_autocheckpoint": 4000,
+        },
+        "intervalo_checkpoint": 15.0,
+    },
+}
+
+PERFIL_PADRAO = "seguro"
+
+# Mesmo teto do ThreadPoolExecutor padrão, de onde vem a maioria das
+# threads que usam os DAOs: cada worker vivo precisa da sua conexão
+TAMANHO_PADRAO = min(32, (os.cpu_count() or 1) + 4)
+
+
+def aplicar_perfil(conn, perfil=PERFIL_PADRAO, pragmas=None):
+    if perfil not in PERFIS:
+        raise ValueError(f"Perfil desconhecido: {perfil} (use {', '.join(PERFIS)})")
+    for nome, valor in {**PERFIS[perfil]["pragmas"], **(pragmas or {})}.items():
+        conn.execute(f"PRAGMA {nome} = {valor}").fetchall()
+
+
+class PoolEsgotado(Exception):
+    pass
+
+
+class PoolConexoes:
+    def __init__(self, db_name, tamanho=TAMANHO_PADRAO, perfil=PERFIL_PADRAO, pragmas=None, timeout=5.0,
+                 intervalo_verificacao=30.0, intervalo_checkpoint=None, cached_statements=128):
+        if tamanho < 1:
+            raise ValueError("O pool precisa de pelo menos uma conexão")
+        if perfil not in PERFIS:
+            raise ValueError(f"Perfil desconhecido: {perfil} (use {', '.join(PERFIS)})")
+        self.db_name = db_name
+        self.tamanho = tamanho
+        self.perfil = perfil
+        self.pragmas = pragmas
+        self.timeout = timeout
+        # Instruções compiladas guardadas por conexão (cache LRU do sqlite3)
+        self.cached_statements = cached_statements
+        self.intervalo_verificacao = intervalo_verificacao
+        if intervalo_checkpoint is None:
+            intervalo_checkpoint = PERFIS[perfil]["intervalo_checkpoint"]
+        self.intervalo_checkpoint = intervalo_checkpoint
+        self._ultimo_checkpoint = time.monotonic()
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._livres = []
+        self._donos = {}
+        self._verificado_em = {}
+        self._fechado = False
+        self._pid = os.getpid()
+
+    # ---------------------------------------------------
+    # Empréstimo e devolução
+    # ---------------------------------------------------
+
+    def obter(self):
+        if self._pid != os.getpid():
+            self._reiniciar_apos_fork()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            if not self._fechado and self._saudavel(conn):
+                self._talvez_checkpoint(conn)
+                return conn
+            self._descartar(conn)
+            self._local.conn = None
+
+        while True:
+            conn = self._reservar()
+            if self._saudavel(conn):
+                self._local.conn = conn
+                return conn
+            self._descartar(conn)
+
+    def liberar(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._cond:
+            self._donos.pop(conn, None)
+            if self._fechado:
+                conn.close()
+                return
+            if conn.in_transaction:
+                conn.rollback()
+            self._livres.append(conn)
+            self._cond.notify()
+
+    def fechar(self):
+        with self._cond:
+            self._fechado = True
+            for conn in list(self._donos) + self._livres:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._donos.clear()
+            self._livres.clear()
+            self._verificado_em.clear()
+            self._cond.notify_all()
+
+    def estatisticas(self):
+        with self._cond:
+            return {
+                "tamanho": self.tamanho,
+                "em_uso": len(self._donos),
+                "livres": len(self._livres),
+            }
+
+    # ---------------------------------------------------
+    # Internos
+    # ---------------------------------------------------
+
+    def _reservar(self):
+        limite = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._fechado:
+                    raise PoolEsgotado(f"Pool de '{self.db_name}' já foi fechado")
+                if self._livres:
+                    conn = self._livres.pop()
+                elif len(self._donos) < self.tamanho:
+                    conn = self._abrir()
+                else:
+                    self._recuperar_orfas()
+                    if self._livres:
+                        continue
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise PoolEsgotado(
+                            f"Nenhuma conexão livre em '{self.db_name}' após {self.timeout}s: "
+                            f"{self.tamanho} threads vivas já seguram uma conexão cada "
+                            f"(aumente 'tamanho' ou chame liberar() nas threads ociosas)"
+                        )
+                    # Acorda periodicamente para recolher conexões de threads mortas
+                    self._cond.wait(min(restante, 0.05))
+                    continue
+                self._donos[conn] = threading.current_thread()
+                return conn
+
+    def _abrir(self):
+        conn = sqlite3.connect(self.db_name, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=self.cached_statements,
+                               uri=self.db_name.startswith("file:"))
+        aplicar_perfil(conn, self.perfil, self.pragmas)
+        self._verificado_em[conn] = time.monotonic()
+        return conn
+
+    def _talvez_checkpoint(self, conn):
+        # Checkpoint PASSIVE periódico: copia o WAL para o banco sem
+        # bloquear ninguém, evitando que o arquivo -wal cresça sem limite
+        # quando sempre há algum leitor ativo.
+        agora = time.monotonic()
+        if agora - self._ultimo_checkpoint < self.intervalo_checkpoint or conn.in_transaction:
+            return
+        self._ultimo_checkpoint = agora
+        try:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+        except sqlite3.OperationalError:
+            pass
+
+    def _reiniciar_apos_fork(self):
+        # Conexões SQLite não podem atravessar um fork: o processo filho
+        # abandona as herdadas do pai (sem fechá-las) e abre as suas.
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._livres = []
+        self._donos = {}
+        self._verificado_em = {}
+
+    def _recuperar_orfas(self):
+        for conn, thread in list(self._donos.items()):
+            if not thread.is_alive():
+                del self._donos[conn]
+                if conn.in_transaction:
+                    conn.rollback()
+                self._livres.append(conn)
+
+    def _saudavel(self, conn):
+        agora = time.monotonic()
+        if agora - self._verificado_em.get(conn, 0.0) < self.intervalo_verificacao:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+        self._verificado_em[conn] = agora
+        return True
+
+    def _descartar(self, conn):
+        with self._cond:
+            self._donos.pop(conn, None)
+            self._verificado_em.pop(conn, None)
+            self._cond.notify()
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
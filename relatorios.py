@@ -0,0 +1,222 @@
+# =======================================================
+# RELATÓRIOS DE VENDAS E ESTOQUE
+# =======================================================
+#
+# As agregações rodam no SQLite (GROUP BY / funções de janela) sobre
+# os índices de data e o total materializado de pedido; o que sobra
+# (giro de estoque, cobertura, alertas) é calculado em colunas, com
+# NumPy quando instalado e com array.array + laços simples quando não.
+#
+#   python relatorios.py receita --inicio 2025-01-01 --fim 2025-02-01 --por dia
+#   python relatorios.py formas --inicio 2025-01-01 --fim 2025-02-01
+#   python relatorios.py top --por tamanho --limite 5
+#   python relatorios.py giro --dias 30
+#   python relatorios.py alertas --dias 30 --cobertura 7
+
+import argparse
+from array import array
+from datetime import date, timedelta
+
+from main import DAO, StatusPagamento, StatusPedido
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FORMATOS_PERIODO = {
+    "dia": "%Y-%m-%d",
+    "semana": "%Y-W%W",
+    "mes": "%Y-%m",
+    "ano": "%Y",
+}
+AGRUPAMENTOS_SKU = ("tamanho", "cor")
+# Valores de --por aceitos por relatório
+POR_RELATORIO = {
+    "receita": tuple(FORMATOS_PERIODO),
+    "top": AGRUPAMENTOS_SKU,
+}
+# Só conta como venda o pedido pago: PagamentoDAO.confirmar finaliza o
+# pedido e confirma o pagamento (pedidos em aberto ainda podem não pagar)
+PEDIDO_VENDIDO = StatusPedido.FINALIZADO.value
+PAGAMENTO_RECEBIDO = StatusPagamento.CONFIRMADO.value
+
+
+# =======================================================
+# COLUNAS
+# =======================================================
+
+def colunas(cursor, tipos, tamanho_lote=10_000):
+    # Lê o resultado em blocos direto para vetores tipados, uma coluna
+    # por vetor ("q" inteiro, "d" real, None objeto Python)
+    vetores = [array(t) if t else [] for t in tipos]
+    while True:
+        linhas = cursor.fetchmany(tamanho_lote)
+        if not linhas:
+            break
+        for vetor, valores in zip(vetores, zip(*linhas)):
+            vetor.extend(valores)
+    if np is not None:
+        return [np.frombuffer(v, dtype="i8" if v.typecode == "q" else "f8") if isinstance(v, array)
+                else np.array(v, dtype=object) for v in vetores]
+    return vetores
+
+
+def _dividir(numeradores, denominadores):
+    if np is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(denominadores > 0, numeradores / np.maximum(denominadores, 1e-12), 0.0)
+    return array("d", (n / d if d > 0 else 0.0 for n, d in zip(numeradores, denominadores)))
+
+
+def _somar(a, b):
+    if np is not None:
+        return a + b
+    return array("d", (x + y for x, y in zip(a, b)))
+
+
+def _escalar(vetor, fator):
+    if np is not None:
+        return vetor * fator
+    return array("d", (x * fator for x in vetor))
+
+
+# =======================================================
+# RELATÓRIOS
+# =======================================================
+
+class Relatorios(DAO):
+    def receita_por_periodo(self, inicio, fim, por="dia"):
+        if por not in FORMATOS_PERIODO:
+            raise ValueError(f"Período desconhecido: {por} (use {', '.join(FORMATOS_PERIODO)})")
+        formato = FORMATOS_PERIODO[por]
+        return self.conectar().execute(f"""
+            SELECT strftime('{formato}', data_pedido) AS periodo,
+                   COUNT(*) AS pedidos, SUM(qtd_itens) AS itens, ROUND(SUM(total), 2) AS receita
+            FROM pedido
+            WHERE data_pedido >= ? AND data_pedido < ? AND status = ?
+            GROUP BY periodo ORDER BY periodo
+        """, (inicio, fim, PEDIDO_VENDIDO)).fetchall()
+
+    def receita_por_forma(self, inicio, fim):
+        return self.conectar().execute("""
+            SELECT forma, COUNT(*) AS pagamentos, ROUND(SUM(valor), 2) AS valor
+            FROM pagamento
+            WHERE data_pagamento >= ? AND data_pagamento < ? AND status = ?
+            GROUP BY forma ORDER BY valor DESC
+        """, (inicio, fim, PAGAMENTO_RECEBIDO)).fetchall()
+
+    def top_skus(self, inicio, fim, por=None, limite=10):
+        # Ranking por unidades vendidas; com "por" (tamanho ou cor) o
+        # ranking é feito dentro de cada grupo com ROW_NUMBER()
+        if por is not None and por not in AGRUPAMENTOS_SKU:
+            raise ValueError(f"Agrupamento desconhecido: {por} (use {', '.join(AGRUPAMENTOS_SKU)})")
+        particao = f"PARTITION BY r.{por}" if por else ""
+        grupo = f"r.{por}" if por else "NULL"
+        return self.conectar().execute(f"""
+            SELECT grupo, codigo, descricao, unidades, receita FROM (
+                SELECT {grupo} AS grupo, r.codigo, r.descricao,
+                       SUM(ip.quantidade) AS unidades,
+                       ROUND(SUM(ip.quantidade * ip.valor_unitario), 2) AS receita,
+                       ROW_NUMBER() OVER ({particao} ORDER BY SUM(ip.quantidade) DESC) AS posicao
+                FROM pedido ped
+                JOIN item_pedido ip ON ip.pedido_id = ped.id
+                JOIN roupa r ON r.id = ip.roupa_id
+                WHERE ped.data_pedido >= ? AND ped.data_pedido < ? AND ped.status = ?
+                GROUP BY r.id
+            )
+            WHERE posicao <= ?
+            ORDER BY grupo, unidades DESC
+        """, (inicio, fim, PEDIDO_VENDIDO, limite)).fetchall()
+
+    def _vendas_por_sku(self, dias, hoje=None):
+        hoje = hoje or date.today()
+        inicio = (hoje - timedelta(days=dias)).isoformat()
+        cursor = self.conectar().execute("""
+            SELECT r.id, r.codigo, r.estoque, COALESCE(v.unidades, 0)
+            FROM roupa r
+            LEFT JOIN (
+                SELECT ip.roupa_id, SUM(ip.quantidade) AS unidades
+                FROM pedido ped JOIN item_pedido ip ON ip.pedido_id = ped.id
+                WHERE ped.data_pedido >= ? AND ped.status = ?
+                GROUP BY ip.roupa_id
+            ) v ON v.roupa_id = r.id
+            ORDER BY r.id
+        """, (inicio, PEDIDO_VENDIDO))
+        return colunas(cursor, ("q", None, "q", "q"))
+
+    def giro_estoque(self, dias=30, hoje=None):
+        # Giro = unidades vendidas / estoque médio no período, com o estoque
+        # inicial estimado como estoque atual + vendido no período
+        ids, codigos, estoque, vendidos = self._vendas_por_sku(dias, hoje)
+        medio = _escalar(_somar(estoque, _somar(estoque, vendidos)), 0.5)
+        giro = _dividir(vendidos, medio)
+        cobertura = _dividir(_escalar(estoque, dias), vendidos)
+        return [(int(i), c, int(e), int(v), round(float(g), 3), round(float(d), 1) if v else None)
+                for i, c, e, v, g, d in zip(ids, codigos, estoque, vendidos, giro, cobertura)]
+
+    def alertas_estoque_baixo(self, dias=30, cobertura_minima=7, estoque_minimo=0, hoje=None):
+        # Alerta quando o estoque cobre menos que "cobertura_minima" dias no
+        # ritmo de vendas do período, ou está no mínimo absoluto
+        ids, codigos, estoque, vendidos = self._vendas_por_sku(dias, hoje)
+        cobertura = _dividir(_escalar(estoque, dias), vendidos)
+        alertas = []
+        for i, c, e, v, d in zip(ids, codigos, estoque, vendidos, cobertura):
+            if e <= estoque_minimo or (v and d < cobertura_minima):
+                alertas.append((int(i), c, int(e), int(v), round(float(d), 1) if v else None))
+        return sorted(alertas, key=lambda alerta: (alerta[4] is not None, alerta[4] or 0))
+
+
+# =======================================================
+# EXECUÇÃO COMO SCRIPT
+# =======================================================
+
+def main(argv=None):
+    hoje = date.today()
+    parser = argparse.ArgumentParser(description="Relatórios de vendas e estoque")
+    parser.add_argument("relatorio", choices=["receita", "formas", "top", "giro", "alertas"])
+    parser.add_argument("--db", default="confeccao.db")
+    parser.add_argument("--inicio", default=(hoje - timedelta(days=30)).isoformat())
+    parser.add_argument("--fim", default=(hoje + timedelta(days=1)).isoformat())
+    parser.add_argument("--por", default=None,
+                        help="receita: " + ", ".join(POR_RELATORIO["receita"]) +
+                             " | top: " + ", ".join(POR_RELATORIO["top"]))
+    parser.add_argument("--limite", type=int, default=10)
+    parser.add_argument("--dias", type=int, default=30)
+    parser.add_argument("--cobertura", type=float, default=7)
+    args = parser.parse_args(argv)
+    if args.por is not None and args.por not in POR_RELATORIO.get(args.relatorio, ()):
+        aceitos = POR_RELATORIO.get(args.relatorio)
+        parser.error(f"--por {args.por} não vale para '{args.relatorio}'"
+                     + (f" (use {', '.join(aceitos)})" if aceitos else ""))
+    relatorios = Relatorios(args.db)
+
+    if args.relatorio == "receita":
+        print(f"\n💰 RECEITA POR {(args.por or 'dia').upper()}:")
+        for periodo, pedidos, itens, receita in relatorios.receita_por_periodo(args.inicio, args.fim, args.por or "dia"):
+            print(f"{periodo} | Pedidos: {pedidos} | Itens: {itens} | Receita: R$ {receita:.2f}")
+    elif args.relatorio == "formas":
+        print("\n💳 RECEITA POR FORMA DE PAGAMENTO:")
+        for forma, pagamentos, valor in relatorios.receita_por_forma(args.inicio, args.fim):
+            print(f"{forma} | Pagamentos: {pagamentos} | Valor: R$ {valor:.2f}")
+    elif args.relatorio == "top":
+        print(f"\n🏆 SKUs MAIS VENDIDOS{' POR ' + args.por.upper() if args.por else ''}:")
+        for grupo, codigo, descricao, unidades, receita in relatorios.top_skus(
+                args.inicio, args.fim, args.por, args.limite):
+            prefixo = f"[{grupo}] " if args.por else ""
+            print(f"{prefixo}{codigo} | {descricao} | Unidades: {unidades} | Receita: R$ {receita:.2f}")
+    elif args.relatorio == "giro":
+        print(f"\n🔄 GIRO DE ESTOQUE ({args.dias} dias):")
+        for _, codigo, estoque, vendidos, giro, cobertura in relatorios.giro_estoque(args.dias):
+            dias = f"{cobertura} dias" if cobertura is not None else "sem vendas"
+            print(f"{codigo} | Estoque: {estoque} | Vendidos: {vendidos} | Giro: {giro} | Cobertura: {dias}")
+    else:
+        print(f"\n🚨 ESTOQUE BAIXO (cobertura < {args.cobertura} dias):")
+        for _, codigo, estoque, vendidos, cobertura in relatorios.alertas_estoque_baixo(
+                args.dias, args.cobertura):
+            dias = f"{cobertura} dias" if cobertura is not None else "-"
+            print(f"{codigo} | Estoque: {estoque} | Vendidos: {vendidos} | Cobertura: {dias}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# =======================================================
+# SESSÃO (MAPA DE IDENTIDADE + UNIDADE DE TRABALHO)
+# =======================================================
+#
+# Liga os objetos do domínio aos DAOs: dentro de uma sessão existe uma
+# única instância de Roupa/Cliente por id, os pedidos são alterados só
+# em memória (Pedido.adicionar_item/remover_item, atualizar_status...)
+# e commit() grava todas as diferenças numa única transação, com um
+# número fixo de comandos (executemany) qualquer que seja o número de
+# itens.
+#
+#   with Sessao() as sessao:
+#       pedido = sessao.novo_pedido("PED-1", sessao.obter_cliente(1))
+#       pedido.adicionar_item(ItemPedido(sessao.obter_roupa(3), 2))
+#   # saiu do with sem erro -> commit(); com erro -> rollback()
+
+from cache_roupa import cache_para
+from main import (
+    ClienteDAO, EstoqueInsuficiente, ItemPedido, ItemPedidoDAO, Pedido, PedidoDAO,
+    Preguicoso, RoupaDAO, RoupaNaoEncontrada, StatusPedido, em_lotes,
+)
+
+
+class Sessao:
+    def __init__(self, db_name="confeccao.db"):
+        self.db_name = db_name
+        self._roupa_dao = RoupaDAO(db_name)
+        self._cliente_dao = ClienteDAO(db_name)
+        self._pedido_dao = PedidoDAO(db_name)
+        self._item_dao = ItemPedidoDAO(db_name)
+        # Mapas de identidade
+        self._roupas = {}
+        self._clientes = {}
+        self._pedidos = {}
+        self._novos = []
+        # Estado carregado do banco, usado para descobrir o que mudou
+        self._estoque_original = {}
+        self._contato_original = {}
+        self._status_original = {}
+        self._itens_originais = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, erro, traceback):
+        if tipo is not None:
+            self.rollback()
+            return False
+        try:
+            self.commit()
+        except Exception:
+            self.rollback()
+            raise
+        return False
+
+    # ---------------------------------------------------
+    # Carga (sempre pelo mapa de identidade)
+    # ---------------------------------------------------
+
+    def obter_roupa(self, roupa_id):
+        roupa = self._roupas.get(roupa_id)
+        if roupa is None:
+            roupa = self._roupa_dao.obter(roupa_id)
+            if roupa is None:
+                raise RoupaNaoEncontrada(roupa_id)
+            self._roupas[roupa_id] = roupa
+            self._estoque_original[roupa_id] = roupa.estoque
+        return roupa
+
+    def obter_cliente(self, cliente_id):
+        cliente = self._clientes.get(cliente_id)
+        if cliente is None:
+            cliente = self._cliente_dao.buscar(cliente_id)
+            if cliente is None:
+                return None
+            self._clientes[cliente_id] = cliente
+            self._contato_original[cliente_id] = (cliente.telefone, cliente.email)
+        return cliente
+
+    def obter_pedido(self, pedido_id):
+        pedido = self._pedidos.get(pedido_id)
+        if pedido is None:
+            linha = self._pedido_dao.conectar().execute(PedidoDAO.SQL_CARREGAR, (pedido_id,)).fetchone()
+            if linha is None:
+                return None
+            _, numero, cliente_id, status, total = linha
+            pedido = Pedido(numero, pedido_id, Preguicoso(self.obter_cliente, cliente_id),
+                            StatusPedido(status), Preguicoso(self._carregar_itens, pedido_id), total)
+            self._pedidos[pedido_id] = pedido
+            self._status_original[pedido] = pedido.status
+        return pedido
+
+    def novo_pedido(self, numero, cliente):
+        # pedido.cliente_id é NOT NULL: sem um cliente já gravado o erro
+        # só apareceria no flush, longe de quem criou o pedido
+        if cliente is None or cliente.id is None:
+            raise ValueError(f"Pedido {numero} precisa de um cliente já gravado (use obter_cliente)")
+        pedido = Pedido(numero, None, cliente)
+        self._novos.append(pedido)
+        return pedido
+
+    def _carregar_itens(self, pedido_id):
+        itens = [ItemPedido(Preguicoso(self.obter_roupa, roupa_id), quantidade, valor_unitario, item_id)
+                 for item_id, roupa_id, quantidade, valor_unitario
+                 in self._item_dao._paginar(ItemPedidoDAO.SQL_ITENS_DO_PEDIDO, (pedido_id,))]
+        self._itens_originais[self._pedidos[pedido_id]] = list(itens)
+        return itens
+
+    # ---------------------------------------------------
+    # Unidade de trabalho
+    # ---------------------------------------------------
+
+    def pendencias(self):
+        novos_itens = []
+        removidos = []
+        for pedido in self._novos + list(self._pedidos.values()):
+            if type(pedido._itens) is Preguicoso:
+                continue
+            originais = self._itens_originais.get(pedido, [])
+            atuais = {id(item) for item in pedido._itens}
+            removidos.extend(item.id for item in originais if id(item) not in atuais)
+            novos_itens.extend((pedido, item) for item in pedido._itens if item.id is None)
+        return {
+            "pedidos": list(self._novos),
+            "status": [(pedido.status.value, pedido.id) for pedido, original in self._status_original.items()
+                       if pedido.status != original],
+            "itens_removidos": removidos,
+            "itens_novos": novos_itens,
+            "estoque": {roupa_id: self._roupas[roupa_id].estoque - original
+                        for roupa_id, original in self._estoque_original.items()
+                        if self._roupas[roupa_id].estoque != original},
+            "contatos": [(cliente.telefone, cliente.email, cliente_id)
+                         for cliente_id, cliente in self._clientes.items()
+                         if (cliente.telefone, cliente.email) != self._contato_original[cliente_id]],
+        }
+
+    def commit(self):
+        mudancas = self.pendencias()
+        if not any(mudancas.values()):
+            return mudancas
+        self._pedido_dao._gravar(lambda conn: self._gravar(conn, mudancas))
+        self._marcar_limpo(mudancas)
+        return mudancas
+
+    def rollback(self):
+        # Desfaz em memória o que não foi gravado
+        for roupa_id, original in self._estoque_original.items():
+            self._roupas[roupa_id].estoque = original
+        for cliente_id, (telefone, email) in self._contato_original.items():
+            self._clientes[cliente_id].telefone = telefone
+            self._clientes[cliente_id].email = email
+        for pedido, original in self._status_original.items():
+            pedido.status = original
+        for pedido, originais in self._itens_originais.items():
+            pedido.itens = list(originais)
+        self._novos.clear()
+
+    def _gravar(self, conn, mudancas):
+        # Com o lock de escrita (BEGIN IMMEDIATE) já obtido, a checagem de
+        # estoque e as baixas não podem ser intercaladas por outra conexão
+        estoque = mudancas["estoque"]
+        for bloco in em_lotes(estoque, 500):
+            marcadores = ", ".join("?" * len(bloco))
+            atuais = dict(conn.execute(f"SELECT id, estoque FROM roupa WHERE id IN ({marcadores})", bloco))
+            for roupa_id in bloco:
+                if roupa_id not in atuais:
+                    raise RoupaNaoEncontrada(roupa_id)
+                if atuais[roupa_id] + estoque[roupa_id] < 0:
+                    raise EstoqueInsuficiente(roupa_id, -estoque[roupa_id], atuais[roupa_id])
+        conn.executemany("UPDATE roupa SET estoque = estoque + ? WHERE id = ?",
+                         ((delta, roupa_id) for roupa_id, delta in estoque.items()))
+
+        pedidos = mudancas["pedidos"]
+        if pedidos:
+            conn.executemany("INSERT INTO pedido (numero, cliente_id, status) VALUES (?, ?, ?)",
+                             ((p.numero, p.cliente.id, p.status.value) for p in pedidos))
+            self._atribuir_ids(conn, pedidos)
+        conn.executemany("UPDATE pedido SET status = ? WHERE id = ?", mudancas["status"])
+        conn.executemany("DELETE FROM item_pedido WHERE id = ?", ((i,) for i in mudancas["itens_removidos"]))
+
+        novos_itens = mudancas["itens_novos"]
+        if novos_itens:
+            conn.executemany("""
+                INSERT INTO item_pedido (pedido_id, roupa_id, quantidade, valor_unitario)
+                VALUES (?, ?, ?, ?)
+            """, ((p.id, item.roupa.id, item.quantidade, item.valor_unitario) for p, item in novos_itens))
+            self._atribuir_ids(conn, [item for _, item in novos_itens])
+        conn.executemany("UPDATE pessoa SET telefone = ?, email = ? WHERE id = ?", mudancas["contatos"])
+
+    def _atribuir_ids(self, conn, objetos):
+        # ids AUTOINCREMENT de um executemany com o lock mantido são consecutivos
+        ultimo = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        for novo_id, objeto in zip(range(ultimo - len(objetos) + 1, ultimo + 1), objetos):
+            objeto.id = novo_id
+
+    def _marcar_limpo(self, mudancas):
+        cache = cache_para(self.db_name)
+        for roupa_id, delta in mudancas["estoque"].items():
+            cache.ajustar_estoque(roupa_id, delta)
+            self._estoque_original[roupa_id] = self._roupas[roupa_id].estoque
+        for _, _, cliente_id in mudancas["contatos"]:
+            cliente = self._clientes[cliente_id]
+            self._contato_original[cliente_id] = (cliente.telefone, cliente.email)
+        for pedido in self._novos:
+            self._pedidos[pedido.id] = pedido
+        self._novos.clear()
+        for pedido in self._pedidos.values():
+            self._status_original[pedido] = pedido.status
+            if type(pedido._itens) is not Preguicoso:
+                self._itens_originais[pedido] = list(pedido._itens)
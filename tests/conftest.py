@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ddl_confeccao import banco_temporario  # noqa: E402
+from main import DAO  # noqa: E402
+
+
+@pytest.fixture
+def banco(tmp_path):
+    # Banco novo por teste, já migrado; os pools são fechados no fim
+    db = banco_temporario(str(tmp_path))
+    yield db
+    DAO.fechar_pools()
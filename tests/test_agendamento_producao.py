@@ -0,0 +1,57 @@
+import sqlite3
+
+from agendamento_producao import ETAPAS, Tarefa, agendar, equipes_por_cargo, planejar
+from main import Cliente, ClienteDAO, Funcionario, FuncionarioDAO, ItemPedidoDAO, PedidoDAO, Roupa, RoupaDAO
+
+FUNCIONARIOS = [(1, "Costura e acabamento"), (2, "Corte"), (3, "Bordado"), (4, "Inspeção")]
+
+
+def sobreposicoes(intervalos_por_funcionario):
+    conflitos = []
+    for funcionario_id, intervalos in intervalos_por_funcionario.items():
+        intervalos = sorted(intervalos)
+        for (inicio_a, fim_a), (inicio_b, fim_b) in zip(intervalos, intervalos[1:]):
+            if inicio_b < fim_a:
+                conflitos.append((funcionario_id, (inicio_a, fim_a), (inicio_b, fim_b)))
+    return conflitos
+
+
+def test_funcionario_de_varias_etapas_nao_tem_operacoes_sobrepostas():
+    tarefas = [Tarefa(pedido_id, f"PED{pedido_id}", 20) for pedido_id in range(6)]
+    operacoes = agendar(tarefas, equipes_por_cargo(FUNCIONARIOS))
+    por_funcionario = {}
+    for op in operacoes:
+        por_funcionario.setdefault(op.funcionario_id, []).append((op.inicio, op.fim))
+    assert sobreposicoes(por_funcionario) == []
+
+
+def test_etapas_de_cada_pedido_seguem_a_ordem_do_fluxo():
+    tarefas = [Tarefa(pedido_id, f"PED{pedido_id}", 5 + pedido_id) for pedido_id in range(8)]
+    operacoes = agendar(tarefas, equipes_por_cargo(FUNCIONARIOS + [(5, "Costureira"), (6, "Cortador")]))
+    assert len(operacoes) == len(tarefas) * len(ETAPAS)
+    for tarefa in tarefas:
+        ops = [op for op in operacoes if op.pedido_id == tarefa.pedido_id]
+        assert [op.etapa for op in ops] == ETAPAS
+        for anterior, seguinte in zip(ops, ops[1:]):
+            assert seguinte.inicio >= anterior.fim
+
+
+def test_plano_gravado_nao_sobrepoe_funcionario(banco):
+    for funcionario_id, cargo in FUNCIONARIOS:
+        FuncionarioDAO(banco).inserir(Funcionario(f"Func {funcionario_id}", f"M{funcionario_id}", cargo, 2000))
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "111", "Rua A"))
+    roupa_id = RoupaDAO(banco).inserir(Roupa("CAM-1", "Camisa", "M", "Azul", 50.0, 1000))
+    for numero in range(6):
+        pedido_id = PedidoDAO(banco).criar(f"PED{numero}", cliente_id)
+        ItemPedidoDAO(banco).reservar(pedido_id, [(roupa_id, 20)])
+
+    _, _, operacoes, _ = planejar(banco)
+
+    assert len(operacoes) == 6 * len(ETAPAS)
+    conn = sqlite3.connect(banco)
+    por_funcionario = {}
+    for funcionario_id, inicio, fim in conn.execute(
+            "SELECT funcionario_id, inicio, fim FROM execucao_etapa WHERE producao_id IS NOT NULL"):
+        por_funcionario.setdefault(funcionario_id, []).append((inicio, fim))
+    conn.close()
+    assert sobreposicoes(por_funcionario) == []
@@ -0,0 +1,97 @@
+import sqlite3
+
+from arquivamento import Arquivamento
+from main import Cliente, ClienteDAO, FormaPagamento, ItemPedidoDAO, PagamentoDAO, PedidoDAO, Roupa, RoupaDAO
+
+
+def preparar(banco):
+    # 6 pedidos pagos: 4 em 2024 (arquiváveis) e 2 em 2025; mais um
+    # pedido aberto de 2024, que fica no principal
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    roupa_id = RoupaDAO(banco).inserir(Roupa("R1", "Camisa", "M", "Azul", 10.0, 100))
+    datas = ["2024-01-10", "2024-01-20", "2024-02-05", "2024-03-15", "2025-01-10", "2025-02-01", "2024-02-10"]
+    ids = []
+    for numero, data in enumerate(datas):
+        pedido_id = PedidoDAO(banco).criar(f"PED-{numero}", cliente_id)
+        ItemPedidoDAO(banco).reservar(pedido_id, [(roupa_id, 1)])
+        if numero < 6:
+            PagamentoDAO(banco).inserir(pedido_id, 10.0, FormaPagamento.PIX.value)
+            PagamentoDAO(banco).confirmar(pedido_id)
+        ids.append(pedido_id)
+    with sqlite3.connect(banco) as conn:
+        conn.executemany("UPDATE pedido SET data_pedido = ? WHERE id = ?", zip(datas, ids))
+        conn.executemany("UPDATE pagamento SET data_pagamento = ? WHERE pedido_id = ?", zip(datas, ids))
+    return ids
+
+
+def contar(banco, tabela):
+    with sqlite3.connect(banco) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+
+
+def test_arquivar_e_consultar_atraves_da_fronteira(banco, tmp_path):
+    ids = preparar(banco)
+    arquivamento = Arquivamento(banco, str(tmp_path / "arquivo"))
+    resumo = arquivamento.arquivar("2025-01-01", "mes", tamanho_lote=2)
+    assert resumo["pedidos"] == 4
+    assert resumo["periodos"] == {"2024-01": 2, "2024-02": 1, "2024-03": 1}
+    assert contar(banco, "pedido") == 3
+    assert contar(banco, "item_pedido") == 3
+    assert contar(banco, "pagamento") == 2
+
+    pedidos = arquivamento.pedidos("2024-01-01", "2026-01-01")
+    assert [linha[0] for linha in pedidos] == [ids[0], ids[1], ids[2], ids[6], ids[3], ids[4], ids[5]]
+    assert [linha[7] for linha in pedidos].count("principal") == 3
+    assert len(arquivamento.pagamentos("2024-01-01", "2026-01-01")) == 6
+    receita = arquivamento.receita_por_periodo("2024-01-01", "2026-01-01", "ano")
+    assert receita == [("2024", 4, 4, 40.0), ("2025", 2, 2, 20.0)]
+    assert [item[1] for item in arquivamento.itens_do_pedido(ids[0])] == ["Camisa"]
+
+    # Rodar de novo não move nem duplica nada
+    assert arquivamento.arquivar("2025-01-01")["pedidos"] == 0
+    assert len(arquivamento.pedidos("2024-01-01", "2026-01-01")) == 7
+
+
+def test_falha_na_remocao_nao_perde_nem_duplica_pedidos(banco, tmp_path):
+    ids = preparar(banco)
+    arquivamento = Arquivamento(banco, str(tmp_path / "arquivo"))
+    # A cópia é gravada, a remoção falha: tudo continua no principal e
+    # as consultas não mostram o pedido duas vezes
+    with sqlite3.connect(banco) as conn:
+        conn.execute("""
+            CREATE TRIGGER falha_remocao BEFORE DELETE ON pedido
+            BEGIN SELECT RAISE(ABORT, 'falha simulada'); END
+        """)
+    try:
+        arquivamento.arquivar("2025-01-01")
+    except sqlite3.IntegrityError:
+        pass
+    else:
+        raise AssertionError("o arquivamento deveria ter falhado")
+    assert contar(banco, "pedido") == len(ids)
+    assert contar(str(next((tmp_path / "arquivo").glob("*.db"))), "pedido") > 0
+    assert len(arquivamento.pedidos("2024-01-01", "2026-01-01")) == len(ids)
+
+    # A próxima execução termina o serviço
+    with sqlite3.connect(banco) as conn:
+        conn.execute("DROP TRIGGER falha_remocao")
+    assert arquivamento.arquivar("2025-01-01")["pedidos"] == 4
+    assert len(arquivamento.pedidos("2024-01-01", "2026-01-01")) == len(ids)
+    assert [linha[2] for linha in arquivamento.arquivos()] == [2, 1, 1]
+
+
+def test_pedido_diferente_da_copia_fica_no_principal(banco, tmp_path, monkeypatch):
+    ids = preparar(banco)
+    arquivamento = Arquivamento(banco, str(tmp_path / "arquivo"))
+    copiar = Arquivamento._copiar
+
+    def copiar_e_alterar(self, conn, apelido, periodo, caminho, lote):
+        copiar(self, conn, apelido, periodo, caminho, lote)
+        if ids[0] in lote:
+            conn.execute("UPDATE main.pedido SET total = total + 1 WHERE id = ?", (ids[0],))
+
+    monkeypatch.setattr(Arquivamento, "_copiar", copiar_e_alterar)
+    resumo = arquivamento.arquivar("2025-01-01")
+    assert (resumo["pedidos"], resumo["alterados"]) == (3, 1)
+    assert contar(banco, "pedido") == 4
+    assert len(arquivamento.pedidos("2024-01-01", "2026-01-01")) == len(ids)
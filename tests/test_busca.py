@@ -0,0 +1,55 @@
+import sqlite3
+
+from busca import Busca, expressao_busca
+from main import Cliente, ClienteDAO, Roupa, RoupaDAO
+
+
+def test_expressao_busca_vira_prefixos_entre_aspas():
+    assert expressao_busca("cami azu") == '"cami"* "azu"*'
+    # Operadores do FTS5 viram termos comuns, sem erro de sintaxe
+    assert expressao_busca('azul OR NEAR(x) cor:preto ^a* "b') == \
+        '"azul"* "OR"* "NEAR"* "x"* "cor"* "preto"* "a"* "b"*'
+    assert expressao_busca("123.456.789-00") == '"12345678900"*'
+    assert expressao_busca(" *** ") == ""
+
+
+def test_roupas_por_relevancia_prefixo_e_acento(banco):
+    dao = RoupaDAO(banco)
+    na_cor = dao.inserir(Roupa("CAM-1", "Camiseta básica", "M", "Azul", 30.0, 5))
+    no_codigo = dao.inserir(Roupa("AZUL-7", "Camiseta básica", "M", "Preto", 30.0, 5))
+    calca = dao.inserir(Roupa("CAL-1", "Calça jeans", "40", "Azul", 90.0, 5))
+    busca = Busca(banco)
+
+    # Acerto no código pesa mais que na cor
+    assert [r[0] for r in busca.roupas("azul")][:1] == [no_codigo]
+    assert {r[0] for r in busca.roupas("azu")} == {na_cor, no_codigo, calca}
+    assert [r[0] for r in busca.roupas("calca AZ")] == [calca]
+    assert {r[0] for r in busca.roupas("cami azu")} == {na_cor, no_codigo}
+    assert busca.roupas("camiseta OR calca") == []
+    assert busca.roupas("***") == []
+    assert busca.contar_roupas("azu") == 3
+    assert busca.contar_roupas("") == 0
+
+    paginas = [busca.roupas("azu", pagina=p, por_pagina=2) for p in (1, 2, 3)]
+    assert [len(p) for p in paginas] == [2, 1, 0]
+    assert {r[0] for p in paginas for r in p} == {na_cor, no_codigo, calca}
+
+
+def test_indices_acompanham_as_tabelas(banco):
+    dao = RoupaDAO(banco)
+    roupa_id = dao.inserir(Roupa("VES-1", "Vestido longo", "P", "Verde", 120.0, 2))
+    conn = sqlite3.connect(banco)
+    conn.execute("UPDATE roupa SET descricao = 'Saia midi' WHERE id = ?", (roupa_id,))
+    conn.commit()
+    conn.close()
+    busca = Busca(banco)
+    assert busca.roupas("vestido") == []
+    assert [r[0] for r in busca.roupas("saia")] == [roupa_id]
+    dao.deletar(roupa_id)
+    assert busca.roupas("saia") == []
+
+    maria = ClienteDAO(banco).inserir(Cliente("Maria José", "123.456.789-00", "Rua A"))
+    ClienteDAO(banco).inserir(Cliente("Mário Silva", "987.654.321-00", "Rua B"))
+    assert [c[0] for c in busca.clientes("jose 123.456")] == [maria]
+    assert [c[0] for c in busca.clientes("12345678900")] == [maria]
+    assert busca.contar_clientes("mar") == 2
@@ -0,0 +1,78 @@
+import sqlite3
+
+import pytest
+
+import cache_roupa
+from cache_roupa import CacheRoupa, cache_para
+from main import Cliente, ClienteDAO, EstoqueInsuficiente, ItemPedidoDAO, PedidoDAO, Roupa, RoupaDAO
+
+
+def linha(roupa_id, estoque=5):
+    return (roupa_id, f"R{roupa_id}", "Peça", "M", "Azul", 10.0, estoque)
+
+
+def test_lru_despeja_a_menos_usada():
+    cache = CacheRoupa(capacidade=2)
+    cache.guardar(linha(1))
+    cache.guardar(linha(2))
+    assert cache.obter(1) == linha(1)
+    cache.guardar(linha(3))
+    assert cache.obter(2) is None
+    assert cache.obter_por_codigo("R2") is None
+    assert cache.obter_por_codigo("R1") == linha(1)
+    assert cache.estatisticas()["despejos"] == 1
+
+
+def test_ttl_expira_a_linha(monkeypatch):
+    relogio = [100.0]
+    monkeypatch.setattr(cache_roupa.time, "monotonic", lambda: relogio[0])
+    cache = CacheRoupa(ttl=10.0)
+    cache.guardar(linha(1))
+    relogio[0] = 109.0
+    assert cache.obter(1) == linha(1)
+    relogio[0] = 111.0
+    assert cache.obter(1) is None
+    assert cache.obter_por_codigo("R1") is None
+    assert cache.estatisticas()["expirados"] == 1
+
+
+def test_ajustar_estoque_e_invalidar_por_codigo():
+    cache = CacheRoupa()
+    cache.guardar(linha(1, estoque=5))
+    cache.ajustar_estoque(1, -2)
+    cache.ajustar_estoque(99, -2)
+    assert cache.obter(1)[cache_roupa.ESTOQUE] == 3
+    cache.invalidar(codigo="R1")
+    assert cache.obter(1) is None
+
+
+def test_dao_le_pelo_cache_e_acompanha_as_escritas(banco):
+    roupas = RoupaDAO(banco)
+    roupa_id = roupas.inserir(Roupa("CAM-1", "Camisa", "M", "Azul", 50.0, 5))
+    cache = cache_para(banco)
+    cache.limpar()
+
+    assert roupas.buscar(roupa_id)[6] == 5
+    conn = sqlite3.connect(banco)
+    conn.execute("UPDATE roupa SET descricao = 'Alterada por fora' WHERE id = ?", (roupa_id,))
+    conn.commit()
+    conn.close()
+    # Read-through: a segunda leitura não vai ao banco
+    assert roupas.buscar(roupa_id)[2] == "Camisa"
+    assert roupas.buscar_por_codigo("CAM-1")[0] == roupa_id
+    assert cache.estatisticas()["acertos"] >= 2
+
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    pedido_id = PedidoDAO(banco).criar("PED-1", cliente_id)
+    ItemPedidoDAO(banco).reservar(pedido_id, [(roupa_id, 2)])
+    assert roupas.buscar(roupa_id)[6] == 3
+    # Reserva recusada não mexe no estoque em cache
+    with pytest.raises(EstoqueInsuficiente):
+        ItemPedidoDAO(banco).reservar(pedido_id, [(roupa_id, 10)])
+    assert roupas.buscar(roupa_id)[6] == 3
+
+    avulsa = roupas.inserir(Roupa("CAL-1", "Calça", "G", "Preta", 80.0, 1))
+    assert cache.obter(avulsa) is not None
+    roupas.deletar(avulsa)
+    assert cache.obter(avulsa) is None
+    assert roupas.buscar(avulsa) is None
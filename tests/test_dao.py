@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+import time
+
+import escrita_agrupada
+import importacao
+from main import Cliente, ClienteDAO, Funcionario, FuncionarioDAO, ItemPedido, Roupa, RoupaDAO
+from sessao import Sessao
+
+
+def test_inserir_lote_devolve_ids_na_ordem(banco):
+    clientes = [Cliente(f"Cliente {i}", f"{i:011d}", "Rua") for i in range(25)]
+    ids = ClienteDAO(banco).inserir_lote(clientes, tamanho_lote=10)
+    assert [c.cpf for c in map(ClienteDAO(banco).buscar, ids)] == [c.cpf for c in clientes]
+    funcionarios = [Funcionario(f"Func {i}", f"M{i}", "Costureira", 1500.0) for i in range(7)]
+    assert len(FuncionarioDAO(banco).inserir_lote(funcionarios, tamanho_lote=3)) == 7
+    roupas = [Roupa(f"R{i}", f"Peça {i}", "M", "Azul", 10.0, 1) for i in range(12)]
+    assert RoupaDAO(banco).inserir_lote(roupas, tamanho_lote=5) == 12
+
+
+def test_inserir_lote_passa_pela_escrita_agrupada(banco):
+    escritor = escrita_agrupada.ativar(banco)
+    try:
+        ids = ClienteDAO(banco).inserir_lote([Cliente("Ana", "1", "Rua"), Cliente("Bia", "2", "Rua")])
+        RoupaDAO(banco).inserir_lote([Roupa("R1", "Camisa", "M", "Azul", 10.0, 1)])
+        assert escritor.estatisticas()["operacoes"] == 2
+    finally:
+        escrita_agrupada.desativar(banco)
+    assert len(ids) == 2
+
+
+def test_inserir_lote_espera_outro_escritor(banco):
+    # Outro processo segura o lock de escrita por um tempo: o lote espera
+    # e grava tudo, em vez de falhar no meio
+    dao = RoupaDAO(banco)
+    dao.conectar()
+    outro = sqlite3.connect(banco, isolation_level=None, check_same_thread=False)
+    outro.execute("BEGIN IMMEDIATE")
+    liberar = threading.Timer(0.2, lambda: outro.execute("COMMIT"))
+    liberar.start()
+    inicio = time.perf_counter()
+    total = dao.inserir_lote([Roupa(f"R{i}", "Peça", "M", "Azul", 10.0, 1) for i in range(50)])
+    liberar.join()
+    outro.close()
+    assert total == 50
+    assert time.perf_counter() - inicio >= 0.15
+
+
+def test_escritas_avulsas_tambem_passam_pela_escrita_agrupada(banco):
+    escritor = escrita_agrupada.ativar(banco)
+    try:
+        cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+        roupa_id = RoupaDAO(banco).inserir(Roupa("R1", "Camisa", "M", "Azul", 10.0, 5))
+        funcionario_id = FuncionarioDAO(banco).inserir(Funcionario("Bia", "M1", "Corte", 1500.0))
+        with Sessao(banco) as sessao:
+            pedido = sessao.novo_pedido("PED-1", sessao.obter_cliente(cliente_id))
+            pedido.adicionar_item(ItemPedido(sessao.obter_roupa(roupa_id), 2))
+        importacao.gravar_pedidos(banco, [(("PED-2", cliente_id, "Aberto", None), [(roupa_id, None, 1, 10.0)])])
+        FuncionarioDAO(banco).deletar(funcionario_id)
+        RoupaDAO(banco).deletar(RoupaDAO(banco).inserir(Roupa("R2", "Calça", "G", "Preta", 20.0, 1)))
+        assert escritor.estatisticas()["operacoes"] == 8
+    finally:
+        escrita_agrupada.desativar(banco)
+    assert pedido.id is not None
+    assert RoupaDAO(banco).obter(roupa_id).estoque == 3
+    assert ClienteDAO(banco).buscar(cliente_id).nome == "Ana"
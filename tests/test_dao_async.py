@@ -0,0 +1,24 @@
+import asyncio
+
+from dao_async import AsyncClienteDAO, ExecutorDAO
+from main import DAO, Cliente, ClienteDAO
+
+
+def test_listar_sem_limite_devolve_uma_pagina(banco, monkeypatch):
+    monkeypatch.setattr(DAO, "tamanho_lote", 50)
+    ClienteDAO(banco).inserir_lote([Cliente(f"Cliente {i}", f"{i:011d}", "Rua") for i in range(120)])
+
+    async def cenario():
+        async with ExecutorDAO(banco) as executor:
+            clientes = AsyncClienteDAO(banco, executor)
+            primeira = await clientes.listar()
+            seguinte = await clientes.listar(apos_id=primeira[-1][0], limite=30)
+            paginas = [pagina async for pagina in clientes.paginas()]
+            return primeira, seguinte, paginas
+
+    primeira, seguinte, paginas = asyncio.run(cenario())
+
+    assert len(primeira) == 50
+    assert [linha[0] for linha in seguinte] == list(range(51, 81))
+    assert [len(pagina) for pagina in paginas] == [50, 50, 20]
+    assert [linha[0] for pagina in paginas for linha in pagina] == list(range(1, 121))
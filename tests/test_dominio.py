@@ -0,0 +1,62 @@
+import pytest
+
+from main import (
+    Cliente, ClienteDAO, EtapaProducao, ExecucaoEtapa, Funcionario, ItemPedido, ItemPedidoDAO, Pagamento, Pedido,
+    PedidoDAO, Preguicoso, Producao, Roupa, RoupaDAO,
+)
+
+
+def contador(valor):
+    chamadas = []
+
+    def carregar(chave):
+        chamadas.append(chave)
+        return valor
+    return carregar, chamadas
+
+
+@pytest.mark.parametrize("classe", [Cliente, Funcionario, Roupa, Pedido, ItemPedido, Pagamento, Producao,
+                                    EtapaProducao, ExecucaoEtapa, Preguicoso])
+def test_classes_do_dominio_sem_dict(classe):
+    assert all("__dict__" not in vars(base) for base in classe.__mro__ if base is not object)
+
+
+def test_relacionamentos_carregados_no_primeiro_acesso_uma_vez():
+    roupa = Roupa("R1", "Camisa", "M", "Azul", 10.0, 5)
+    carregar_cliente, clientes = contador(Cliente("Ana", "1", "Rua"))
+    carregar_itens, itens = contador([ItemPedido(roupa, 2), ItemPedido(roupa, 1)])
+    pedido = Pedido("PED-1", 7, Preguicoso(carregar_cliente, 3), itens=Preguicoso(carregar_itens, 7), total=30.0)
+
+    # Com o total vindo do banco, nada precisa ser carregado
+    assert pedido.calcular_total() == 30.0
+    assert (clientes, itens) == ([], [])
+    assert pedido.cliente.nome == "Ana"
+    assert pedido.cliente.nome == "Ana"
+    assert clientes == [3]
+    assert len(pedido.itens) == 2
+    assert len(pedido.itens) == 2
+    assert itens == [7]
+
+    # Sem total conhecido, o total sai dos itens carregados
+    carregar_itens, itens = contador([ItemPedido(roupa, 4)])
+    sem_total = Pedido("PED-2", 8, itens=Preguicoso(carregar_itens, 8))
+    assert itens == []
+    assert sem_total.calcular_total() == 40.0
+    assert itens == [8]
+
+
+def test_pedido_do_banco_vem_preguicoso(banco):
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    roupa_id = RoupaDAO(banco).inserir(Roupa("R1", "Camisa", "M", "Azul", 25.0, 5))
+    pedido_id = PedidoDAO(banco).criar("PED-1", cliente_id)
+    ItemPedidoDAO(banco).reservar(pedido_id, [(roupa_id, 2)])
+
+    pedido = PedidoDAO(banco).carregar(pedido_id)
+    assert type(pedido._cliente) is Preguicoso
+    assert type(pedido._itens) is Preguicoso
+    assert pedido.calcular_total() == 50.0
+    assert type(pedido._itens) is Preguicoso
+    assert pedido.cliente.nome == "Ana"
+    item, = pedido.itens
+    assert type(item._roupa) is Preguicoso
+    assert (item.roupa.codigo, item.quantidade, item.calcular_subtotal()) == ("R1", 2, 50.0)
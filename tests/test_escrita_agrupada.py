@@ -0,0 +1,77 @@
+import sqlite3
+import threading
+
+import pytest
+
+import escrita_agrupada
+from cache_roupa import cache_para
+from main import Cliente, ClienteDAO, EstoqueInsuficiente, ItemPedidoDAO, PedidoDAO, Roupa, RoupaDAO
+
+
+@pytest.fixture
+def escritor(banco):
+    escritor = escrita_agrupada.ativar(banco, max_latencia=0.2)
+    yield escritor
+    escrita_agrupada.desativar(banco)
+
+
+def test_falha_de_uma_operacao_nao_derruba_o_grupo(banco, escritor):
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    roupa_id = RoupaDAO(banco).inserir(Roupa("R1", "Camisa", "M", "Azul", 10.0, 3))
+    pedido_id = PedidoDAO(banco).criar("PED-1", cliente_id)
+    grupos_antes = escritor.estatisticas()["grupos"]
+
+    def falhar(conn):
+        conn.execute("INSERT INTO item_pedido (pedido_id, roupa_id, quantidade, valor_unitario) "
+                     "VALUES (?, ?, 1, 1.0)", (pedido_id, roupa_id))
+        raise RuntimeError("falha simulada")
+
+    def reservar(conn):
+        return ItemPedidoDAO(banco)._reservar(conn, pedido_id, [(roupa_id, 2)], cache_para(banco), [])
+
+    # Enviadas juntas, caem no mesmo grupo (mesma transação)
+    futuros = [
+        escritor.enviar(reservar),
+        escritor.enviar(falhar),
+        escritor.enviar(reservar),
+        escritor.enviar(lambda conn: PedidoDAO(banco)._criar(conn, "PED-2", cliente_id)),
+        escritor.enviar(lambda conn: PedidoDAO(banco)._criar(conn, "PED-2", cliente_id)),
+    ]
+    assert futuros[0].result() == [(roupa_id, 2, 10.0)]
+    with pytest.raises(RuntimeError):
+        futuros[1].result()
+    with pytest.raises(EstoqueInsuficiente):
+        futuros[2].result()
+    assert futuros[3].result() is not None
+    with pytest.raises(sqlite3.IntegrityError):
+        futuros[4].result()
+
+    estatisticas = escritor.estatisticas()
+    assert estatisticas["grupos"] == grupos_antes + 1
+    assert estatisticas["falhas"] == 3
+    with sqlite3.connect(banco) as conn:
+        assert conn.execute("SELECT estoque FROM roupa").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM item_pedido").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM pedido").fetchone()[0] == 2
+
+
+def test_daos_em_varias_threads_passam_pelo_escritor(banco, escritor):
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    roupa_id = RoupaDAO(banco).inserir(Roupa("R1", "Camisa", "M", "Azul", 10.0, 5))
+    pedido_id = PedidoDAO(banco).criar("PED-1", cliente_id)
+    resultados = []
+
+    def reservar():
+        try:
+            resultados.append(ItemPedidoDAO(banco).reservar(pedido_id, [(roupa_id, 1)]))
+        except EstoqueInsuficiente as erro:
+            resultados.append(erro)
+
+    threads = [threading.Thread(target=reservar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(not isinstance(r, EstoqueInsuficiente) for r in resultados) == 5
+    assert RoupaDAO(banco).obter(roupa_id).estoque == 0
+    assert escritor.estatisticas()["operacoes"] >= 8
@@ -0,0 +1,53 @@
+import random
+from collections import Counter
+
+import pytest
+
+from gerador_carga import MIX_PADRAO, Zipf, gerar_carga, ler_mix, resumir
+from main import Cliente, ClienteDAO, Roupa, RoupaDAO
+
+
+def test_ler_mix_por_nome_e_por_numero_do_menu():
+    assert ler_mix(None) == MIX_PADRAO
+    mix = ler_mix(" adicionar_item=40, 6=10 ,,listar_pagamentos=0")
+    assert mix["adicionar_item"] == 40.0
+    assert mix["listar_roupas"] == 10.0
+    assert mix["listar_pagamentos"] == 0.0
+    assert mix["criar_pedido"] == MIX_PADRAO["criar_pedido"]
+
+
+@pytest.mark.parametrize("texto", ["vender=3", "14=1", ",".join(f"{nome}=0" for nome in MIX_PADRAO)])
+def test_ler_mix_invalido(texto):
+    with pytest.raises(ValueError):
+        ler_mix(texto)
+
+
+def test_zipf_concentra_nos_primeiros_e_repete_a_ordem():
+    valores = list(range(100))
+    zipf = Zipf(valores, s=1.1, semente=7)
+    assert zipf.valores == Zipf(valores, s=1.1, semente=7).valores
+    assert sorted(zipf.valores) == valores
+
+    rnd = random.Random(1)
+    contagem = Counter(zipf.sortear(rnd) for _ in range(20_000))
+    assert set(contagem) <= set(valores)
+    assert contagem.most_common(1)[0][0] == zipf.valores[0]
+    # P(1º) = 1 / H(100, 1.1) ~ 0.22; os 10 primeiros levam ~60%
+    assert 0.18 < contagem[zipf.valores[0]] / 20_000 < 0.26
+    assert sum(contagem[v] for v in zipf.valores[:10]) / 20_000 > 0.5
+
+    uniforme = Zipf(valores, s=0, semente=7)
+    contagem = Counter(uniforme.sortear(rnd) for _ in range(20_000))
+    assert max(contagem.values()) / 20_000 < 0.02
+
+
+def test_gerar_carga_curta_sem_erros(banco):
+    ClienteDAO(banco).inserir_lote([Cliente(f"Cliente {i}", f"{i:011d}", "Rua") for i in range(5)])
+    RoupaDAO(banco).inserir_lote([Roupa(f"R{i}", f"Peça {i}", "M", "Azul", 10.0, 1000) for i in range(5)])
+    config = {"db": banco, "modo": "threads", "trabalhadores": 2, "duracao": 0.3, "taxa": 0.0,
+              "mix": ler_mix(None), "zipf": 1.1, "perfil": "seguro", "escrita_agrupada": False,
+              "semente": 3}
+    resumo = resumir(gerar_carga(config), config)
+    assert resumo["ops"] > 0
+    assert resumo["taxa_erros"] == 0.0
+    assert "adicionar_item" in resumo["operacoes"]
@@ -0,0 +1,78 @@
+import io
+import json
+import sqlite3
+
+from importacao import importar
+
+
+def escrever(caminho, linhas):
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return str(caminho)
+
+
+def contar(banco, tabela):
+    conn = sqlite3.connect(banco)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_jsonl_malformado_rejeita_so_a_linha(banco, tmp_path):
+    caminho = escrever(tmp_path / "roupas.jsonl", [
+        json.dumps({"codigo": "A1", "descricao": "Camisa", "preco": 10, "estoque": 5}),
+        '{"codigo": "A2", "descricao": "Calça", "preco": ',
+        "[1, 2, 3]",
+        json.dumps({"codigo": "A3", "descricao": "Saia", "preco": [9.9]}),
+        json.dumps({"codigo": {"x": 1}, "descricao": "Blusa", "preco": 5}),
+        json.dumps({"codigo": "A5", "descricao": "Short", "preco": "12,50", "estoque": "3"}),
+    ])
+    rejeitados = io.StringIO()
+
+    relatorio = importar(banco, "roupa", caminho, rejeitados=rejeitados, progresso=0)
+
+    assert (relatorio.lidos, relatorio.gravados, relatorio.rejeitados) == (6, 2, 4)
+    assert contar(banco, "roupa") == 2
+    linhas = [json.loads(linha) for linha in rejeitados.getvalue().splitlines()]
+    assert [linha["linha"] for linha in linhas] == [2, 3, 4, 5]
+    assert "JSON inválido" in linhas[0]["motivo"]
+    assert linhas[0]["registro"] == '{"codigo": "A2", "descricao": "Calça", "preco": '
+
+
+def test_csv_rejeita_linha_invalida_e_duplicada(banco, tmp_path):
+    caminho = escrever(tmp_path / "roupas.csv", [
+        "codigo,descricao,preco,estoque",
+        "B1,Camisa,10,5",
+        "B2,Calça,-3,1",
+        "B3,Saia,abc,1",
+        "B1,Repetida,10,1",
+        "B4,Short,7.5,",
+    ])
+
+    relatorio = importar(banco, "roupa", caminho, progresso=0)
+
+    assert (relatorio.gravados, relatorio.rejeitados) == (2, 3)
+    assert contar(banco, "roupa") == 2
+
+
+def test_pedido_jsonl_com_itens_invalidos(banco, tmp_path):
+    importar(banco, "roupa", escrever(tmp_path / "r.jsonl", [
+        json.dumps({"codigo": "C1", "descricao": "Camisa", "preco": 10}),
+    ]), progresso=0)
+    importar(banco, "cliente", escrever(tmp_path / "c.jsonl", [json.dumps({"nome": "Ana"})]), progresso=0)
+    caminho = escrever(tmp_path / "pedidos.jsonl", [
+        json.dumps({"numero": "P1", "cliente_id": 1, "status": "Finalizado",
+                    "itens": [{"roupa_codigo": "C1", "quantidade": 2, "valor_unitario": 10}]}),
+        json.dumps({"numero": "P2", "cliente_id": 1, "itens": "C1"}),
+        json.dumps({"numero": "P3", "cliente_id": 1, "itens": [{"roupa_codigo": "X", "quantidade": 1,
+                                                               "valor_unitario": 1}]}),
+        json.dumps({"numero": "P4", "cliente_id": 1, "itens": [{"roupa_codigo": "C1", "quantidade": 0,
+                                                               "valor_unitario": 1}]}),
+        "nao é json",
+    ])
+
+    relatorio = importar(banco, "pedido", caminho, progresso=0)
+
+    assert (relatorio.gravados, relatorio.rejeitados) == (1, 4)
+    assert contar(banco, "pedido") == 1
+    assert contar(banco, "item_pedido") == 1
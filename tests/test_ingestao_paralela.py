@@ -0,0 +1,35 @@
+import json
+import sqlite3
+
+from ddl_confeccao import banco_temporario
+from ingestao_paralela import main
+from main import Cliente, ClienteDAO, Roupa, RoupaDAO
+
+
+def test_ingestao_pula_linhas_invalidas_em_caminho_com_caracteres_de_uri(tmp_path, capsys):
+    # "?", "#" e "%" no caminho não podem mudar o arquivo aberto pelos trabalhadores
+    pasta = tmp_path / "lote?1#a%20b"
+    pasta.mkdir()
+    banco = banco_temporario(str(pasta))
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    roupa_id = RoupaDAO(banco).inserir(Roupa("R1", "Camisa", "M", "Azul", 10.0, 5))
+    arquivo = tmp_path / "pedidos.jsonl"
+    linhas = [
+        json.dumps({"numero": "MKT-1", "cliente_id": cliente_id,
+                    "itens": [{"roupa_id": roupa_id, "quantidade": 2}, {"roupa_id": 999, "quantidade": 1}]}),
+        "{quebrado",
+        json.dumps({"cliente_id": cliente_id, "itens": []}),
+        json.dumps({"numero": "MKT-2", "itens": []}),
+        json.dumps({"numero": "MKT-3", "cliente_id": cliente_id, "itens": "nenhum"}),
+        json.dumps({"numero": "MKT-4", "cliente_id": cliente_id, "itens": [{"quantidade": 1}]}),
+    ]
+    arquivo.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+
+    main([str(arquivo), "--db", banco, "--trabalhadores", "2"])
+
+    saida = capsys.readouterr()
+    assert "Pedidos: 2 | Itens: 1 | Linhas inválidas: 4 | Rejeitados: 2" in saida.out
+    assert "Linha 2:" in saida.err and "Linha 5:" in saida.err
+    with sqlite3.connect(banco) as conn:
+        assert conn.execute("SELECT estoque FROM roupa").fetchone()[0] == 3
+        assert [n for n, in conn.execute("SELECT numero FROM pedido ORDER BY id")] == ["MKT-1", "MKT-4"]
@@ -0,0 +1,48 @@
+import pytest
+
+from instrucoes_sql import RegistroInstrucoes
+from main import (
+    DAO, INSTRUCOES, Cliente, ClienteDAO, ItemPedidoDAO, PagamentoDAO, PedidoDAO, ProducaoDAO, Roupa,
+    RoupaDAO,
+)
+
+
+def test_registro_tem_todas_as_instrucoes_dos_daos():
+    for classe in (ClienteDAO, RoupaDAO, PedidoDAO, ItemPedidoDAO, PagamentoDAO, ProducaoDAO):
+        for atributo, sql in vars(classe).items():
+            if atributo.startswith("SQL_"):
+                assert INSTRUCOES[f"{classe.__name__}.{atributo[4:]}"].sql is sql
+    assert INSTRUCOES.de_sql(RoupaDAO.SQL_BUSCAR).nome == "RoupaDAO.BUSCAR"
+    assert INSTRUCOES.de_sql("SELECT 1").nome == "consulta"
+    assert INSTRUCOES.tamanho_cache() > len(INSTRUCOES)
+
+
+def test_nome_repetido_e_recusado():
+    registro = RegistroInstrucoes()
+    registro.registrar("X.BUSCAR", "SELECT 1")
+    with pytest.raises(ValueError, match="já registrada"):
+        registro.registrar("X.BUSCAR", "SELECT 2")
+
+
+def test_formas_de_linha(banco):
+    RoupaDAO(banco).inserir_lote([Roupa(f"R{i}", f"Peça {i}", "M", "Azul", 10.0 + i, i) for i in range(3)])
+    ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    roupas = RoupaDAO(banco)
+
+    tuplas = list(roupas.iterar(tamanho_lote=2))
+    nomeadas = list(roupas.iterar(tamanho_lote=2, forma="nomeada"))
+    objetos = list(roupas.iterar(tamanho_lote=2, forma="objeto"))
+    assert [tuple(n) for n in nomeadas] == tuplas
+    assert [(n.codigo, n.preco, n.estoque) for n in nomeadas] == [("R0", 10.0, 0), ("R1", 11.0, 1), ("R2", 12.0, 2)]
+    assert all(type(o) is Roupa for o in objetos)
+    assert [(o.id, o.codigo, o.tamanho, o.cor, o.preco, o.estoque) for o in objetos] == \
+        [(t[0], t[1], t[5], t[6], t[3], t[4]) for t in tuplas]
+    cliente, = ClienteDAO(banco).iterar(forma="objeto")
+    assert (type(cliente), cliente.nome, cliente.cpf) == (Cliente, "Ana", "1")
+
+    # Sem construtor do domínio, ou forma desconhecida: erro claro
+    with pytest.raises(ValueError, match="não tem construtor"):
+        list(PedidoDAO(banco).iterar(forma="objeto"))
+    with pytest.raises(ValueError, match="Forma de linha desconhecida"):
+        list(roupas.iterar(forma="dicionario"))
+    assert DAO.obter_pool(banco).cached_statements == INSTRUCOES.tamanho_cache()
@@ -0,0 +1,19 @@
+import instrumentacao
+from main import Cliente, ClienteDAO, PedidoDAO
+
+
+def test_medicoes_nomeadas_sem_inspecionar_a_pilha(banco):
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    pedido_id = PedidoDAO(banco).criar("PED-1", cliente_id)
+    medicoes = []
+    instrumentacao.ativar(medicoes.append)
+    try:
+        assert len(list(ClienteDAO(banco).iterar())) == 1
+        # O nome do método segue o gerador mesmo consumido fora do DAO
+        paginas = ClienteDAO(banco).iterar(tamanho_lote=1)
+        assert [c[0] for c in paginas] == [cliente_id]
+        PedidoDAO(banco).total(pedido_id)
+        ClienteDAO(banco).conectar().execute("SELECT 1").fetchall()
+    finally:
+        instrumentacao.desativar()
+    assert {m.metodo for m in medicoes} == {"ClienteDAO.iterar", "PedidoDAO.TOTAL", "ClienteDAO.consulta"}
@@ -0,0 +1,106 @@
+import sqlite3
+import time
+from datetime import date, datetime, timezone
+
+import escrita_agrupada
+from livro_estoque import LivroEstoque, instante
+from main import Roupa, RoupaDAO
+
+
+def agora():
+    time.sleep(0.005)
+    momento = instante(datetime.now(timezone.utc))
+    time.sleep(0.005)
+    return momento
+
+
+def mudar_estoque(banco, valores):
+    conn = sqlite3.connect(banco)
+    conn.executemany("UPDATE roupa SET estoque = ? WHERE id = ?", [(e, r) for r, e in valores.items()])
+    conn.commit()
+    conn.close()
+
+
+def test_estoque_em_igual_com_e_sem_fotografia(banco):
+    livro = LivroEstoque(banco)
+    camisa = RoupaDAO(banco).inserir(Roupa("CAM-1", "Camisa", "M", "Azul", 50.0, 10))
+    calca = RoupaDAO(banco).inserir(Roupa("CAL-1", "Calça", "G", "Preta", 80.0, 4))
+    momentos = [agora()]
+    for valores in ({camisa: 7}, {camisa: 12, calca: 1}, {calca: 9}):
+        mudar_estoque(banco, valores)
+        momentos.append(agora())
+
+    sem_foto = [(livro.estoque_em(camisa, m), livro.estoque_em(calca, m), livro.catalogo_em(m))
+                for m in momentos]
+    livro.fotografar()
+    mudar_estoque(banco, {camisa: 3})
+    com_foto = [(livro.estoque_em(camisa, m), livro.estoque_em(calca, m), livro.catalogo_em(m))
+                for m in momentos]
+
+    assert [(c, k) for c, k, _ in sem_foto] == [(10, 4), (7, 4), (12, 1), (12, 9)]
+    assert com_foto == sem_foto
+    assert [catalogo[camisa] for _, _, catalogo in sem_foto] == [10, 7, 12, 12]
+    assert livro.catalogo_em(agora())[camisa] == 3
+
+
+def test_instante_normaliza_datas_e_textos():
+    assert instante(datetime(2024, 3, 5, 14, 7, 9, 123456)) == "2024-03-05 14:07:09.123"
+    assert instante(date(2024, 3, 5)) == "2024-03-05 23:59:59.999"
+    assert instante("2024-03-05") == "2024-03-05 23:59:59.999"
+    assert instante(" 2024-03-05T14:07:09 ") == "2024-03-05 14:07:09"
+
+
+def test_limites_do_livro(banco):
+    livro = LivroEstoque(banco)
+    antes_do_livro = "2000-01-01 00:00:00"
+    camisa = RoupaDAO(banco).inserir(Roupa("CAM-1", "Camisa", "M", "Azul", 50.0, 10))
+    depois_da_camisa = agora()
+    calca = RoupaDAO(banco).inserir(Roupa("CAL-1", "Calça", "G", "Preta", 80.0, 4))
+    mudar_estoque(banco, {camisa: 6})
+
+    assert livro.estoque_em(camisa, antes_do_livro) is None
+    assert livro.catalogo_em(antes_do_livro) is None
+    assert livro.estoque_em(9999, agora()) is None
+    # A calça ainda não existia: o saldo de antes do primeiro movimento dela
+    assert livro.estoque_em(calca, depois_da_camisa) == 0
+    assert livro.estoque_em(camisa, datetime.now(timezone.utc).date()) == 6
+    assert livro.catalogo_em(depois_da_camisa) == {camisa: 10}
+    assert livro.catalogo_em(agora()) == {camisa: 6, calca: 4}
+
+
+def test_escrita_agrupada_fotografa_fora_das_transacoes_de_venda(banco):
+    conn = sqlite3.connect(banco)
+    # A migração 9 tirou a fotografia do gatilho das vendas
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master "
+                        "WHERE name = 'trg_movimento_estoque_foto'").fetchone()[0] == 0
+    roupas = [RoupaDAO(banco).inserir(Roupa(f"R{i}", f"Peça {i}", "M", "Azul", 10.0, 1)) for i in range(3)]
+    escritor = escrita_agrupada.ativar(banco, intervalo_foto=0, max_movimentos_foto=2)
+    try:
+        for rodada in range(2, 6):
+            escritor.enviar(lambda c, r=rodada: c.execute("UPDATE roupa SET estoque = estoque + ?", (r,))).result()
+    finally:
+        escrita_agrupada.desativar(banco)
+
+    assert escritor.estatisticas()["fotos"] >= 1
+    assert conn.execute("SELECT COUNT(*) FROM foto_estoque WHERE ultimo_movimento > 0").fetchone()[0] >= 1
+    # Cada fotografia é exatamente o saldo do livro até ultimo_movimento
+    divergentes = conn.execute("""
+        SELECT f.id, i.roupa_id FROM foto_estoque f
+        JOIN foto_estoque_item i ON i.foto_id = f.id
+        WHERE f.ultimo_movimento > 0 AND i.estoque != COALESCE((
+            SELECT m.saldo FROM movimento_estoque m
+            WHERE m.roupa_id = i.roupa_id AND m.id <= f.ultimo_movimento
+            ORDER BY m.id DESC LIMIT 1), 0)
+    """).fetchall()
+    conn.close()
+    assert divergentes == []
+    assert LivroEstoque(banco).catalogo_em(agora()) == {r: 1 + 2 + 3 + 4 + 5 for r in roupas}
+
+
+def test_fotografar_se_preciso(banco):
+    livro = LivroEstoque(banco)
+    camisa = RoupaDAO(banco).inserir(Roupa("CAM-1", "Camisa", "M", "Azul", 50.0, 10))
+    mudar_estoque(banco, {camisa: 5})
+    assert livro.fotografar_se_preciso(max_movimentos=5) is None
+    assert livro.fotografar_se_preciso(max_movimentos=1) is not None
+    assert livro.pendentes() == 0
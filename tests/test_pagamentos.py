@@ -0,0 +1,41 @@
+import sqlite3
+
+from main import (
+    Cliente, ClienteDAO, FormaPagamento, ItemPedidoDAO, PagamentoDAO, PedidoDAO, Roupa, RoupaDAO,
+    StatusPagamento,
+)
+
+
+def preparar_pedidos(banco, quantidade, estoque=10):
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    roupa_id = RoupaDAO(banco).inserir(Roupa("R1", "Camisa", "M", "Azul", 10.0, estoque))
+    pedidos = [PedidoDAO(banco).criar(f"PED-{i}", cliente_id) for i in range(quantidade)]
+    return roupa_id, pedidos
+
+
+def contar(banco, sql, parametros=()):
+    with sqlite3.connect(banco) as conn:
+        return conn.execute(sql, parametros).fetchone()[0]
+
+
+def test_pagamento_exige_valor_e_segue_as_transicoes(banco):
+    roupa_id, (pedido_id,) = preparar_pedidos(banco, 1, estoque=5)
+    ItemPedidoDAO(banco).reservar(pedido_id, [(roupa_id, 2)])
+    pagamentos = PagamentoDAO(banco)
+    assert pagamentos.inserir(pedido_id, 19.99, FormaPagamento.PIX.value) is None
+    pagamento_id = pagamentos.inserir(pedido_id, 20.0, FormaPagamento.PIX.value)
+
+    # Estorno só vale para pagamento confirmado
+    estorno, = pagamentos.estornar_lote([pagamento_id])
+    assert not estorno.ok and estorno.motivo == "Transição inválida: Pendente -> Estornado"
+    assert pagamentos.processar_lote([pagamento_id])[0].ok
+    assert pagamentos.confirmar(pedido_id).status == StatusPagamento.CONFIRMADO.value
+    assert contar(banco, "SELECT status FROM pedido WHERE id = ?", (pedido_id,)) == "Finalizado"
+    assert not pagamentos.confirmar_lote([pagamento_id])[0].ok
+
+    # Estorno cancela o pedido e devolve o estoque (também no cache)
+    assert pagamentos.estornar_lote([pagamento_id, pagamento_id, 999]) == [
+        (pagamento_id, True, "Estornado", None), (999, False, None, "Pagamento não encontrado")]
+    assert contar(banco, "SELECT status FROM pedido WHERE id = ?", (pedido_id,)) == "Cancelado"
+    assert RoupaDAO(banco).obter(roupa_id).estoque == 5
+    assert not pagamentos.estornar_lote([pagamento_id])[0].ok
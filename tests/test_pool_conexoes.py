@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+
+import pytest
+
+from pool_conexoes import PoolConexoes, PoolEsgotado, aplicar_perfil
+
+
+def _segurar(pool, obtida, soltar, liberar=False):
+    pool.obter()
+    obtida.release()
+    soltar.wait()
+    if liberar:
+        pool.liberar()
+
+
+def test_threads_ociosas_seguram_conexao_ate_liberar(tmp_path):
+    pool = PoolConexoes(str(tmp_path / "pool.db"), tamanho=2, timeout=0.2)
+    obtida, soltar, liberou = threading.Semaphore(0), threading.Event(), threading.Event()
+    ociosa = threading.Thread(target=_segurar, args=(pool, obtida, soltar))
+    educada = threading.Thread(target=lambda: (_segurar(pool, obtida, liberou, True), soltar.wait()))
+    try:
+        ociosa.start()
+        educada.start()
+        obtida.acquire()
+        obtida.acquire()
+        # Duas threads vivas e paradas: a terceira não tem conexão
+        with pytest.raises(PoolEsgotado, match="threads vivas"):
+            pool.obter()
+        # Depois que uma delas chama liberar(), a conexão volta ao pool
+        liberou.set()
+        pool.timeout = 2.0
+        assert pool.obter().execute("SELECT 1").fetchone() == (1,)
+    finally:
+        liberou.set()
+        soltar.set()
+        ociosa.join()
+        educada.join()
+        pool.fechar()
+
+
+def test_conexao_de_thread_encerrada_volta_ao_pool(tmp_path):
+    pool = PoolConexoes(str(tmp_path / "pool.db"), tamanho=1, timeout=2.0)
+    try:
+        thread = threading.Thread(target=lambda: pool.obter().execute("SELECT 1"))
+        thread.start()
+        thread.join()
+        assert pool.obter().execute("SELECT 1").fetchone() == (1,)
+        assert pool.estatisticas()["em_uso"] == 1
+    finally:
+        pool.fechar()
+
+
+@pytest.mark.parametrize("perfil, synchronous, busy_timeout", [("seguro", 2, 5000), ("throughput", 1, 10000)])
+def test_perfis_aplicados_em_cada_conexao(tmp_path, perfil, synchronous, busy_timeout):
+    pool = PoolConexoes(str(tmp_path / "perfil.db"), perfil=perfil, pragmas={"cache_size": -1234})
+    try:
+        conn = pool.obter()
+        lido = {nome: conn.execute(f"PRAGMA {nome}").fetchone()[0]
+                for nome in ("journal_mode", "synchronous", "busy_timeout", "foreign_keys", "cache_size")}
+    finally:
+        pool.fechar()
+    assert lido == {"journal_mode": "wal", "synchronous": synchronous, "busy_timeout": busy_timeout,
+                    "foreign_keys": 1, "cache_size": -1234}
+
+
+def test_perfil_desconhecido(tmp_path):
+    with pytest.raises(ValueError, match="Perfil desconhecido"):
+        aplicar_perfil(sqlite3.connect(":memory:"), "turbo")
+    with pytest.raises(ValueError, match="Perfil desconhecido"):
+        PoolConexoes(str(tmp_path / "x.db"), perfil="turbo")
+
+
+def test_wal_leitor_nao_espera_escritor(tmp_path):
+    caminho = str(tmp_path / "wal.db")
+    escritor = sqlite3.connect(caminho, isolation_level=None)
+    aplicar_perfil(escritor)
+    escritor.execute("CREATE TABLE t (x INTEGER)")
+    escritor.execute("INSERT INTO t VALUES (1)")
+    escritor.execute("BEGIN IMMEDIATE")
+    escritor.execute("INSERT INTO t VALUES (2)")
+    leitor = sqlite3.connect(caminho, timeout=0)
+    aplicar_perfil(leitor, pragmas={"busy_timeout": 0})
+    try:
+        # Com o lock de escrita preso, a leitura vê o último commit sem esperar
+        assert leitor.execute("SELECT SUM(x) FROM t").fetchone() == (1,)
+    finally:
+        escritor.execute("ROLLBACK")
+        escritor.close()
+        leitor.close()
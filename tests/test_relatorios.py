@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+import pytest
+
+import relatorios
+from main import Cliente, ClienteDAO, ItemPedidoDAO, PagamentoDAO, PedidoDAO, Roupa, RoupaDAO
+from relatorios import Relatorios
+
+INICIO = (date.today() - timedelta(days=1)).isoformat()
+FIM = (date.today() + timedelta(days=2)).isoformat()
+
+
+def preparar(banco):
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "111", "Rua A"))
+    camisa = RoupaDAO(banco).inserir(Roupa("CAM-1", "Camisa", "M", "Azul", 50.0, 100))
+    calca = RoupaDAO(banco).inserir(Roupa("CAL-1", "Calça", "G", "Preta", 80.0, 100))
+    pago = PedidoDAO(banco).criar("PAGO", cliente_id)
+    ItemPedidoDAO(banco).reservar(pago, [(camisa, 2)])
+    PagamentoDAO(banco).inserir(pago, 100.0, "Pix")
+    PagamentoDAO(banco).confirmar(pago)
+    # Em aberto e sem pagamento: reservou estoque, mas não é receita
+    aberto = PedidoDAO(banco).criar("ABERTO", cliente_id)
+    ItemPedidoDAO(banco).reservar(aberto, [(calca, 5)])
+    # Pagamento registrado mas não confirmado
+    pendente = PedidoDAO(banco).criar("PENDENTE", cliente_id)
+    ItemPedidoDAO(banco).reservar(pendente, [(calca, 1)])
+    PagamentoDAO(banco).inserir(pendente, 80.0, "Boleto")
+    return camisa, calca
+
+
+def test_receita_ignora_pedido_aberto_sem_pagamento(banco):
+    preparar(banco)
+    (periodo, pedidos, itens, receita), = Relatorios(banco).receita_por_periodo(INICIO, FIM, "ano")
+    assert (pedidos, itens, receita) == (1, 1, 100.0)
+
+
+def test_receita_por_forma_so_conta_pagamento_confirmado(banco):
+    preparar(banco)
+    assert Relatorios(banco).receita_por_forma(INICIO, FIM) == [("Pix", 1, 100.0)]
+
+
+def test_top_skus_so_conta_pedidos_finalizados(banco):
+    preparar(banco)
+    ranking = Relatorios(banco).top_skus(INICIO, FIM)
+    assert [(codigo, unidades) for _, codigo, _, unidades, _ in ranking] == [("CAM-1", 2)]
+
+
+@pytest.mark.parametrize("argumentos", [["receita", "--por", "tamanho"], ["top", "--por", "dia"]])
+def test_por_invalido_vira_erro_de_uso(banco, argumentos, capsys):
+    with pytest.raises(SystemExit) as saida:
+        relatorios.main([*argumentos, "--db", banco])
+    assert saida.value.code == 2
+    assert "não vale para" in capsys.readouterr().err
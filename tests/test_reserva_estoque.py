@@ -0,0 +1,48 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from main import Cliente, ClienteDAO, EstoqueInsuficiente, ItemPedidoDAO, PedidoDAO, Roupa, RoupaDAO
+
+
+def preparar_pedidos(banco, quantidade, estoque=10):
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    roupa_id = RoupaDAO(banco).inserir(Roupa("R1", "Camisa", "M", "Azul", 10.0, estoque))
+    pedidos = [PedidoDAO(banco).criar(f"PED-{i}", cliente_id) for i in range(quantidade)]
+    return roupa_id, pedidos
+
+
+def contar(banco, sql, parametros=()):
+    with sqlite3.connect(banco) as conn:
+        return conn.execute(sql, parametros).fetchone()[0]
+
+
+def test_reserva_concorrente_nunca_vende_alem_do_estoque(banco):
+    roupa_id, pedidos = preparar_pedidos(banco, 30, estoque=10)
+
+    def reservar(pedido_id):
+        try:
+            ItemPedidoDAO(banco).reservar(pedido_id, [(roupa_id, 1)])
+            return True
+        except EstoqueInsuficiente:
+            return False
+
+    # Menos workers que conexões no pool (a thread principal também usa uma)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        resultados = list(executor.map(reservar, pedidos))
+    assert resultados.count(True) == 10
+    assert contar(banco, "SELECT estoque FROM roupa WHERE id = ?", (roupa_id,)) == 0
+    assert contar(banco, "SELECT COUNT(*) FROM item_pedido") == 10
+    assert RoupaDAO(banco).obter(roupa_id).estoque == 0
+
+
+def test_reserva_de_varios_itens_e_tudo_ou_nada(banco):
+    roupa_id, (pedido_id,) = preparar_pedidos(banco, 1, estoque=5)
+    outra_id = RoupaDAO(banco).inserir(Roupa("R2", "Calça", "G", "Preta", 20.0, 1))
+    with pytest.raises(EstoqueInsuficiente):
+        ItemPedidoDAO(banco).reservar(pedido_id, [(roupa_id, 2), (outra_id, 3)])
+    assert contar(banco, "SELECT estoque FROM roupa WHERE id = ?", (roupa_id,)) == 5
+    assert contar(banco, "SELECT COUNT(*) FROM item_pedido") == 0
+    assert ItemPedidoDAO(banco).reservar(pedido_id, [(outra_id, 1), (roupa_id, 2)]) == [
+        (roupa_id, 2, 10.0), (outra_id, 1, 20.0)]
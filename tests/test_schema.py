@@ -0,0 +1,64 @@
+import sqlite3
+
+import pytest
+
+import ddl_confeccao
+from ddl_confeccao import VERSAO_SCHEMA, aplicar_migracoes, verificar_planos, versao_schema
+from main import CONSULTAS_DAO, DAO, Roupa, RoupaDAO
+
+
+def test_migracoes_levam_a_ultima_versao_uma_vez_so(banco):
+    conn = sqlite3.connect(banco)
+    assert versao_schema(conn) == VERSAO_SCHEMA
+    assert aplicar_migracoes(conn) == []
+    indices = {linha[0] for linha in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_item_pedido_pedido", "idx_pedido_cliente", "idx_pessoa_tipo"} <= indices
+    conn.close()
+
+
+def test_migracao_com_erro_nao_deixa_nada_pela_metade(banco, monkeypatch):
+    quebrada = (VERSAO_SCHEMA + 1, "Quebrada", [
+        "CREATE TABLE meia_migracao (id INTEGER)",
+        "CREATE INDEX idx_quebrado ON tabela_que_nao_existe (x)",
+    ])
+    monkeypatch.setattr(ddl_confeccao, "MIGRACOES", ddl_confeccao.MIGRACOES + [quebrada])
+    conn = sqlite3.connect(banco)
+    with pytest.raises(sqlite3.OperationalError):
+        aplicar_migracoes(conn)
+    assert versao_schema(conn) == VERSAO_SCHEMA
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'meia_migracao'").fetchone()[0] == 0
+    conn.close()
+
+
+def test_consultas_dos_daos_usam_indices(banco, capsys):
+    conn = sqlite3.connect(banco)
+    assert verificar_planos(conn, CONSULTAS_DAO) == []
+    # Uma consulta sem índice é apontada
+    assert verificar_planos(conn, [("sem_indice", "SELECT * FROM roupa WHERE cor = ?", ("Azul",))]) == ["sem_indice"]
+    conn.close()
+    assert "⚠️ sem_indice" in capsys.readouterr().out
+
+
+def test_garantir_schema_cria_uma_vez_e_memoriza(tmp_path, monkeypatch):
+    monkeypatch.setattr(ddl_confeccao, "_garantidos", set())
+    caminho = str(tmp_path / "novo.db")
+    assert ddl_confeccao.garantir_schema(caminho) is True
+    assert ddl_confeccao.garantir_schema(caminho) is False
+    # Banco já na versão atual, mas não visto neste processo: só confere
+    monkeypatch.setattr(ddl_confeccao, "_garantidos", set())
+    chamadas = []
+    monkeypatch.setattr(ddl_confeccao, "criar_tabelas", chamadas.append)
+    assert ddl_confeccao.garantir_schema(caminho) is False
+    assert chamadas == []
+
+
+def test_dao_cria_o_schema_de_banco_novo_e_em_memoria(tmp_path):
+    try:
+        for db_name in (str(tmp_path / "sem_script.db"), ddl_confeccao.banco_em_memoria()):
+            roupa_id = RoupaDAO(db_name).inserir(Roupa("R1", "Peça", "M", "Azul", 10.0, 1))
+            assert versao_schema(DAO(db_name).conectar()) == VERSAO_SCHEMA
+            assert RoupaDAO(db_name).obter(roupa_id).codigo == "R1"
+        # Em memória não fica marcado: some com a última conexão
+        assert not any(ddl_confeccao.em_memoria(nome) for nome in ddl_confeccao._garantidos)
+    finally:
+        DAO.fechar_pools()
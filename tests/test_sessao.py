@@ -0,0 +1,26 @@
+import pytest
+
+from main import Cliente, ClienteDAO, ItemPedido, PedidoDAO, Roupa, RoupaDAO
+from sessao import Sessao
+
+
+def test_novo_pedido_sem_cliente_gravado_e_rejeitado(banco):
+    sessao = Sessao(banco)
+    with pytest.raises(ValueError, match="PED-1"):
+        sessao.novo_pedido("PED-1", None)
+    with pytest.raises(ValueError, match="PED-2"):
+        sessao.novo_pedido("PED-2", Cliente("Ana", "1", "Rua"))
+    assert sessao.pendencias()["pedidos"] == []
+
+
+def test_commit_atribui_ids_e_baixa_estoque(banco):
+    cliente_id = ClienteDAO(banco).inserir(Cliente("Ana", "1", "Rua"))
+    roupa_id = RoupaDAO(banco).inserir(Roupa("R1", "Camisa", "M", "Azul", 10.0, 5))
+    with Sessao(banco) as sessao:
+        pedidos = [sessao.novo_pedido(f"PED-{i}", sessao.obter_cliente(cliente_id)) for i in range(3)]
+        for pedido in pedidos:
+            pedido.adicionar_item(ItemPedido(sessao.obter_roupa(roupa_id), 1))
+    assert [p.id for p in pedidos] == sorted(p.id for p in pedidos)
+    assert all(p.id is not None and p.itens[0].id is not None for p in pedidos)
+    assert [numero for _, numero, *_ in PedidoDAO(banco).iterar()] == ["PED-0", "PED-1", "PED-2"]
+    assert RoupaDAO(banco).obter(roupa_id).estoque == 2